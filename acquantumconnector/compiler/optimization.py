@@ -0,0 +1,87 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Dict, List, Tuple, Union
+
+from acquantumconnector.compiler.scheduling import schedule_columns
+from acquantumconnector.model.circuit import Circuit, TEXTS, ROTATIONS, H, X, Y, Z, S, SDG, T, TDG, M, CP, CCP
+from acquantumconnector.model.gates import Gate
+
+INVERSES = {H: H, X: X, Y: Y, Z: Z, S: SDG, SDG: S, T: TDG, TDG: T, CP: CP, CCP: CCP}
+
+
+def _rows(circuit, index):
+    # type: (Circuit, int) -> Tuple[int, ...]
+    code = circuit.codes[index]
+    if code == CP:
+        return circuit.ys[index], circuit.y1s[index]
+    if code == CCP:
+        return circuit.ys[index], circuit.y1s[index], circuit.y2s[index]
+    return circuit.ys[index],
+
+
+def optimize_circuit(gates, compact=True):
+    # type: (Union[List[Gate], Circuit], bool) -> Union[List[Gate], Circuit]
+    """
+    Peephole optimisation of a circuit in column order.
+
+    A gate directly followed by its inverse on the same rows is removed (H/H, X/X, Y/Y, Z/Z, S/S†, T/T†, CP/CP and
+    CCP/CCP), consecutive rotations of the same axis on a row are merged to one rotation by the sum of their angles
+    modulo 360 and dropped if that is 0. Measurements and gates with a gate detail are left untouched.
+
+    :param gates: list of gates or Circuit
+    :param compact: Default = True. If True the gates are moved to the lowest free column, see schedule_columns
+    :return: the optimised gates, as Circuit if a Circuit was given
+    """
+    circuit = gates if isinstance(gates, Circuit) else Circuit(gates)
+    kept = []  # type: List[int]
+    angles = []  # type: List[int]
+    stacks = {}  # type: Dict[int, List[int]]
+
+    for index in sorted(range(len(circuit)), key=circuit.xs.__getitem__):
+        code, rows = circuit.codes[index], _rows(circuit, index)
+        previous = {stacks[row][-1] if stacks.get(row) else None for row in rows}
+        position = previous.pop() if len(previous) == 1 else None
+        if position is not None and code != M and index not in circuit.details \
+                and kept[position] not in circuit.details:
+            other = circuit.codes[kept[position]]
+            if INVERSES.get(code) == other:
+                angle = 0
+            elif code in ROTATIONS and code == other:
+                angle = (angles[position] + circuit.angles[index]) % 360
+            else:
+                angle = None
+            if angle == 0:
+                kept[position] = None
+                for row in rows:
+                    stacks[row].pop()
+            if angle is not None:
+                angles[position] = angle
+                continue
+        for row in rows:
+            stacks.setdefault(row, []).append(len(kept))
+        kept.append(index)
+        angles.append(circuit.angles[index])
+
+    positions = [position for position, index in enumerate(kept) if index is not None]
+    spans = [(min(rows), max(rows)) for rows in (_rows(circuit, kept[position]) for position in positions)]
+    xs = schedule_columns(spans) if compact else [circuit.xs[kept[position]] for position in positions]
+    optimized = Circuit()
+    for position, x in zip(positions, xs):
+        index = kept[position]
+        rows = _rows(circuit, index)
+        optimized.add(TEXTS[circuit.codes[index]], x, rows if len(rows) > 1 else rows[0], angles[position])
+        if index in circuit.details:
+            optimized.details[len(optimized) - 1] = circuit.details[index]
+    return optimized if isinstance(gates, Circuit) else optimized.to_gates()
@@ -0,0 +1,71 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from acquantumconnector.model.circuit import Circuit
+
+ASAP = 'asap'
+ALAP = 'alap'
+
+_ALIASES = {'SDG': 'S†', 'TDG': 'T†'}
+
+
+def schedule_columns(spans, method=ASAP):
+    # type: (Sequence[Tuple[int, int]], str) -> List[int]
+    """
+    Assigns columns to a sequence of gates, so that a gate comes after all earlier gates it shares a row with.
+
+    :param spans: lowest and highest row of each gate in sequence order, a controlled gate blocks all rows between
+    :param method: ASAP places each gate in the first possible column, ALAP in the last one before its successors
+    :return: the column of each gate, starting at 1
+    """
+    if method not in (ASAP, ALAP):
+        raise ValueError('Unknown scheduling method \'{}\''.format(method))
+    order = range(len(spans)) if method == ASAP else reversed(range(len(spans)))
+    levels = {}  # type: Dict[int, int]
+    columns = [0] * len(spans)
+    for index in order:
+        low, high = spans[index]
+        column = max(levels.get(row, 0) for row in range(low, high + 1)) + 1
+        for row in range(low, high + 1):
+            levels[row] = column
+        columns[index] = column
+    if method == ALAP:
+        depth = max(columns, default=0)
+        columns = [depth - column + 1 for column in columns]
+    return columns
+
+
+def schedule(operations, method=ASAP):
+    # type: (Iterable[tuple], str) -> Circuit
+    """
+    Places a logical gate sequence on the grid, independent gates share a column.
+
+    :param operations: tuples of gate text, qubit or qubits and optionally the angle in degrees, e.g. ``('H', 0)``,
+            ``('CP', (0, 2))`` or ``('RX', 1, 90)``. Qubits count from 0 and are placed on row ``qubit + 1``
+    :param method: ASAP or ALAP
+    :return: the scheduled Circuit
+    """
+    gates = []
+    for operation in operations:
+        text, qubits = operation[0].upper(), operation[1]
+        rows = (qubits + 1,) if isinstance(qubits, int) else tuple(qubit + 1 for qubit in qubits)
+        gates.append((_ALIASES.get(text, text), rows, operation[2] if len(operation) > 2 else 0))
+
+    columns = schedule_columns([(min(rows), max(rows)) for _, rows, _ in gates], method)
+    circuit = Circuit()
+    for (text, rows, angle), x in zip(gates, columns):
+        circuit.add(text, x, rows if len(rows) > 1 else rows[0], angle)
+    return circuit
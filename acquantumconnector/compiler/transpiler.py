@@ -0,0 +1,309 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict, FrozenSet, List, Set, Tuple, Union
+
+from acquantumconnector.compiler.optimization import optimize_circuit
+from acquantumconnector.compiler.scheduling import schedule_columns
+from acquantumconnector.model.circuit import Circuit, TEXTS, H, X, Y, Z, S, SDG, T, TDG, M, RX, RY, RZ, CP, CCP
+from acquantumconnector.model.config import AcQuantumRawConfig
+from acquantumconnector.model.gates import Gate
+
+# names of the gates in the SystemConfig of the device
+DEVICE_GATES = {H: 'H', X: 'X', Y: 'Y', Z: 'Z', S: 'S', SDG: 'Sd', T: 'T', TDG: 'Td', RX: 'Rx(p)', RY: 'Ry(p)',
+                RZ: 'Rz(p)', CP: 'CZ'}
+
+# equivalent sequences up to a global phase, in order of preference, an angle of None is the angle of the gate
+REWRITES = {
+    H: (((Z, 0), (RY, 90)), ((RZ, 180), (RY, 90)), ((RY, 90), (RX, 180))),
+    X: (((RX, 180),), ((H, 0), (Z, 0), (H, 0))),
+    Y: (((RY, 180),),),
+    Z: (((RZ, 180),), ((S, 0), (S, 0))),
+    S: (((RZ, 90),), ((T, 0), (T, 0))),
+    SDG: (((RZ, 270),), ((TDG, 0), (TDG, 0))),
+    T: (((RZ, 45),),),
+    TDG: (((RZ, 315),),),
+    RX: (((RZ, 90), (RY, None), (RZ, 270)), ((H, 0), (RZ, None), (H, 0))),
+    RY: (((RZ, 270), (RX, None), (RZ, 90)),),
+    RZ: (((RX, 270), (RY, None), (RX, 90)), ((H, 0), (RX, None), (H, 0))),
+}
+
+_Operation = Tuple[int, Tuple[int, ...], int]
+
+
+class DeviceModel(object):
+    """
+    Qubits, couplings and fidelities of a device derived from its :class:`AcQuantumRawConfig`.
+    """
+
+    def __init__(self, one_q_fidelities, couplings, readout_fidelities, gates=None, calibration_time=None):
+        # type: (Dict[int, float], Dict[FrozenSet[int], float], Dict[int, float], Set[str], str) -> None
+        """
+        :param one_q_fidelities: mean single qubit gate fidelity per qubit
+        :param couplings: CZ fidelity per coupled pair of qubits
+        :param readout_fidelities: mean readout fidelity per qubit
+        :param gates: the supported gates by their device name, None if all gates are supported
+        :param calibration_time: the last calibration time the fidelities belong to
+        """
+        self.qubits = sorted(set(one_q_fidelities) | set(readout_fidelities))
+        self.one_q_fidelities = one_q_fidelities
+        self.couplings = {pair: fidelity for pair, fidelity in couplings.items() if pair <= set(self.qubits)}
+        self.readout_fidelities = readout_fidelities
+        self.gates = gates
+        self.calibration_time = calibration_time
+
+    @classmethod
+    def from_config(cls, config):
+        # type: (AcQuantumRawConfig) -> DeviceModel
+        one_q = {}
+        for entry in config.one_q_gate_fidelities.config_value:
+            values = [value for key, value in entry.items() if key != 'qubit']
+            one_q[entry['qubit']] = sum(values) / len(values) if values else 1.0
+        couplings = {frozenset((entry['q1'], entry['q2'])): entry['cz']
+                     for entry in config.two_q_gate_fidelity.config_value}
+        parameters = config.qubit_parameter.config_value
+        if isinstance(parameters, str):
+            parameters = json.loads(parameters)
+        readout = {entry['qubit']: sum(entry['readoutFidelity']) / len(entry['readoutFidelity'])
+                   for entry in parameters if entry.get('readoutFidelity')}
+        system = config.system_config.config_value
+        gates = set(system.one_q_gates or []) | set(system.two_q_gates or []) or None
+        return DeviceModel(one_q, couplings, readout, gates, config.system_status.config_value.last_calibration_time)
+
+    def supports(self, code):
+        # type: (int) -> bool
+        return code == M or self.gates is None or DEVICE_GATES.get(code) in self.gates
+
+    def qubit_fidelity(self, qubit):
+        # type: (int) -> float
+        return self.one_q_fidelities.get(qubit, 1.0) * self.readout_fidelities.get(qubit, 1.0)
+
+
+class TranspiledCircuit(object):
+
+    def __init__(self, circuit, layout, fidelity):
+        # type: (Circuit, Dict[int, int], float) -> None
+        """
+        :param circuit: the scheduled circuit on the physical rows
+        :param layout: physical row per logical row
+        :param fidelity: estimate as product of the fidelities of all gates and measurements
+        """
+        self.circuit = circuit
+        self.layout = layout
+        self.fidelity = fidelity
+
+    def __str__(self):
+        return 'TranspiledCircuit: {{ gates: {}, layout: {}, fidelity: {:.4f} }}'.format(len(self.circuit),
+                                                                                         self.layout, self.fidelity)
+
+    def __repr__(self):
+        return 'TranspiledCircuit: {{ gates: {}, layout: {}, fidelity: {:.4f} }}'.format(len(self.circuit),
+                                                                                         self.layout, self.fidelity)
+
+
+class Transpiler(object):
+    """
+    Maps circuits onto the qubits of the REAL device and rewrites them into its gate basis.
+
+    The backend configuration is fetched at most every ``refresh_interval`` seconds. The derived
+    :class:`DeviceModel` is only rebuilt if the last calibration time of the device changed.
+    """
+
+    def __init__(self, connector=None, config=None, refresh_interval=300.0):
+        # type: ('AcQuantumConnector', AcQuantumRawConfig, float) -> None
+        """
+        :param connector: connector to fetch the backend configuration with
+        :param config: fixed backend configuration, used instead of fetching it
+        :param refresh_interval: seconds the configuration is used before it is fetched again
+        """
+        if connector is None and config is None:
+            raise ValueError('Either a connector or a config is required')
+        self._connector = connector
+        self._config = config
+        self.refresh_interval = refresh_interval
+        self._device = None  # type: DeviceModel
+        self._fetched = None
+        self._lock = threading.Lock()
+
+    def device(self):
+        # type: () -> DeviceModel
+        with self._lock:
+            config = self._config
+            if self._connector is not None and (self._fetched is None or
+                                                time.monotonic() - self._fetched > self.refresh_interval):
+                config = self._config = self._connector.get_backend_config()
+                self._fetched = time.monotonic()
+            calibration_time = config.system_status.config_value.last_calibration_time
+            if self._device is None or self._device.calibration_time != calibration_time:
+                self._device = DeviceModel.from_config(config)
+            return self._device
+
+    def transpile(self, gates, layout=None):
+        # type: (Union[List[Gate], Circuit], Dict[int, int]) -> TranspiledCircuit
+        """
+        :param gates: the logical circuit
+        :param layout: Default = None. Physical row per logical row, chosen by the fidelities if not given
+        :return: TranspiledCircuit
+        :raises ValueError: if an interaction can not be placed on coupled qubits or a gate has no equivalent in the
+                device basis
+        """
+        device = self.device()
+        circuit = gates if isinstance(gates, Circuit) else Circuit(gates)
+        operations = _operations(circuit)
+        if layout is None:
+            layout = self.layout(operations, device)
+        operations = [(code, tuple(layout[row] for row in rows), angle) for code, rows, angle in operations]
+
+        decomposed = []  # type: List[_Operation]
+        for code, rows, angle in operations:
+            decomposed.extend(_decompose_ccp(rows, device) if code == CCP else [(code, rows, angle)])
+        operations = _operations(optimize_circuit(_circuit(decomposed), compact=False))
+
+        rewritten = []  # type: List[_Operation]
+        for code, rows, angle in operations:
+            if code == CP and frozenset(rows) not in device.couplings:
+                raise ValueError('Rows {} are not coupled on the device'.format(rows))
+            rewritten.extend(_rewrite(code, rows, angle, device))
+
+        result = _circuit(rewritten, schedule_columns([(min(rows), max(rows)) for _, rows, _ in rewritten]))
+        return TranspiledCircuit(result, dict(layout), _fidelity(rewritten, device))
+
+    @staticmethod
+    def layout(operations, device):
+        # type: (List[_Operation], DeviceModel) -> Dict[int, int]
+        """
+        Greedy placement, logical rows with most interactions first, each on the free qubit with the highest product
+        of its own fidelity and the fidelities of the couplings to its already placed partners.
+
+        :return: physical row per logical row
+        """
+        rows = sorted({row for _, gate_rows, _ in operations for row in gate_rows})
+        if len(rows) > len(device.qubits):
+            raise ValueError('The circuit uses {} rows, the device has {} qubits'.format(len(rows), len(device.qubits)))
+        required, preferred = Counter(), Counter()
+        for code, gate_rows, _ in operations:
+            if code in (CP, CCP):
+                pairs = {frozenset((a, b)) for a in gate_rows for b in gate_rows if a != b}
+                (required if code == CP else preferred).update(pairs)
+
+        def weight(row, placed):
+            pairs = [pair for pair in list(required) + list(preferred) if row in pair]
+            return sum(1 for pair in pairs if (pair - {row}) <= set(placed)), len(pairs), -row
+
+        placed = {}  # type: Dict[int, int]
+        while len(placed) < len(rows):
+            row = max((row for row in rows if row not in placed), key=lambda r: weight(r, placed))
+            best, best_score = None, 0.0
+            for qubit in device.qubits:
+                if qubit in placed.values():
+                    continue
+                score = device.qubit_fidelity(qubit)
+                for pairs, strict in ((required, True), (preferred, False)):
+                    for pair in pairs:
+                        if row not in pair:
+                            continue
+                        partner = next(iter(pair - {row}))
+                        if partner in placed:
+                            coupling = device.couplings.get(frozenset((qubit, placed[partner])))
+                        else:
+                            # look ahead to the best coupling still available for the partner
+                            coupling = max((fidelity for pair, fidelity in device.couplings.items()
+                                            if qubit in pair and not (pair - {qubit}) <= set(placed.values())),
+                                           default=None)
+                        if coupling is None and strict:
+                            score = 0.0
+                        elif coupling is not None:
+                            score *= coupling
+                if score > best_score:
+                    best, best_score = qubit, score
+            if best is None:
+                raise ValueError('Row {} can not be placed next to its partners on the device'.format(row))
+            placed[row] = best
+        return placed
+
+
+def _operations(circuit):
+    # type: (Circuit) -> List[_Operation]
+    operations = []
+    for index in sorted(range(len(circuit)), key=circuit.xs.__getitem__):
+        code = circuit.codes[index]
+        rows = (circuit.ys[index], circuit.y1s[index], circuit.y2s[index])[:{CP: 2, CCP: 3}.get(code, 1)]
+        operations.append((code, rows, circuit.angles[index]))
+    return operations
+
+
+def _circuit(operations, columns=None):
+    # type: (List[_Operation], List[int]) -> Circuit
+    circuit = Circuit()
+    for index, (code, rows, angle) in enumerate(operations):
+        circuit.add(TEXTS[code], columns[index] if columns else index + 1, rows if len(rows) > 1 else rows[0],
+                    angle)
+    return circuit
+
+
+def _decompose_ccp(rows, device):
+    # type: (Tuple[int, ...], DeviceModel) -> List[_Operation]
+    """
+    Doubly controlled Z with CZ between nearest neighbours only, as phase network of T and T† on the parities of
+    the three qubits. The qubit coupled to both others is used as centre.
+    """
+    centres = [row for row in rows if all(frozenset((row, other)) in device.couplings
+                                          for other in rows if other != row)]
+    if not centres:
+        raise ValueError('Rows {} do not form a chain of coupled qubits'.format(rows))
+    b = centres[0]
+    a, c = [row for row in rows if row != b]
+
+    def cx(control, target):
+        return [(H, (target,), 0), (CP, (control, target), 0), (H, (target,), 0)]
+
+    return [(T, (a,), 0), (T, (b,), 0), (T, (c,), 0),
+            *cx(a, b), (TDG, (b,), 0), *cx(b, c), (T, (c,), 0),
+            *cx(a, b), *cx(b, c), (TDG, (c,), 0),
+            *cx(a, b), *cx(b, c), (TDG, (c,), 0),
+            *cx(a, b), *cx(b, c)]
+
+
+def _rewrite(code, rows, angle, device, depth=2):
+    # type: (int, Tuple[int, ...], int, DeviceModel, int) -> List[_Operation]
+    """
+    :param depth: how often the gates of an equivalent sequence may be rewritten again
+    """
+    if device.supports(code):
+        return [(code, rows, angle)]
+    for alternative in REWRITES.get(code, ()) if depth >= 0 else ():
+        try:
+            return [operation for other, other_angle in alternative
+                    for operation in _rewrite(other, rows, angle if other_angle is None else other_angle, device,
+                                              depth - 1)]
+        except ValueError:
+            continue
+    raise ValueError('Gate \'{}\' is not supported by the device'.format(TEXTS[code]))
+
+
+def _fidelity(operations, device):
+    # type: (List[_Operation], DeviceModel) -> float
+    fidelity = 1.0
+    for code, rows, _ in operations:
+        if code == CP:
+            fidelity *= device.couplings[frozenset(rows)]
+        elif code == M:
+            fidelity *= device.readout_fidelities.get(rows[0], 1.0)
+        else:
+            fidelity *= device.one_q_fidelities.get(rows[0], 1.0)
+    return fidelity
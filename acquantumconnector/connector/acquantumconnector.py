@@ -12,19 +12,41 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-import pickle
+import contextlib
+import functools
+import json as _json
+import logging
+import os
 import re
-from typing import Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, List, Union
+from urllib.parse import urlencode, urlsplit
 
 import requests
 
+from acquantumconnector.compiler.optimization import optimize_circuit
+from acquantumconnector.connector.cache import BackendConfigCache, ExperimentState, ExperimentStateCache, ResponseCache
+from acquantumconnector.connector.encoding import iter_codesave_payload, gzip_chunks, DEFAULT_CHUNK_SIZE
+from acquantumconnector.connector.jsonbackend import JsonBackend, default_backend, resolve_backend, split_envelope
+from acquantumconnector.connector.metrics import RequestEvent
+from acquantumconnector.connector.ratelimit import RequestScheduler, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW
+from acquantumconnector.connector.resultstore import AcQuantumResultStore
+from acquantumconnector.connector.retry import RetryPolicy
+from acquantumconnector.connector.sessionstore import SessionStore, FileSessionStore, restore_cookies
+from acquantumconnector.connector.tracing import Span, Tracer
+from acquantumconnector.connector.transport import Transport, RequestsTransport
 from acquantumconnector.credentials.credentials import AcQuantumCredentials
 from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.circuit import Circuit
 from acquantumconnector.model.config import AcQuantumRawConfig
 from acquantumconnector.model.errors import AcQuantumRequestError, AcQuantumRequestForbiddenError
 from acquantumconnector.model.gates import Gate
 from acquantumconnector.model.response import AcQuantumExperimentDetail, AcQuantumExperiment, AcQuantumResult, \
-    AcQuantumResultResponse, AcQuantumResponse
+    AcQuantumResultResponse, AcQuantumResponse, AcQuantumBatchResponse, AcQuantumDownloadReport
+
+_log = logging.getLogger(__name__)
 
 
 class AcQuantumSession(object):
@@ -42,54 +64,388 @@ class AcQuantumSession(object):
 
 
 class AcQuantumConnector(object):
+    """
+    Client of the quantumcomputer.ac.cn REST API.
+
+    By default a connector must only be used by one thread at a time. Created with ``thread_safe=True`` it can be
+    shared by the workers of a thread pool: they use one login, and an expired session is renewed by one of them
+    while the others wait for the new session. submit_batch and download_results are safe in either mode, their
+    worker threads send their requests through own HTTP sessions.
+    """
     _schema = 'http'
     _base_uri = '{}://quantumcomputer.ac.cn'.format(_schema)
     _CHARSET_PARAM = ('_input_charset', 'utf-8')
     _TOKEN_HEADER_KEY = 'X-CSRF-TOKEN'
-
-    def __init__(self):
-        self._req = requests.session()
+    _THROTTLE_RETRIES = 3
+
+    def __init__(self,
+                 base_uri=None,  # type: str
+                 cache_experiment_state=False,  # type: bool
+                 response_cache=None,  # type: ResponseCache
+                 result_store=None,  # type: AcQuantumResultStore
+                 config_cache=None,  # type: BackendConfigCache
+                 scheduler=None,  # type: RequestScheduler
+                 retry_policy=None,  # type: RetryPolicy
+                 thread_safe=False,  # type: bool
+                 session_store=None,  # type: SessionStore
+                 transport=None,  # type: Transport
+                 request_hooks=None,  # type: List[Callable[[RequestEvent], None]]
+                 tracer=None,  # type: Tracer
+                 json_backend=None,  # type: Union[str, JsonBackend]
+                 lazy_decode=False,  # type: bool
+                 experiment_state_ttl=None  # type: float
+                 ):
+        # type: (...) -> None
+        """
+        :param base_uri: Default = http://quantumcomputer.ac.cn
+        :param cache_experiment_state: Default = False. If True the gates and version of the experiments seen or
+                saved by this connector are kept, so that update_experiment(override=False) merges locally instead of
+                fetching the experiment first. Changes by other clients are only noticed once the experiment list
+                shows another version or the state expires, see ExperimentStateCache
+        :param response_cache: Default = None. Cache of get_experiment and get_experiments results
+        :param result_store: Default = None. Store of finished results consulted by get_result. Only runs submitted
+                through this connector make it fetch the results of a stored experiment again, see
+                AcQuantumResultStore.mark_incomplete
+        :param config_cache: Default = None. Cache of the parsed backend configurations of get_backend_config
+        :param scheduler: Default = None. Rate limit and priority order of all requests, e.g. shared by the
+                connectors of one account
+        :param retry_policy: Default = RetryPolicy(). Retries of GET requests after transient errors,
+                RetryPolicy(max_retries=0) disables retrying. Requests rejected because the session expired are always
+                sent again once after a new login
+        :param thread_safe: Default = False. If True the connector may be used by several threads at once. Each
+                thread sends its requests through an own HTTP session, all of them share the connection pool, the
+                cookies and the authenticated AcQuantumSession. A new login replaces the session atomically
+        :param session_store: Default = None. Store of the CSRF token and cookies of the last login per user, which
+                create_session reuses until they expire instead of logging in
+        :param transport: Default = RequestsTransport(thread_safe). Sends the HTTP requests, e.g. an
+                InProcessTransport to a fake of the API
+        :param request_hooks: Default = None. Functions called with a RequestEvent after every request, e.g. a
+                MetricsCollector
+        :param tracer: Default = None. Records a span per experiment with child spans per operation and request
+        :param json_backend: Default = the fastest installed one. Decodes the response bodies, 'orjson', 'ujson',
+                'json' or a JsonBackend
+        :param lazy_decode: Default = False. If True only success and exception of a response are decoded up front,
+                its data when it is accessed first
+        :param experiment_state_ttl: Default = None. Seconds a cached experiment state is trusted, None keeps it
+                until the experiment list shows another version
+        """
+        if base_uri:
+            self._base_uri = base_uri.rstrip('/')
+        self._transport = transport if transport is not None else RequestsTransport(thread_safe=thread_safe)
         self._credentials = None
         self._session = None
+        self._experiment_states = ExperimentStateCache(experiment_state_ttl) if cache_experiment_state else None
+        self._response_cache = response_cache
+        self._result_store = result_store
+        self._config_cache = config_cache
+        self._scheduler = scheduler
+        self._retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self._login_lock = threading.RLock()
+        self._session_generation = 0
+        self._session_store = session_store
+        self._request_hooks = list(request_hooks) if request_hooks else []
+        self._tracer = tracer
+        self._json_backend = resolve_backend(json_backend)
+        self._lazy_decode = lazy_decode
+        if tracer is not None:
+            self._request_hooks.append(tracer)
+
+    @property
+    def transport(self):
+        # type: () -> Transport
+        return self._transport
 
     def create_session(self, credentials):
         # type: (AcQuantumCredentials) -> None
 
-        self._credentials = credentials
-        csrf = self._request_csrf_token()
-        cookies = self._req.cookies
-        self._session = AcQuantumSession(csrf, cookies, credentials)
-        response = self._login().json()
-        if not response['success']:
-            raise Exception('Connection refused: {}'.format(response['message']))
+        with self._login_lock:
+            self._credentials = credentials
+            if self._session_store is not None and self._restore_session(self._session_store):
+                return
+            csrf = self._request_csrf_token()
+            response = self._login(csrf).json()
+            if not response['success']:
+                raise Exception('Connection refused: {}'.format(response['message']))
+            self._session = AcQuantumSession(csrf, self._transport.cookies, credentials)
+            if self._session_store is not None:
+                self._session_store.put(self._session_key(), csrf, self._transport.cookies)
+
+    def close(self):
+        # type: () -> None
+        self._transport.close()
+
+    def cache_stats(self):
+        # type: () -> dict
+        """
+        :return: hits, misses and size per cached endpoint, empty if no response cache is configured
+        """
+        return self._response_cache.stats() if self._response_cache is not None else {}
 
     def reconnect_session(self):
-        print('... reconnecting session')
-        self.create_session(self._credentials)
+        _log.info('reconnecting session')
+        with self._login_lock:
+            self._forget_session()
+            self.create_session(self._credentials)
+            self._session_generation += 1
+
+    def _relogin(self, generation, csrf):
+        # type: (int, str) -> bool
+        """
+        Logs in again, unless another thread did so since the rejected request was sent.
+
+        :param generation: the session generation the rejected request was sent with
+        :param csrf: the CSRF token the rejected request was sent with
+        :return: True if this call logged in
+        """
+        with self._login_lock:
+            if generation != self._session_generation or csrf != self._session.csrf:
+                return False
+            _log.info('session expired, logging in again')
+            self._forget_session()
+            self.create_session(self._credentials)
+            self._session_generation += 1
+            return True
+
+    def add_request_hook(self, hook):
+        # type: (Callable[[RequestEvent], None]) -> None
+        """
+        :param hook: function called with a RequestEvent after every request, exceptions it raises are logged
+        """
+        self._request_hooks.append(hook)
+
+    @contextlib.contextmanager
+    def _traced(self, operation, experiment_id=None, root=None, **attributes):
+        """
+        Runs the block in a span of the operation below the span of the experiment, if a tracer is configured.
+
+        :param root: the root span of an experiment that is created in the block, it ends if the block fails
+        """
+        if self._tracer is None:
+            yield None
+            return
+        parent = root if root is not None else self._tracer.experiment(experiment_id) if experiment_id else None
+        try:
+            with self._tracer.span(operation, parent, **attributes) as span:
+                yield span
+        except Exception as e:
+            if root is not None:
+                self._tracer.end_span(root, e)
+            raise
+
+    def _emit(self, event):
+        # type: (RequestEvent) -> None
+        for hook in self._request_hooks:
+            try:
+                hook(event)
+            except Exception:
+                _log.exception('request hook %r failed', hook)
+
+    def save_session(self, store=None):
+        # type: (SessionStore) -> None
+        """
+        Stores the CSRF token and cookies of the current session, credentials are not stored.
 
-    def save_session(self):
-        with open('session', 'wb') as f:
-            self._session.cookies = self._req.cookies
-            pickle.dump(self._session, f)
+        :param store: Default: the session store of the connector, or a FileSessionStore in session.json
+        """
+        store = store if store is not None else self._session_store or FileSessionStore()
+        store.put(self._session_key(), self._session.csrf, self._transport.cookies)
 
-    def load_session(self):
-        with open('session', 'rb') as f:
-            self._session = pickle.load(f)
-            self._req.cookies.update(self._session.cookies)
+    def load_session(self, credentials=None, store=None):
+        # type: (AcQuantumCredentials, SessionStore) -> bool
+        """
+        Continues a stored session without logging in.
 
-    def _login(self):
-        # type: () -> requests.Response
+        :param credentials: the credentials the session was created with, Default: those of the last create_session.
+                They are needed to log in again when the session expired on the server
+        :param store: Default: the session store of the connector, or a FileSessionStore in session.json
+        :return: False if no unexpired session was stored
+        """
+        with self._login_lock:
+            if credentials is not None:
+                self._credentials = credentials
+            if self._credentials is None:
+                raise ValueError('The credentials of the stored session are required')
+            return self._restore_session(store if store is not None else self._session_store or FileSessionStore())
+
+    def _session_key(self):
+        # type: () -> str
+        return '{}|{}'.format(self._base_uri, self._credentials.user_name)
+
+    def _restore_session(self, store):
+        # type: (SessionStore) -> bool
+        record = store.get(self._session_key())
+        if record is None:
+            return False
+        restore_cookies(record, self._transport.cookies)
+        self._session = AcQuantumSession(record['csrf'], self._transport.cookies, self._credentials)
+        self._session_generation += 1
+        return True
+
+    def _forget_session(self):
+        # type: () -> None
+        if self._session_store is not None:
+            self._session_store.delete(self._session_key())
+
+    def _request(self, method, uri, priority=PRIORITY_NORMAL, event=None, **kwargs):
+        # type: (str, str, int, RequestEvent, **Any) -> requests.Response
+        """
+        Sends a request through the scheduler, if one is configured. A throttled request (HTTP 429) holds back all
+        requests of the scheduler for the Retry-After seconds and is sent again. GET requests are retried after
+        transient errors according to the retry policy. A request carrying the CSRF token that is rejected with
+        HTTP 403 is sent again once after a new login. Requests with a streamed body are never sent twice.
+
+        :param method: 'GET' or 'POST'
+        :param uri: the URI
+        :param priority: lane of the request in the scheduler
+        :param event: the event to record the request in, the caller reports it. Default: a new event is reported
+                to the request hooks, if there are any
+        :param kwargs: the arguments of the requests call
+        """
+        emit = event is None and bool(self._request_hooks)
+        if emit:
+            event = RequestEvent(method, urlsplit(uri).path)
+        replayable = not hasattr(kwargs.get('data'), '__next__')
+        if event is not None and not replayable:
+            kwargs['data'] = self._count_sent(kwargs['data'], event)
+        generation = self._session_generation
+        try:
+            response = self._send(method, uri, priority, replayable, event, **kwargs)
+            headers = kwargs.get('headers') or {}
+            if response.status_code == 403 and replayable and self._TOKEN_HEADER_KEY in headers \
+                    and self._credentials is not None:
+                relogin = self._relogin(generation, headers[self._TOKEN_HEADER_KEY])
+                if event is not None:
+                    event.relogin = relogin
+                kwargs['headers'] = dict(headers, **{self._TOKEN_HEADER_KEY: self._session.csrf})
+                response = self._send(method, uri, priority, replayable, event, **kwargs)
+        except Exception as err:
+            if event is not None:
+                event.error = err
+                if emit:
+                    self._emit(event)
+            raise
+        if event is not None:
+            self._count_bytes(event, response, replayable, **kwargs)
+            if emit:
+                self._emit(event)
+        return response
+
+    def _call(self, method, uri, priority=PRIORITY_NORMAL, **kwargs):
+        # type: (str, str, int, **Any) -> AcQuantumResponse
+        """
+        Sends a request like _request and decodes the response with handle_ac_response.
+        """
+        if not self._request_hooks:
+            return self.handle_ac_response(self._request(method, uri, priority, **kwargs), self._json_backend,
+                                           self._lazy_decode)
+        event = RequestEvent(method, urlsplit(uri).path)
+        try:
+            response = self._request(method, uri, priority, event=event, **kwargs)
+            start = time.perf_counter()
+            try:
+                return self.handle_ac_response(response, self._json_backend, self._lazy_decode)
+            finally:
+                event.parse_seconds = time.perf_counter() - start
+        except Exception as err:
+            event.error = err
+            raise
+        finally:
+            self._emit(event)
+
+    def _send(self, method, uri, priority, replayable, event, **kwargs):
+        # type: (str, str, int, bool, RequestEvent, **Any) -> requests.Response
+        send = functools.partial(self._transport.request, method)
+        policy = self._retry_policy
+        retries = policy.max_retries if method == 'GET' and replayable else 0
+        attempt = throttled = 0
+        waiting = time.perf_counter()
+        while True:
+            if self._scheduler is not None:
+                self._scheduler.acquire(priority)
+            sending = time.perf_counter()
+            try:
+                response = send(uri, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as err:
+                waiting = self._lap(event, waiting, sending)
+                if attempt >= retries:
+                    raise
+                _log.warning('%s %s failed (%s), retrying', method, uri, err)
+            else:
+                waiting = self._lap(event, waiting, sending)
+                if event is not None:
+                    event.status_code = response.status_code
+                if self._scheduler is not None and response.status_code == 429:
+                    retry_after = response.headers.get('Retry-After', '')
+                    self._scheduler.pause(float(retry_after) if retry_after.isdigit()
+                                          else 1.0 / self._scheduler.bucket.rate)
+                    if not replayable or throttled == self._THROTTLE_RETRIES:
+                        return response
+                    throttled += 1
+                    if event is not None:
+                        event.throttled += 1
+                    response.close()
+                    continue
+                if attempt >= retries or response.status_code not in policy.status_codes:
+                    return response
+                _log.warning('%s %s failed with status %d, retrying', method, uri, response.status_code)
+                response.close()
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+            if event is not None:
+                event.retries += 1
+
+    @staticmethod
+    def _lap(event, waiting, sending):
+        # type: (RequestEvent, float, float) -> float
+        """
+        Adds the time waited before and spent in one attempt to the event.
+
+        :return: the end of the attempt
+        """
+        now = time.perf_counter()
+        if event is not None:
+            event.wait_seconds += sending - waiting
+            event.network_seconds += now - sending
+        return now
+
+    @staticmethod
+    def _count_sent(chunks, event):
+        # type: (Iterator[bytes], RequestEvent) -> Iterator[bytes]
+        for chunk in chunks:
+            event.bytes_sent += len(chunk)
+            yield chunk
+
+    @staticmethod
+    def _count_bytes(event, response, replayable, data=None, json=None, stream=False, **kwargs):
+        # type: (RequestEvent, requests.Response, bool, Any, Any, bool, **Any) -> None
+        if replayable:
+            body = getattr(response.request, 'body', None) if getattr(response, 'request', None) else None
+            if body is None:
+                if json is not None:
+                    body = _json.dumps(json)
+                elif isinstance(data, dict):
+                    body = urlencode(data)
+                else:
+                    body = data
+            event.bytes_sent = len(body.encode('utf-8') if isinstance(body, str) else body or b'')
+        if stream:
+            event.bytes_received = int(response.headers.get('Content-Length') or 0)
+        else:
+            event.bytes_received = len(response.content or b'')
+
+    def _login(self, csrf=None):
+        # type: (str) -> requests.Response
 
         uri = '{}/login'.format(self._base_uri)
         params = {'_input_charset': 'utf-8'}
         headers = {'Content-Type': 'application/x-www-form-urlencoded'}
         payload = {
-            '_csrf': self._session.csrf,
+            '_csrf': csrf if csrf is not None else self._session.csrf,
             'username': self._credentials.user_name,
             'password': self._credentials.password,
         }
 
-        return self._req.post(uri, data=payload, params=params, headers=headers)
+        return self._request('POST', uri, priority=PRIORITY_HIGH, data=payload, params=params, headers=headers)
 
     def create_experiment(self, bit_width, experiment_type, experiment_name):
         # type: (int, AcQuantumBackendType, str) -> int
@@ -109,38 +465,94 @@ class AcQuantumConnector(object):
             'type': experiment_type.name,
             'name': experiment_name
         }
-        response = self.handle_ac_response(self._req.post(uri, params=params, headers=headers, json=payload))
+        root = None
+        if self._tracer is not None:
+            root = self._tracer.start_experiment(**{'experiment.name': experiment_name,
+                                                    'experiment.bit_width': bit_width,
+                                                    'experiment.backend_type': experiment_type.name})
+        with self._traced('create_experiment', root=root):
+            response = self._call('POST', uri, priority=PRIORITY_HIGH, params=params, headers=headers, json=payload)
+        if root is not None:
+            self._tracer.bind(response.data, root)
+        if self._experiment_states is not None:
+            self._experiment_states.put(response.data, ExperimentState(None, []))
+        if self._response_cache is not None:
+            self._response_cache.experiments.invalidate()
         return response.data
 
-    def update_experiment(self, experiment_id, gates, code=None, override=True):
-        # type: (int, [Gate], str, bool) -> None
+    def update_experiment(self, experiment_id, gates, code=None, override=True, stream=False, compress=False,
+                          chunk_size=DEFAULT_CHUNK_SIZE, optimize=False):
+        # type: (int, Union[List[Gate], Circuit], str, bool, bool, bool, int, bool) -> None
 
         """
         :param experiment_id: ID of created Experiment
-        :param gates: Gates object definition that should be submitted
+        :param gates: Gates object definition that should be submitted, either a list of gates or a Circuit
         :param code:
         :param override: Default = True. If False the last project State gets fetched from the Backend and Merged with
-                the new Gates Definition
+                the new Gates Definition. With cache_experiment_state the fetch is skipped for cached experiments,
+                a failed save drops the cached experiment
+        :param stream: Default = False. If True the payload is encoded incrementally and sent as chunked request body
+        :param compress: Default = False. If True the streamed payload is gzip compressed
+        :param chunk_size: approximate size in bytes of the streamed chunks
+        :param optimize: Default = False. If True inverse gate pairs are cancelled, rotations merged and the columns
+                compacted before the upload, see optimize_circuit
         :return: None
         :raises AcQuantumRequestError
         """
+        if optimize:
+            gates = optimize_circuit(gates)
 
         uri = '{}/experiment/codesave'.format(self._base_uri)
         params = {
             self._CHARSET_PARAM[0]: self._CHARSET_PARAM[1]
         }
         headers = {self._TOKEN_HEADER_KEY: self._session.csrf, 'Content-Type': 'application/json'}
-        payload = {
-            'experimentId': str(experiment_id),
-            'data': [gate.__dict__ for gate in gates],
-            'code': code if code else ''
-        }
-        if not override:
-            exp = self.get_experiment(experiment_id)
-            existing_gates = exp.data
-            payload['data'] = payload['data'] + existing_gates
-
-        self.handle_ac_response(self._req.post(uri, json=payload, params=params, headers=headers))
+        with self._traced('update_experiment', experiment_id, **{'experiment.gate_count': len(gates),
+                                                                  'stream': stream, 'compress': compress}):
+            existing = None if override else self._experiment_state(experiment_id)
+            existing_segments = existing.segments if existing else None
+            try:
+                if stream or compress:
+                    body = iter_codesave_payload(experiment_id, gates, code, existing_segments, chunk_size)
+                    if compress:
+                        headers['Content-Encoding'] = 'gzip'
+                        body = gzip_chunks(body)
+                    self._call('POST', uri, priority=PRIORITY_HIGH, data=body, params=params, headers=headers)
+                elif isinstance(gates, Circuit):
+                    body = b''.join(iter_codesave_payload(experiment_id, gates, code, existing_segments))
+                    self._call('POST', uri, priority=PRIORITY_HIGH, data=body, params=params, headers=headers)
+                else:
+                    payload = {
+                        'experimentId': str(experiment_id),
+                        'data': [gate.__dict__ for gate in gates],
+                        'code': code if code else ''
+                    }
+                    if existing:
+                        payload['data'] = payload['data'] + existing.gates()
+
+                    self._call('POST', uri, priority=PRIORITY_HIGH, json=payload, params=params, headers=headers)
+            except Exception:
+                # the save may have been applied partially or not at all
+                if self._experiment_states is not None:
+                    self._experiment_states.invalidate(experiment_id)
+                raise
+
+        if self._response_cache is not None:
+            self._response_cache.invalidate(experiment_id)
+        if self._experiment_states is not None:
+            segment = gates.copy() if isinstance(gates, Circuit) else [dict(gate.__dict__) for gate in gates]
+            if override:
+                previous = self._experiment_states.get(experiment_id)
+                existing = ExperimentState(previous.version if previous else None, [])
+            self._experiment_states.put(experiment_id, existing.prepend(segment))
+
+    def _experiment_state(self, experiment_id):
+        # type: (int) -> ExperimentState
+        state = self._experiment_states.get(experiment_id) if self._experiment_states is not None else None
+        if state is None:
+            experiment = self.get_experiment(experiment_id)
+            state = ExperimentState(experiment.detail.version, [experiment.data])
+        return state
 
     def get_experiment(self, experiment_id):
         # type: (int) -> AcQuantumExperiment
@@ -148,6 +560,10 @@ class AcQuantumConnector(object):
         :param experiment_id: ID of experiment
         :return: AcQuantumExperiment
         """
+        if self._response_cache is not None:
+            experiment = self._response_cache.details.get(int(experiment_id))
+            if experiment is not None:
+                return experiment
 
         uri = '{}/experiment/detail'.format(self._base_uri)
         params = {
@@ -156,15 +572,24 @@ class AcQuantumConnector(object):
         }
         headers = {self._TOKEN_HEADER_KEY: self._session.csrf}
 
-        response = self.handle_ac_response(self._req.get(uri, params=params, headers=headers))
+        with self._traced('get_experiment', experiment_id):
+            response = self._call('GET', uri, params=params, headers=headers)
         body = response.data
         exp_detail = AcQuantumExperimentDetail(body['experimentName'], body['version'], int(experiment_id),
                                                body['experimentType'], body['execution'], bit_width=body['bitWidth'])
         experiment = AcQuantumExperiment(detail=exp_detail, data=body['data'], code=body['code'])
+        if self._experiment_states is not None:
+            self._experiment_states.put(experiment_id, ExperimentState(body['version'], [list(body['data'])]))
+        if self._response_cache is not None:
+            self._response_cache.details.put(int(experiment_id), experiment)
         return experiment
 
     def get_experiments(self):
         # type: () -> [AcQuantumExperimentDetail]
+        if self._response_cache is not None:
+            experiment_list = self._response_cache.experiments.get('list')
+            if experiment_list is not None:
+                return experiment_list
 
         uri = '{}/experiment/list'.format(self._base_uri)
         params = {
@@ -172,11 +597,16 @@ class AcQuantumConnector(object):
         }
         headers = {self._TOKEN_HEADER_KEY: self._session.csrf, 'Content-Type': 'application/json'}
 
-        response = self.handle_ac_response(self._req.get(uri, params=params, headers=headers))
+        response = self._call('GET', uri, params=params, headers=headers)
         body = response.data
         experiment_list = [
             AcQuantumExperimentDetail(exp['name'], exp['version'], exp['experimentId'], exp['type'],
                                       exp['execution']) for exp in body]
+        if self._experiment_states is not None:
+            for experiment in experiment_list:
+                self._experiment_states.validate(experiment.experiment_id, experiment.version)
+        if self._response_cache is not None:
+            self._response_cache.experiments.put('list', experiment_list)
         return experiment_list
 
     def run_experiment(self, experiment_id, experiment_type, bit_width, shots, seed=None):
@@ -192,10 +622,71 @@ class AcQuantumConnector(object):
             'shots': shots,
             'seed': seed if seed else ''
         }
-        self.handle_ac_response(self._req.post(uri, headers=headers, params=params))
+        attributes = {'experiment.backend_type': experiment_type.name, 'experiment.bit_width': bit_width,
+                      'experiment.shots': shots}
+        with self._traced('run_experiment', experiment_id, **attributes):
+            self._call('POST', uri, priority=PRIORITY_HIGH, headers=headers, params=params)
+        if self._tracer is not None:
+            self._tracer.experiment(experiment_id).attributes.update(attributes)
+            self._tracer.start_execution(experiment_id, **attributes)
+        if self._response_cache is not None:
+            self._response_cache.invalidate(experiment_id)
+        if self._result_store is not None:
+            self._result_store.mark_incomplete(experiment_id)
+
+    def submit_batch(self, circuits, backend_type, shots, bit_width=None, experiment_name='Batch', seed=None,
+                     max_workers=8):
+        # type: (list, AcQuantumBackendType, int, int, str, str, int) -> AcQuantumBatchResponse
+
+        """
+        Creates, saves and submits one experiment per circuit. Up to ``max_workers`` circuits are pipelined
+        concurrently, a failing circuit does not abort the others.
+
+        :param circuits: list of gate lists or Circuits, one experiment is created for each
+        :param backend_type: Type of the backend the experiments should run
+        :param shots: number of shots per experiment
+        :param bit_width: bit width of all experiments. Default: the highest row used by the circuit
+        :param experiment_name: prefix of the experiment names, the index of the circuit is appended
+        :param seed:
+        :param max_workers: maximum number of circuits in flight
+        :return: AcQuantumBatchResponse with the experiment ids in input order and the errors per index
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be greater 0')
+
+        experiment_ids = [None] * len(circuits)
+        errors = {}
+
+        def submit(index):
+            gates = circuits[index]
+            width = bit_width if bit_width else self._bit_width(gates)
+            try:
+                with self._transport.thread_session():
+                    experiment_ids[index] = self.create_experiment(width, backend_type,
+                                                                   '{}_{}'.format(experiment_name, index))
+                    self.update_experiment(experiment_ids[index], gates)
+                    self.run_experiment(experiment_ids[index], backend_type, width, shots, seed=seed)
+            except Exception as e:
+                errors[index] = e
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(submit, range(len(circuits))))
+        return AcQuantumBatchResponse(experiment_ids, errors)
+
+    @staticmethod
+    def _bit_width(gates):
+        # type: (Union[List[Gate], Circuit]) -> int
+        if isinstance(gates, Circuit):
+            return gates.bit_width
+        rows = [getattr(gate, attr) for gate in gates for attr in ('y', 'y1', 'y2') if hasattr(gate, attr)]
+        return max(rows) if rows else 1
 
     def get_result(self, experiment_id):
         # type: (int) -> AcQuantumResultResponse
+        if self._result_store is not None:
+            stored = self._result_store.get_response(experiment_id)
+            if stored is not None:
+                return stored
 
         uri = '{}/experiment/resultlist'.format(self._base_uri)
         params = {
@@ -204,39 +695,116 @@ class AcQuantumConnector(object):
         }
         headers = {self._TOKEN_HEADER_KEY: self._session.csrf}
 
-        response = self.handle_ac_response(self._req.get(uri, params=params, headers=headers))
-        body = response.data
-        simulated_result = [
-            AcQuantumResult(res['id'], res['seed'], res['shots'], res['startTime'], res['measureQubits'],
-                            res['finishTime'],
-                            res['process'], res['data']) for res in body['simulateResult']]
-        real_result = [
-            AcQuantumResult(res['id'], res['seed'], res['shots'], res['startTime'], res['measureQubits'],
-                            res['finishTime'],
-                            res['process'], res['data']) for res in body['realResult']]
-        return AcQuantumResultResponse(simulated_result, real_result)
-
-    def download_result(self, experiment_id, file_name=None):
-        # type: (int, str) -> None
+        with self._traced('get_result', experiment_id) as span:
+            response = self._call('GET', uri, priority=PRIORITY_LOW, params=params, headers=headers)
+            body = response.data
+            if self._result_store is not None:
+                self._result_store.put_response(experiment_id, body)
+            simulated_result = [AcQuantumResult.from_dict(res) for res in body['simulateResult']]
+            real_result = [AcQuantumResult.from_dict(res) for res in body['realResult']]
+            if span is not None:
+                span.set_attribute('results', len(simulated_result) + len(real_result))
+        response = AcQuantumResultResponse(simulated_result, real_result)
+        if self._tracer is not None:
+            backend_type = self._tracer.experiment(experiment_id).attributes.get('experiment.backend_type')
+            if response.is_finished(AcQuantumBackendType[backend_type] if backend_type else None):
+                self._tracer.end_experiment(experiment_id)
+        return response
+
+    def download_result(self, experiment_id, file_name=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        # type: (int, str, int) -> None
+        """
+        Streams the result sheet of the experiment to disk.
 
+        :param experiment_id: ID of the experiment
+        :param file_name: Default = result_<experiment_id>.xls
+        :param chunk_size: size in bytes of the chunks written to disk
+        """
+        if not file_name:
+            file_name = 'result_{}.xls'.format(experiment_id)
+        with self._traced('download_result', experiment_id):
+            self._download(experiment_id, file_name, chunk_size, resume=False)
+
+    def download_results(self, experiment_ids, directory='.', max_workers=4, chunk_size=DEFAULT_CHUNK_SIZE,
+                         resume=True):
+        # type: (List[int], str, int, int, bool) -> AcQuantumDownloadReport
+        """
+        Streams the result sheets of the experiments to ``directory`` as result_<experiment_id>.xls. Up to
+        ``max_workers`` downloads run concurrently, a failing download does not abort the others.
+
+        :param experiment_ids: IDs of the experiments
+        :param directory: target directory, created if missing
+        :param max_workers: maximum number of concurrent downloads
+        :param chunk_size: size in bytes of the chunks written to disk
+        :param resume: Default = True. Present files are skipped if they are complete and continued otherwise
+        :return: AcQuantumDownloadReport with the files, skipped experiments, errors and throughput
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be greater 0')
+        os.makedirs(directory, exist_ok=True)
+        files = {experiment_id: os.path.join(directory, 'result_{}.xls'.format(experiment_id))
+                 for experiment_id in experiment_ids}
+
+        def download(experiment_id):
+            try:
+                with self._transport.thread_session(), self._traced('download_result', experiment_id):
+                    return self._download(experiment_id, files[experiment_id], chunk_size, resume)
+            except Exception as e:
+                return e
+
+        start = time.monotonic()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = dict(zip(files, executor.map(download, files)))
+        elapsed = time.monotonic() - start
+
+        errors = {experiment_id: e for experiment_id, e in outcomes.items() if isinstance(e, Exception)}
+        done = {experiment_id: outcome for experiment_id, outcome in outcomes.items() if experiment_id not in errors}
+        return AcQuantumDownloadReport({experiment_id: files[experiment_id] for experiment_id in done},
+                                       [experiment_id for experiment_id, (_, skipped) in done.items() if skipped],
+                                       errors, sum(written for written, _ in done.values()), elapsed)
+
+    def _download(self, experiment_id, file_name, chunk_size, resume):
+        # type: (int, str, int, bool) -> (int, bool)
+        """
+        :return: the number of bytes written and whether the present file was already complete
+        """
         uri = '{}/experiment/resultDownload'.format(self._base_uri)
         params = {'id': experiment_id}
         headers = {
             self._TOKEN_HEADER_KEY: self._session.csrf,
             'Accept-Encoding': 'gzip, deflate'
         }
-        response = self._req.get(uri, params=params, headers=headers)
-        if not file_name:
-            file_name = 'result_{}.xls'.format(experiment_id)
-
-        with open(file_name, 'wb') as f:
-            f.write(response.content)
+        offset = os.path.getsize(file_name) if resume and os.path.isfile(file_name) else 0
+        if offset:
+            # byte ranges count the encoded body, the file on disk holds the decoded one
+            headers['Accept-Encoding'] = 'identity'
+            headers['Range'] = 'bytes={}-'.format(offset)
+
+        with self._request('GET', uri, priority=PRIORITY_LOW, params=params, headers=headers,
+                           stream=True) as response:
+            if response.status_code == 416:
+                if response.headers.get('Content-Range') == 'bytes */{}'.format(offset):
+                    return 0, True
+                return self._download(experiment_id, file_name, chunk_size, resume=False)
+            if response.status_code not in (200, 206):
+                self.handle_ac_response(response, self._json_backend)
+            if response.status_code == 200 and offset:
+                if response.headers.get('Content-Length') == str(offset):
+                    return 0, True
+                offset = 0
+
+            written = 0
+            with open(file_name, 'ab' if offset else 'wb') as f:
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    written += len(chunk)
+            return written, False
 
     def _request_csrf_token(self):
         # type: () -> str
 
         uri = '{}/login'.format(self._base_uri)
-        response = self._req.get(uri)
+        response = self._request('GET', uri, priority=PRIORITY_HIGH)
         return re.search('[a-f\d]{8}(-[a-f\d]{4}){3}-[a-f\d]{12}?', response.text).group()
 
     def delete_experiment(self, experiment_id):
@@ -249,7 +817,16 @@ class AcQuantumConnector(object):
             'experimentId': experiment_id,
         }
 
-        self.handle_ac_response(self._req.post(uri, headers=headers, params=params))
+        with self._traced('delete_experiment', experiment_id):
+            self._call('POST', uri, headers=headers, params=params)
+        if self._tracer is not None:
+            self._tracer.end_experiment(experiment_id, forget=True)
+        if self._experiment_states is not None:
+            self._experiment_states.invalidate(experiment_id)
+        if self._response_cache is not None:
+            self._response_cache.invalidate(experiment_id)
+        if self._result_store is not None:
+            self._result_store.delete_experiment(experiment_id)
 
     def delete_result(self, result_id):
         # type: (int) -> None
@@ -260,23 +837,50 @@ class AcQuantumConnector(object):
             'id': result_id
         }
 
-        self.handle_ac_response(self._req.post(uri, headers=headers, params=params))
+        self._call('POST', uri, headers=headers, params=params)
+        if self._result_store is not None:
+            self._result_store.delete_result(result_id)
 
-    def get_backend_config(self):
-        # type: () -> AcQuantumRawConfig
+    def get_backend_config(self, computer_id=None):
+        # type: (str) -> AcQuantumRawConfig
 
         """
-
+        :param computer_id: Default = None. The computer to return the configuration of, the first one if None
         :return: Backend Configuration
+        :raises: AcRequestError if the server has no configuration of the computer
         """
+        cache = self._config_cache
+        if cache is not None and cache.fresh() and cache.get(computer_id) is not None:
+            return cache.get(computer_id)
 
         uri = '{}/computerConfig/query'.format(self._base_uri)
         headers = {'Content-Type': 'application/json', self._TOKEN_HEADER_KEY: self._session.csrf}
         params = {
             self._CHARSET_PARAM[0]: self._CHARSET_PARAM[1]
         }
-        response = self.handle_ac_response(self._req.get(uri, headers=headers, params=params))
-        return AcQuantumRawConfig.from_json(response.data)
+        if cache is not None and cache.etag:
+            headers['If-None-Match'] = cache.etag
+        raw_response = self._request('GET', uri, headers=headers, params=params)
+        if cache is not None and raw_response.status_code == 304:
+            if cache.get(computer_id) is not None:
+                cache.touch()
+                return cache.get(computer_id)
+            # the cache lacks the computer, e.g. it was invalidated meanwhile, fetch the configurations in full
+            del headers['If-None-Match']
+            raw_response = self._request('GET', uri, headers=headers, params=params)
+
+        response = self.handle_ac_response(raw_response, self._json_backend)
+        if cache is None:
+            values = response.data
+            if computer_id is not None:
+                values = [value for value in values if value['computerId'] == computer_id]
+            config = AcQuantumRawConfig.from_json(values) if values else None
+        else:
+            cache.update(response.data, raw_response.headers.get('ETag'))
+            config = cache.get(computer_id)
+        if config is None:
+            raise AcQuantumRequestError('No configuration of computer {}'.format(computer_id))
+        return config
 
     def available_backends(self):
         # TODO: implement
@@ -313,18 +917,29 @@ class AcQuantumConnector(object):
         ]
 
     @classmethod
-    def handle_ac_response(cls, response):
-        # type: (requests.Response) -> AcQuantumResponse
+    def handle_ac_response(cls, response, json_backend=None, lazy=False):
+        # type: (requests.Response, JsonBackend, bool) -> AcQuantumResponse
 
         r"""
         :param response: requests.Response
+        :param json_backend: Default = the fastest installed one
+        :param lazy: Default = False. If True the data of a successful response is decoded when it is accessed first,
+                a malformed one raises AcRequestError then
         :return: AcQuantumResponse
         :raises: AcRequestError, AcRequestForbiddenError
         """
+        backend = json_backend if json_backend is not None else default_backend()
         try:
             if response.status_code == 200:
-                json = response.json()
+                rest = None
+                if lazy:
+                    json, rest = split_envelope(response.content, backend, required=('success', 'exception'))
+                else:
+                    json = backend.loads(response.content)
                 if json['success']:
+                    if rest is not None:
+                        return AcQuantumResponse(success=json['success'], exception=json['exception'],
+                                                 decode_data=functools.partial(cls._decode_data, backend, rest))
                     try:
                         data = json['data']
                         return AcQuantumResponse(success=json['success'], exception=json['exception'], data=data)
@@ -333,9 +948,17 @@ class AcQuantumConnector(object):
                 else:
                     raise AcQuantumRequestError(json['exception'])
             else:
-                error = response.json()
+                error = backend.loads(response.content)
                 if response.status_code == 403:
                     raise AcQuantumRequestForbiddenError()
                 raise AcQuantumRequestError(error['exception'], status_code=response.status_code)
         except ValueError as err:
             raise AcQuantumRequestError(err.__str__())
+
+    @staticmethod
+    def _decode_data(backend, members):
+        # type: (JsonBackend, bytes) -> Any
+        try:
+            return backend.loads(members)['data']
+        except ValueError as err:
+            raise AcQuantumRequestError(err.__str__())
@@ -0,0 +1,126 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from requests.adapters import HTTPAdapter
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.config import AcQuantumRawConfig
+from acquantumconnector.model.gates import Gate
+from acquantumconnector.model.response import AcQuantumExperiment, AcQuantumExperimentDetail, \
+    AcQuantumResultResponse
+
+# Python 3.6 has no get_running_loop, there get_event_loop returns the running loop inside a coroutine
+_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncAcQuantumConnector(object):
+    """
+    Coroutine based variant of the :class:`AcQuantumConnector`.
+
+    All operations share one authenticated session (CSRF token and cookies) and one keep-alive connection pool
+    bounded by ``max_connections``. The blocking round-trips are run on a worker pool of the same size, so up to
+    ``max_connections`` requests can be in flight at once. Each worker thread sends its requests through an own HTTP
+    session, so a connector that is not thread safe may be passed as well. Error handling is the one of
+    :meth:`AcQuantumConnector.handle_ac_response`.
+    """
+
+    def __init__(self, connector=None, max_connections=10):
+        # type: (AcQuantumConnector, int) -> None
+        if max_connections < 1:
+            raise ValueError('max_connections must be greater 0')
+        self._connector = connector if connector else AcQuantumConnector(thread_safe=True)
+        self._max_connections = max_connections
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, pool_block=True)
+        self._connector.transport.mount('http://', adapter)
+        self._connector.transport.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+
+    @property
+    def connector(self):
+        # type: () -> AcQuantumConnector
+        return self._connector
+
+    async def _run(self, function, *args, **kwargs):
+        loop = _running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(self._call, function, *args, **kwargs))
+
+    def _call(self, function, *args, **kwargs):
+        with self._connector.transport.thread_session():
+            return function(*args, **kwargs)
+
+    async def create_session(self, credentials):
+        # type: (AcQuantumCredentials) -> None
+        await self._run(self._connector.create_session, credentials)
+
+    async def reconnect_session(self):
+        # type: () -> None
+        await self._run(self._connector.reconnect_session)
+
+    async def create_experiment(self, bit_width, experiment_type, experiment_name):
+        # type: (int, AcQuantumBackendType, str) -> int
+        return await self._run(self._connector.create_experiment, bit_width, experiment_type, experiment_name)
+
+    async def update_experiment(self, experiment_id, gates, code=None, override=True):
+        # type: (int, List[Gate], str, bool) -> None
+        await self._run(self._connector.update_experiment, experiment_id, gates, code=code, override=override)
+
+    async def get_experiment(self, experiment_id):
+        # type: (int) -> AcQuantumExperiment
+        return await self._run(self._connector.get_experiment, experiment_id)
+
+    async def get_experiments(self):
+        # type: () -> List[AcQuantumExperimentDetail]
+        return await self._run(self._connector.get_experiments)
+
+    async def run_experiment(self, experiment_id, experiment_type, bit_width, shots, seed=None):
+        # type: (int, AcQuantumBackendType, int, int, str) -> None
+        await self._run(self._connector.run_experiment, experiment_id, experiment_type, bit_width, shots, seed=seed)
+
+    async def get_result(self, experiment_id):
+        # type: (int) -> AcQuantumResultResponse
+        return await self._run(self._connector.get_result, experiment_id)
+
+    async def download_result(self, experiment_id, file_name=None):
+        # type: (int, str) -> None
+        await self._run(self._connector.download_result, experiment_id, file_name=file_name)
+
+    async def delete_experiment(self, experiment_id):
+        # type: (int) -> None
+        await self._run(self._connector.delete_experiment, experiment_id)
+
+    async def delete_result(self, result_id):
+        # type: (int) -> None
+        await self._run(self._connector.delete_result, result_id)
+
+    async def get_backend_config(self, computer_id=None):
+        # type: (str) -> AcQuantumRawConfig
+        return await self._run(self._connector.get_backend_config, computer_id)
+
+    def close(self):
+        # type: () -> None
+        self._executor.shutdown(wait=True)
+        self._connector.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
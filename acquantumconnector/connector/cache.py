@@ -0,0 +1,279 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Tuple, Union
+
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.config import AcQuantumRawConfig
+
+
+class ExperimentState(object):
+
+    def __init__(self, version, segments):
+        # type: (int, List[Union[List[dict], Circuit]]) -> None
+        """
+        :param version: version of the experiment as returned by the backend, None if it is not known
+        :param segments: the stored gates in payload order, as lists of gate dictionaries or Circuits
+        """
+        self.version = version
+        self.segments = segments
+
+    def prepend(self, segment):
+        # type: (Union[List[dict], Circuit]) -> ExperimentState
+        """
+        :return: the state after saving ``segment`` in front of the stored gates. Its version is unknown until the
+                experiment is fetched again
+        """
+        return ExperimentState(None, [segment] + self.segments)
+
+    def gates(self):
+        # type: () -> List[dict]
+        data = []
+        for segment in self.segments:
+            data.extend([gate.__dict__ for gate in segment] if isinstance(segment, Circuit) else segment)
+        return data
+
+
+class ExperimentStateCache(object):
+    """
+    Gates and version of the experiments last seen or saved by this client, keyed by experiment id.
+
+    Cached states are trusted without asking the backend, so changes by other clients are only noticed when the
+    entry is dropped: whenever the experiment list shows a version that differs from the cached one, or cannot be
+    compared because the cached version is unknown, and once the entry is older than ``ttl`` seconds. The next
+    merge then falls back to a full refresh. The state of an experiment is replaced whenever its detail is fetched.
+    """
+
+    def __init__(self, ttl=None):
+        # type: (float) -> None
+        """
+        :param ttl: Default = None. Seconds after which a cached state is treated as missing, None keeps it
+        """
+        self.ttl = ttl
+        self._states = {}  # type: Dict[int, Tuple[ExperimentState, float]]
+        self._lock = threading.Lock()
+
+    def get(self, experiment_id):
+        # type: (int) -> ExperimentState
+        with self._lock:
+            state, created = self._states.get(int(experiment_id), (None, None))
+            if state is not None and self.ttl is not None and time.monotonic() - created > self.ttl:
+                del self._states[int(experiment_id)]
+                return None
+            return state
+
+    def put(self, experiment_id, state):
+        # type: (int, ExperimentState) -> None
+        with self._lock:
+            self._states[int(experiment_id)] = (state, time.monotonic())
+
+    def validate(self, experiment_id, version):
+        # type: (int, int) -> bool
+        """
+        :return: False if the cached version differs from ``version`` and the entry was dropped
+        """
+        with self._lock:
+            state, _ = self._states.get(int(experiment_id), (None, None))
+            if state is None:
+                return True
+            if state.version is None or state.version != version:
+                del self._states[int(experiment_id)]
+                return False
+            return True
+
+    def invalidate(self, experiment_id=None):
+        # type: (int) -> None
+        with self._lock:
+            if experiment_id is None:
+                self._states.clear()
+            else:
+                self._states.pop(int(experiment_id), None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._states)
+
+
+class LRUCache(object):
+    """
+    Thread-safe mapping bounded to ``max_size`` entries. The least recently used entry is evicted first and entries
+    older than ``ttl`` seconds are treated as missing.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size=128, ttl=None):
+        # type: (int, float) -> None
+        if max_size < 1:
+            raise ValueError('max_size must be greater 0')
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        # type: (Hashable, Any) -> Any
+        with self._lock:
+            value, created = self._entries.get(key, (self._MISSING, None))
+            if value is not self._MISSING and self.ttl is not None and time.monotonic() - created > self.ttl:
+                del self._entries[key]
+                value = self._MISSING
+            if value is self._MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        # type: (Hashable, Any) -> None
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=_MISSING):
+        # type: (Hashable) -> None
+        with self._lock:
+            if key is self._MISSING:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        # type: () -> Dict[str, int]
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+class ResponseCache(object):
+    """
+    Opt-in cache of the experiment list and the experiment details of an :class:`AcQuantumConnector`.
+
+    The connector drops the affected entries on its own updates, deletes and runs. Changes made by other clients are
+    only seen after the TTL expired. Cached objects are shared between callers and must not be modified.
+    """
+
+    def __init__(self, detail_ttl=30.0, list_ttl=10.0, max_size=256):
+        # type: (float, float, int) -> None
+        """
+        :param detail_ttl: seconds an experiment detail is served from the cache
+        :param list_ttl: seconds the experiment list is served from the cache
+        :param max_size: maximum number of cached experiment details
+        """
+        self.details = LRUCache(max_size, detail_ttl)
+        self.experiments = LRUCache(1, list_ttl)
+
+    def invalidate(self, experiment_id=None):
+        # type: (int) -> None
+        """
+        Drops the experiment list and the detail of ``experiment_id``, or all details if no id is given.
+        """
+        self.experiments.invalidate()
+        if experiment_id is None:
+            self.details.invalidate()
+        else:
+            self.details.invalidate(int(experiment_id))
+
+    def stats(self):
+        # type: () -> Dict[str, Dict[str, int]]
+        return {'detail': self.details.stats(), 'list': self.experiments.stats()}
+
+
+class BackendConfigCache(object):
+    """
+    Parsed backend configurations of an :class:`AcQuantumConnector`, one per computer id.
+
+    The configurations are served without a request for ``ttl`` seconds. After that the configuration is fetched
+    again, conditionally if the server sent an ETag. A computer keeps its parsed configuration, with all the values
+    decoded so far, as long as its status and last calibration time did not change.
+    """
+
+    def __init__(self, ttl=60.0):
+        # type: (float) -> None
+        """
+        :param ttl: seconds the configurations are used before they are fetched again
+        """
+        self.ttl = ttl
+        self.etag = None  # type: str
+        self._configs = OrderedDict()  # type: Dict[str, AcQuantumRawConfig]
+        self._fetched = None
+        self._lock = threading.Lock()
+
+    def fresh(self):
+        # type: () -> bool
+        with self._lock:
+            return self._fetched is not None and time.monotonic() - self._fetched <= self.ttl
+
+    def get(self, computer_id=None):
+        # type: (str) -> AcQuantumRawConfig
+        """
+        :return: the configuration of the computer, the first one if no id is given, or None
+        """
+        with self._lock:
+            if computer_id is None:
+                return next(iter(self._configs.values()), None)
+            return self._configs.get(computer_id)
+
+    def touch(self):
+        # type: () -> None
+        """
+        Restarts the TTL, e.g. after the server confirmed the cached configurations are unchanged.
+        """
+        with self._lock:
+            self._fetched = time.monotonic()
+
+    def update(self, values, etag=None):
+        # type: (List[dict], str) -> None
+        """
+        :param values: the entries of a ``/computerConfig/query`` response
+        :param etag: the ETag of the response
+        """
+        groups = OrderedDict()  # type: Dict[str, List[dict]]
+        for value in values:
+            groups.setdefault(value['computerId'], []).append(value)
+        with self._lock:
+            configs = OrderedDict()
+            for computer_id, entries in groups.items():
+                cached = self._configs.get(computer_id)
+                config = AcQuantumRawConfig.from_json(entries)
+                if cached is not None and self._calibration(cached) == self._calibration(config):
+                    config = cached
+                configs[computer_id] = config
+            self._configs = configs
+            self.etag = etag
+            self._fetched = time.monotonic()
+
+    def invalidate(self):
+        # type: () -> None
+        with self._lock:
+            self._configs.clear()
+            self.etag = None
+            self._fetched = None
+
+    @staticmethod
+    def _calibration(config):
+        # type: (AcQuantumRawConfig) -> tuple
+        status = config.system_status.config_value
+        return status.status, status.last_calibration_time
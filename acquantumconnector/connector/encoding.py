@@ -0,0 +1,85 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import itertools
+import json
+import zlib
+from typing import Iterable, Iterator, List, Union
+
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.gates import Gate
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def iter_gates_encoded(gates):
+    # type: (Union[Iterable[Union[Gate, dict]], Circuit]) -> Iterator[str]
+    """
+    :param gates: list of gates or gate dictionaries, or a Circuit
+    :return: iterator over the JSON objects of the single gates
+    """
+    if isinstance(gates, Circuit):
+        return gates.iter_encoded()
+    return (_encode(gate if isinstance(gate, dict) else gate.__dict__) for gate in gates)
+
+
+def iter_codesave_payload(experiment_id, gates, code=None, existing_segments=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # type: (int, Union[Iterable[Gate], Circuit], str, List[Union[List[dict], Circuit]], int) -> Iterator[bytes]
+    """
+    Encodes the ``/experiment/codesave`` body incrementally.
+
+    :param experiment_id: ID of the experiment
+    :param gates: list of gates or a Circuit
+    :param code:
+    :param existing_segments: gates appended after the gates, e.g. the data of the stored experiment, as list of
+            gate dictionary lists or Circuits
+    :param chunk_size: approximate size in bytes of the yielded chunks
+    :return: iterator over chunks of the UTF-8 encoded JSON body
+    """
+    buffer = ['{"experimentId":', json.dumps(str(experiment_id)), ',"data":[']
+    size = 0
+    separator = ''
+    segments = [gates] + (existing_segments if existing_segments else [])
+    encoded_gates = itertools.chain.from_iterable(iter_gates_encoded(segment) for segment in segments)
+    for encoded in encoded_gates:
+        buffer.append(separator)
+        buffer.append(encoded)
+        separator = ','
+        size += len(encoded) + 1
+        if size >= chunk_size:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+            size = 0
+    buffer.append('],"code":')
+    buffer.append(json.dumps(code if code else ''))
+    buffer.append('}')
+    yield ''.join(buffer).encode('utf-8')
+
+
+def gzip_chunks(chunks, level=6):
+    # type: (Iterable[bytes], int) -> Iterator[bytes]
+    """
+    :param chunks: the chunks of the uncompressed body
+    :param level: compression level
+    :return: iterator over the chunks of the gzip compressed body
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
@@ -0,0 +1,290 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import abc
+import json
+import re
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+_WHITESPACE = re.compile(rb'[ \t\n\r]*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR = re.compile(rb'[^,:}\] \t\n\r]+')
+# everything up to the next bracket outside of strings
+_SKIP = re.compile(rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL)
+_OPENING = b'{['
+_CLOSING = b'}]'
+_SCALAR_BYTES = b'0123456789+-.eEtruefalsn'
+
+
+class JsonBackend(abc.ABC):
+    """
+    Decodes JSON documents given as UTF-8 encoded bytes. Errors are raised as ValueError.
+    """
+    name = None  # type: str
+
+    @abc.abstractmethod
+    def loads(self, content):
+        # type: (bytes) -> Any
+        pass
+
+    def __repr__(self):
+        return 'JsonBackend: {{ name: {} }}'.format(self.name)
+
+
+class StdlibJsonBackend(JsonBackend):
+    name = 'json'
+
+    def loads(self, content):
+        # type: (bytes) -> Any
+        return json.loads(content)
+
+
+class OrjsonBackend(JsonBackend):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._loads = orjson.loads
+
+    def loads(self, content):
+        # type: (bytes) -> Any
+        return self._loads(content)
+
+
+class UjsonBackend(JsonBackend):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._loads = ujson.loads
+
+    def loads(self, content):
+        # type: (bytes) -> Any
+        return self._loads(content)
+
+
+_BACKENDS = (OrjsonBackend, UjsonBackend, StdlibJsonBackend)
+_default_backend = None  # type: Optional[JsonBackend]
+
+
+def get_backend(name=None):
+    # type: (str) -> JsonBackend
+    """
+    :param name: 'orjson', 'ujson' or 'json'. Default: the first of them that is installed
+    :return: the backend
+    :raises: ValueError if the name is unknown, ImportError if the backend is not installed
+    """
+    if name is None:
+        return default_backend()
+    for backend in _BACKENDS:
+        if backend.name == name:
+            return backend()
+    raise ValueError('Unknown JSON backend {}, expected one of {}'.format(
+        name, ', '.join(backend.name for backend in _BACKENDS)))
+
+
+def default_backend():
+    # type: () -> JsonBackend
+    """
+    :return: the fastest installed backend, orjson before ujson before the json module of the standard library
+    """
+    global _default_backend
+    if _default_backend is None:
+        for backend in _BACKENDS:
+            try:
+                _default_backend = backend()
+                break
+            except ImportError:
+                continue
+    return _default_backend
+
+
+def resolve_backend(backend):
+    # type: (Union[str, JsonBackend, None]) -> JsonBackend
+    return backend if isinstance(backend, JsonBackend) else get_backend(backend)
+
+
+def split_envelope(content, backend=None, deferred='data', required=()):
+    # type: (bytes, JsonBackend, str, Tuple[str, ...]) -> Tuple[Dict[str, Any], Optional[bytes]]
+    """
+    Decodes the members of a JSON object except for one, whose value is kept encoded.
+
+    The members in front of the deferred one are decoded from the start of the document, the strings and scalars
+    behind it from its end, so the deferred value, e.g. a large histogram or gate list, is not even scanned. Members
+    between the deferred one and the trailing strings and scalars stay encoded along with it.
+
+    :param content: the JSON document, an object
+    :param backend: Default = default_backend(). Decodes the other members
+    :param deferred: name of the member that is not decoded
+    :param required: names of members that must be decoded, the whole document is decoded if one of them is left
+    :return: the decoded members and, if some are left, the encoded JSON object of the remaining members
+    :raises: ValueError if the document is not a JSON object. The remaining members are only validated when decoded
+    """
+    backend = backend if backend is not None else default_backend()
+    members = {}  # type: Dict[str, Any]
+    pos = _WHITESPACE.match(content).end()
+    if content[pos:pos + 1] != b'{':
+        raise ValueError('Expecting a JSON object at char {}'.format(pos))
+    pos = _WHITESPACE.match(content, pos + 1).end()
+    if content[pos:pos + 1] == b'}':
+        _expect_end(content, pos + 1)
+        return members, None
+    while True:
+        match = _STRING.match(content, pos)
+        if match is None:
+            raise ValueError('Expecting a member name at char {}'.format(pos))
+        name = json.loads(match.group())
+        if name == deferred:
+            break
+        pos = _WHITESPACE.match(content, match.end()).end()
+        if content[pos:pos + 1] != b':':
+            raise ValueError('Expecting \':\' delimiter at char {}'.format(pos))
+        start = _WHITESPACE.match(content, pos + 1).end()
+        end = _value_end(content, start)
+        members[name] = backend.loads(content[start:end])
+        pos = _WHITESPACE.match(content, end).end()
+        delimiter = content[pos:pos + 1]
+        if delimiter == b'}':
+            _expect_end(content, pos + 1)
+            return members, None
+        if delimiter != b',':
+            raise ValueError('Expecting \',\' delimiter at char {}'.format(pos))
+        pos = _WHITESPACE.match(content, pos + 1).end()
+
+    end = len(content.rstrip(b' \t\n\r')) - 1
+    if end <= pos or content[end] != 0x7d:
+        raise ValueError('Expecting \'}\' at char {}'.format(end))
+    rest_end = end
+    for name, value, comma in _trailing_members(content, end, pos):
+        members[name] = backend.loads(value)
+        rest_end = comma
+    rest = b'{' + content[pos:rest_end] + b'}' if rest_end > pos else None
+    if rest is not None and any(name not in members for name in required):
+        members.update(backend.loads(rest))
+        rest = None
+    return members, rest
+
+
+def _trailing_members(content, end, start):
+    # type: (bytes, int, int) -> Iterator[Tuple[str, bytes, int]]
+    """
+    Reads the members with string or scalar values backwards from the end of an object.
+
+    :param end: index of the closing brace
+    :param start: index the members must not reach into
+    :return: name, encoded value and index of the preceding comma (of start for the first member) per member
+    """
+    pos = end
+    while True:
+        value_end = _last_token(content, pos)
+        value_start = _token_start(content, value_end)
+        if value_start is None:
+            return
+        colon = _last_token(content, value_start)
+        if content[colon] != 0x3a:
+            return
+        name_end = _last_token(content, colon)
+        name_start = _string_start(content, name_end) if content[name_end] == 0x22 else None
+        if name_start is None or name_start < start:
+            return
+        comma = _last_token(content, name_start)
+        if name_start == start:
+            comma = start
+        elif content[comma] != 0x2c:
+            return
+        yield json.loads(content[name_start:name_end + 1]), content[value_start:value_end + 1], comma
+        if comma == start:
+            return
+        pos = comma
+
+
+def _last_token(content, pos):
+    # type: (bytes, int) -> int
+    """
+    :return: index of the last non-whitespace byte before pos
+    """
+    pos -= 1
+    while pos > 0 and content[pos] in b' \t\n\r':
+        pos -= 1
+    return pos
+
+
+def _token_start(content, end):
+    # type: (bytes, int) -> Optional[int]
+    """
+    :return: start index of the string or scalar ending at end, None for any other token
+    """
+    if content[end] == 0x22:
+        return _string_start(content, end)
+    start = end
+    while start > 0 and content[start] in _SCALAR_BYTES:
+        start -= 1
+    return start + 1 if start < end else None
+
+
+def _string_start(content, end):
+    # type: (bytes, int) -> Optional[int]
+    """
+    Finds the opening quote of the string closed at end. Outside of strings quotes are never preceded by a backslash,
+    inside they are escaped by an odd number of them.
+    """
+    pos = end
+    while True:
+        pos = content.rfind(b'"', 0, pos)
+        if pos < 0:
+            return None
+        backslashes = 0
+        while content[pos - backslashes - 1] == 0x5c:
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return pos
+
+
+def _expect_end(content, pos):
+    # type: (bytes, int) -> None
+    if _WHITESPACE.match(content, pos).end() != len(content):
+        raise ValueError('Extra data at char {}'.format(pos))
+
+
+def _value_end(content, pos):
+    # type: (bytes, int) -> int
+    if pos >= len(content):
+        raise ValueError('Expecting value at char {}'.format(pos))
+    first = content[pos]
+    if first == 0x22:
+        match = _STRING.match(content, pos)
+        if match is None:
+            raise ValueError('Unterminated string at char {}'.format(pos))
+        return match.end()
+    if first not in _OPENING:
+        match = _SCALAR.match(content, pos)
+        if match is None:
+            raise ValueError('Expecting value at char {}'.format(pos))
+        return match.end()
+    start = pos
+    depth = 0
+    while True:
+        if pos >= len(content):
+            raise ValueError('Unterminated value at char {}'.format(start))
+        bracket = content[pos]
+        if bracket in _OPENING:
+            depth += 1
+        elif bracket in _CLOSING:
+            depth -= 1
+        else:
+            raise ValueError('Unterminated string at char {}'.format(pos))
+        pos += 1
+        if depth == 0:
+            return pos
+        pos = _SKIP.match(content, pos).end()
@@ -0,0 +1,180 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import itertools
+import json
+import random
+import threading
+import time
+from typing import Any, List, Union
+
+from acquantumconnector.compiler.optimization import optimize_circuit
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector, AcQuantumSession
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import Gate
+from acquantumconnector.model.response import AcQuantumExperimentDetail, AcQuantumExperiment, AcQuantumResult, \
+    AcQuantumResultResponse
+
+_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+class AcQuantumLocalConnector(AcQuantumConnector):
+    """
+    Connector that keeps the experiments in memory and runs them on the local statevector simulator, for development
+    and tests without access to the service. Requires NumPy.
+
+    Experiments of type LOCAL and SIMULATE are executed synchronously on submit, their results are returned as
+    simulated results. REAL experiments, result downloads and the backend configuration are not available.
+    """
+
+    def __init__(self, max_qubits=25):
+        # type: (int) -> None
+        """
+        :param max_qubits: largest bit width that is simulated, a state of 25 qubits takes 512 MiB
+        """
+        super(AcQuantumLocalConnector, self).__init__()
+        self.max_qubits = max_qubits
+        self._experiments = {}
+        self._results = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def create_session(self, credentials):
+        # type: (AcQuantumCredentials) -> None
+        self._credentials = credentials
+        self._session = AcQuantumSession('', None, credentials)
+
+    def create_experiment(self, bit_width, experiment_type, experiment_name):
+        # type: (int, AcQuantumBackendType, str) -> int
+        with self._lock:
+            experiment_id = next(self._ids)
+            self._experiments[experiment_id] = {
+                'experimentName': experiment_name,
+                'experimentType': experiment_type.name,
+                'bitWidth': bit_width,
+                'version': 0,
+                'execution': 0,
+                'code': '',
+                'data': []
+            }
+        return experiment_id
+
+    def update_experiment(self, experiment_id, gates, code=None, override=True, optimize=False, **kwargs):
+        # type: (int, Union[List[Gate], Circuit], str, bool, bool, **Any) -> None
+        if optimize:
+            gates = optimize_circuit(gates)
+        data = json.loads(gates.encode()) if isinstance(gates, Circuit) else [dict(gate.__dict__) for gate in gates]
+        with self._lock:
+            experiment = self._experiment(experiment_id)
+            experiment['data'] = data if override else data + experiment['data']
+            experiment['code'] = code if code else ''
+            experiment['version'] += 1
+
+    def get_experiment(self, experiment_id):
+        # type: (int) -> AcQuantumExperiment
+        with self._lock:
+            body = self._experiment(experiment_id)
+            detail = AcQuantumExperimentDetail(body['experimentName'], body['version'], int(experiment_id),
+                                               body['experimentType'], body['execution'], bit_width=body['bitWidth'])
+            return AcQuantumExperiment(detail=detail, data=list(body['data']), code=body['code'])
+
+    def get_experiments(self):
+        # type: () -> [AcQuantumExperimentDetail]
+        with self._lock:
+            return [AcQuantumExperimentDetail(exp['experimentName'], exp['version'], experiment_id,
+                                              exp['experimentType'], exp['execution'])
+                    for experiment_id, exp in sorted(self._experiments.items(), reverse=True)]
+
+    def run_experiment(self, experiment_id, experiment_type, bit_width, shots, seed=None):
+        # type: (int, AcQuantumBackendType, int, int, str) -> None
+        from acquantumconnector.simulator.statevector import StatevectorSimulator
+
+        if experiment_type == AcQuantumBackendType.REAL:
+            raise AcQuantumRequestError('REAL experiments can not be run locally')
+        if bit_width > self.max_qubits:
+            raise AcQuantumRequestError('bit width {} exceeds the {} simulated qubits'.format(bit_width,
+                                                                                              self.max_qubits))
+        with self._lock:
+            experiment = self._experiment(experiment_id)
+            experiment['execution'] += 1
+            circuit = Circuit()
+            circuit.extend_dicts(experiment['data'])
+
+        seed = int(seed) if seed else random.randrange(1 << 31)
+        start_time = time.strftime(_TIME_FORMAT)
+        simulator = StatevectorSimulator(max(bit_width, circuit.bit_width, 1))
+        measure_qubits = simulator.run(circuit)
+        data = simulator.sample(measure_qubits, shots, seed)
+        with self._lock:
+            result = AcQuantumResult(next(self._ids), seed, shots, start_time, measure_qubits,
+                                     time.strftime(_TIME_FORMAT), data=data)
+            self._results.setdefault(int(experiment_id), []).append(result)
+
+    def get_result(self, experiment_id):
+        # type: (int) -> AcQuantumResultResponse
+        with self._lock:
+            self._experiment(experiment_id)
+            return AcQuantumResultResponse(list(self._results.get(int(experiment_id), [])), [])
+
+    def delete_experiment(self, experiment_id):
+        # type: (int) -> None
+        with self._lock:
+            self._experiment(experiment_id)
+            del self._experiments[int(experiment_id)]
+            self._results.pop(int(experiment_id), None)
+
+    def delete_result(self, result_id):
+        # type: (int) -> None
+        with self._lock:
+            for results in self._results.values():
+                for result in results:
+                    if result.result_id == result_id:
+                        results.remove(result)
+                        return
+        raise AcQuantumRequestError('result not found')
+
+    def get_backend_config(self, computer_id=None):
+        # type: (str) -> None
+        raise AcQuantumRequestError('The backend configuration is not available locally')
+
+    def available_backends(self):
+        return [
+            {
+                'backend_name': 'LOCAL',
+                'backend_version': '0.0.1',
+                'n_qubits': self.max_qubits,
+                'basis_gates': ['x,y,z,h,s,sdg,t,tdg,rx,ry,rz,cz,ccz'],
+                'gates': [],
+                'local': True,
+                'simulator': True,
+                'conditional': False,
+                'open_pulse': False,
+                'memory': False,
+                'max_shots': 8192,
+                'url': None
+            }
+        ]
+
+    def _download(self, experiment_id, file_name, chunk_size, resume):
+        raise AcQuantumRequestError('Result downloads are not available locally')
+
+    def _experiment(self, experiment_id):
+        # type: (int) -> dict
+        experiment = self._experiments.get(int(experiment_id))
+        if experiment is None:
+            raise AcQuantumRequestError('experiment not found')
+        return experiment
@@ -0,0 +1,207 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import bisect
+import threading
+from collections import Counter
+from typing import Dict, List, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class RequestEvent(object):
+    """
+    Describes one request of a connector, including its retries, after it finished.
+    """
+
+    def __init__(self, method, endpoint):
+        # type: (str, str) -> None
+        """
+        :param method: 'GET' or 'POST'
+        :param endpoint: path of the URI, e.g. /experiment/detail
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.status_code = None  # type: int
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.network_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.retries = 0
+        self.throttled = 0
+        self.relogin = False
+        self.error = None  # type: Exception
+
+    @property
+    def total_seconds(self):
+        # type: () -> float
+        return self.network_seconds + self.wait_seconds + self.parse_seconds
+
+    def __repr__(self):
+        return 'RequestEvent: {{ {} {}, status: {}, network: {:.6f}s, wait: {:.6f}s, parse: {:.6f}s, ' \
+               'retries: {} }}'.format(self.method, self.endpoint, self.status_code, self.network_seconds,
+                                       self.wait_seconds, self.parse_seconds, self.retries)
+
+
+class _Histogram(object):
+
+    def __init__(self, buckets):
+        # type: (Tuple[float, ...]) -> None
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        # type: (float) -> None
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsCollector(object):
+    """
+    Request hook aggregating the events of one or more connectors::
+
+        metrics = MetricsCollector()
+        connector = AcQuantumConnector(request_hooks=[metrics])
+        ...
+        print(metrics.to_openmetrics())
+
+    Network and parse times are kept as histograms per endpoint, the other values as counters.
+    """
+
+    def __init__(self, prefix='acquantum', buckets=DEFAULT_BUCKETS):
+        # type: (str, Tuple[float, ...]) -> None
+        """
+        :param prefix: prefix of the exported metric names
+        :param buckets: upper bounds in seconds of the histogram buckets
+        """
+        self.prefix = prefix
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        # type: () -> None
+        self._requests = Counter()  # type: Dict[Tuple[str, str, str], int]
+        self._errors = Counter()  # type: Dict[Tuple[str, str], int]
+        self._bytes_sent = Counter()  # type: Dict[str, int]
+        self._bytes_received = Counter()  # type: Dict[str, int]
+        self._network = {}  # type: Dict[str, _Histogram]
+        self._parse = {}  # type: Dict[str, _Histogram]
+        self._retries = 0
+        self._throttled = 0
+        self._relogins = 0
+
+    def __call__(self, event):
+        # type: (RequestEvent) -> None
+        status = str(event.status_code) if event.status_code is not None else 'none'
+        with self._lock:
+            self._requests[(event.endpoint, event.method, status)] += 1
+            if event.error is not None:
+                self._errors[(event.endpoint, type(event.error).__name__)] += 1
+            self._bytes_sent[event.endpoint] += event.bytes_sent
+            self._bytes_received[event.endpoint] += event.bytes_received
+            self._histogram(self._network, event.endpoint).observe(event.network_seconds)
+            self._histogram(self._parse, event.endpoint).observe(event.parse_seconds)
+            self._retries += event.retries
+            self._throttled += event.throttled
+            self._relogins += int(event.relogin)
+
+    def snapshot(self):
+        # type: () -> dict
+        """
+        :return: the collected values as plain dictionary
+        """
+        with self._lock:
+            return {
+                'requests': sum(self._requests.values()),
+                'errors': sum(self._errors.values()),
+                'retries': self._retries,
+                'throttled': self._throttled,
+                'relogins': self._relogins,
+                'bytes_sent': sum(self._bytes_sent.values()),
+                'bytes_received': sum(self._bytes_received.values()),
+                'network_seconds': sum(histogram.sum for histogram in self._network.values()),
+                'parse_seconds': sum(histogram.sum for histogram in self._parse.values()),
+                'endpoints': {endpoint: self._network[endpoint].count for endpoint in sorted(self._network)}
+            }
+
+    def reset(self):
+        # type: () -> None
+        with self._lock:
+            self._clear()
+
+    def to_openmetrics(self):
+        # type: () -> str
+        """
+        :return: the metrics in the OpenMetrics text format, which Prometheus scrapes as well
+        """
+        lines = []  # type: List[str]
+        with self._lock:
+            self._counter(lines, 'requests', 'Requests by endpoint, method and final status code',
+                          {self._labels(endpoint=e, method=m, status=s): v for (e, m, s), v in self._requests.items()})
+            self._counter(lines, 'request_errors', 'Requests that raised an exception',
+                          {self._labels(endpoint=e, error=t): v for (e, t), v in self._errors.items()})
+            self._counter(lines, 'request_bytes_sent', 'Bytes of the request bodies',
+                          {self._labels(endpoint=e): v for e, v in self._bytes_sent.items()})
+            self._counter(lines, 'request_bytes_received', 'Bytes of the response bodies',
+                          {self._labels(endpoint=e): v for e, v in self._bytes_received.items()})
+            self._counter(lines, 'retries', 'Requests sent again after a transient error', {'': self._retries})
+            self._counter(lines, 'throttled', 'Requests throttled by the server', {'': self._throttled})
+            self._counter(lines, 'relogins', 'Logins after the session expired', {'': self._relogins})
+            self._histograms(lines, 'request_network_seconds', 'Time on the network per request', self._network)
+            self._histograms(lines, 'request_parse_seconds', 'Time decoding the response body per request',
+                             self._parse)
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def _histogram(self, histograms, endpoint):
+        # type: (Dict[str, _Histogram], str) -> _Histogram
+        histogram = histograms.get(endpoint)
+        if histogram is None:
+            histogram = histograms[endpoint] = _Histogram(self.buckets)
+        return histogram
+
+    def _counter(self, lines, name, help_text, samples):
+        # type: (List[str], str, str, Dict[str, int]) -> None
+        name = '{}_{}'.format(self.prefix, name)
+        lines.append('# TYPE {} counter'.format(name))
+        lines.append('# HELP {} {}'.format(name, help_text))
+        for labels, value in sorted(samples.items()):
+            lines.append('{}_total{} {}'.format(name, labels, value))
+
+    def _histograms(self, lines, name, help_text, histograms):
+        # type: (List[str], str, str, Dict[str, _Histogram]) -> None
+        name = '{}_{}'.format(self.prefix, name)
+        lines.append('# TYPE {} histogram'.format(name))
+        lines.append('# HELP {} {}'.format(name, help_text))
+        for endpoint in sorted(histograms):
+            histogram = histograms[endpoint]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), histogram.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                lines.append('{}_bucket{} {}'.format(name, self._labels(endpoint=endpoint, le=le), cumulative))
+            lines.append('{}_count{} {}'.format(name, self._labels(endpoint=endpoint), histogram.count))
+            lines.append('{}_sum{} {}'.format(name, self._labels(endpoint=endpoint), repr(histogram.sum)))
+
+    @staticmethod
+    def _labels(**labels):
+        # type: (**str) -> str
+        escaped = ('{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+                   for key, value in labels.items())
+        return '{' + ','.join(escaped) + '}'
@@ -0,0 +1,207 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Union
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import Gate
+from acquantumconnector.model.response import AcQuantumExperiment, AcQuantumExperimentDetail, \
+    AcQuantumResultResponse
+
+
+class _Account(object):
+
+    def __init__(self, credentials, connector):
+        # type: (AcQuantumCredentials, AcQuantumConnector) -> None
+        self.credentials = credentials
+        self.connector = connector
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.experiments = 0
+        self.pending = {}  # type: Dict[int, AcQuantumBackendType]
+
+    @property
+    def load(self):
+        # type: () -> int
+        return self.in_flight + len(self.pending)
+
+    def metrics(self):
+        # type: () -> dict
+        return {'in_flight': self.in_flight, 'pending': len(self.pending), 'requests': self.requests,
+                'errors': self.errors, 'experiments': self.experiments}
+
+
+class AcQuantumConnectorPool(object):
+    """
+    Spreads experiments over the connectors of several accounts.
+
+    A new experiment is created with the least loaded account, i.e. the one with the fewest requests in flight plus
+    experiments submitted but without result yet. All later calls for the experiment are sent with the account that
+    owns it.
+    """
+
+    def __init__(self, credentials, connector_factory=None):
+        # type: (List[AcQuantumCredentials], Callable[[], AcQuantumConnector]) -> None
+        """
+        :param credentials: one entry per account
+        :param connector_factory: creates the connector of an account, Default: thread safe AcQuantumConnector
+        """
+        if not credentials:
+            raise ValueError('At least one account is required')
+        factory = connector_factory if connector_factory else lambda: AcQuantumConnector(thread_safe=True)
+        self._accounts = [_Account(account, factory()) for account in credentials]
+        self._owners = {}  # type: Dict[int, _Account]
+        self._lock = threading.Lock()
+
+    def create_sessions(self):
+        # type: () -> None
+        for account in self._accounts:
+            with self._call(account):
+                account.connector.create_session(account.credentials)
+
+    def create_experiment(self, bit_width, experiment_type, experiment_name):
+        # type: (int, AcQuantumBackendType, str) -> int
+        with self._call() as account:
+            experiment_id = account.connector.create_experiment(bit_width, experiment_type, experiment_name)
+        with self._lock:
+            self._owners[experiment_id] = account
+            account.experiments += 1
+        return experiment_id
+
+    def update_experiment(self, experiment_id, gates, **kwargs):
+        # type: (int, Union[List[Gate], Circuit], **dict) -> None
+        """
+        :param kwargs: see :meth:`AcQuantumConnector.update_experiment`
+        """
+        with self._call(self._owner(experiment_id)) as account:
+            account.connector.update_experiment(experiment_id, gates, **kwargs)
+
+    def get_experiment(self, experiment_id):
+        # type: (int) -> AcQuantumExperiment
+        with self._call(self._owner(experiment_id)) as account:
+            return account.connector.get_experiment(experiment_id)
+
+    def get_experiments(self):
+        # type: () -> List[AcQuantumExperimentDetail]
+        """
+        :return: the experiments of all accounts, which are owned by their account from then on
+        """
+        experiments = []
+        for account in self._accounts:
+            with self._call(account):
+                listed = account.connector.get_experiments()
+            with self._lock:
+                for experiment in listed:
+                    self._owners.setdefault(experiment.experiment_id, account)
+            experiments.extend(listed)
+        return experiments
+
+    def run_experiment(self, experiment_id, experiment_type, bit_width, shots, seed=None):
+        # type: (int, AcQuantumBackendType, int, int, str) -> None
+        with self._call(self._owner(experiment_id)) as account:
+            account.connector.run_experiment(experiment_id, experiment_type, bit_width, shots, seed=seed)
+        with self._lock:
+            account.pending[experiment_id] = experiment_type
+
+    def submit(self, gates, experiment_type, shots, bit_width=None, experiment_name='Pooled', seed=None):
+        # type: (Union[List[Gate], Circuit], AcQuantumBackendType, int, int, str, str) -> int
+        """
+        Creates, saves and runs an experiment with the least loaded account.
+
+        :return: the experiment id
+        """
+        width = bit_width if bit_width else AcQuantumConnector._bit_width(gates)
+        experiment_id = self.create_experiment(width, experiment_type, experiment_name)
+        self.update_experiment(experiment_id, gates)
+        self.run_experiment(experiment_id, experiment_type, width, shots, seed=seed)
+        return experiment_id
+
+    def get_result(self, experiment_id):
+        # type: (int) -> AcQuantumResultResponse
+        with self._call(self._owner(experiment_id)) as account:
+            result = account.connector.get_result(experiment_id)
+        with self._lock:
+            backend_type = account.pending.get(experiment_id)
+            if backend_type is not None and result.is_finished(backend_type):
+                del account.pending[experiment_id]
+        return result
+
+    def download_result(self, experiment_id, file_name=None):
+        # type: (int, str) -> None
+        with self._call(self._owner(experiment_id)) as account:
+            account.connector.download_result(experiment_id, file_name)
+
+    def delete_experiment(self, experiment_id):
+        # type: (int) -> None
+        with self._call(self._owner(experiment_id)) as account:
+            account.connector.delete_experiment(experiment_id)
+        with self._lock:
+            self._owners.pop(experiment_id, None)
+            account.pending.pop(experiment_id, None)
+
+    def owner(self, experiment_id):
+        # type: (int) -> str
+        """
+        :return: the user name of the account owning the experiment
+        """
+        return self._owner(experiment_id).credentials.user_name
+
+    def metrics(self):
+        # type: () -> Dict[str, dict]
+        """
+        :return: per user name the requests in flight, the experiments without result, the number of requests and
+                failed requests and the number of experiments created
+        """
+        with self._lock:
+            return {account.credentials.user_name: account.metrics() for account in self._accounts}
+
+    def close(self):
+        # type: () -> None
+        for account in self._accounts:
+            account.connector.close()
+
+    def _owner(self, experiment_id):
+        # type: (int) -> _Account
+        with self._lock:
+            account = self._owners.get(experiment_id)
+        if account is None:
+            raise AcQuantumRequestError('Experiment {} is not owned by any account of the pool'.format(experiment_id))
+        return account
+
+    @contextmanager
+    def _call(self, account=None):
+        """
+        Counts a call of the given account, or of the least loaded one if None, while it is in flight.
+        """
+        with self._lock:
+            if account is None:
+                account = min(self._accounts, key=lambda a: (a.load, a.experiments))
+            account.in_flight += 1
+            account.requests += 1
+        try:
+            yield account
+        except Exception:
+            with self._lock:
+                account.errors += 1
+            raise
+        finally:
+            with self._lock:
+                account.in_flight -= 1
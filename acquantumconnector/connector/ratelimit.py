@@ -0,0 +1,151 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+
+class TokenBucket(object):
+    """
+    Allows ``rate`` requests per second on average and bursts of up to ``capacity`` requests.
+    """
+
+    def __init__(self, rate, capacity=None):
+        # type: (float, float) -> None
+        """
+        :param rate: tokens added per second
+        :param capacity: maximum number of tokens, Default: rate, but at least 1
+        """
+        if rate <= 0:
+            raise ValueError('rate must be greater 0')
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens=1.0):
+        # type: (float) -> float
+        """
+        :return: 0 if the tokens were taken, otherwise the seconds until they are available
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def pause(self, seconds):
+        # type: (float) -> None
+        """
+        Hands out no tokens for ``seconds`` and empties the bucket, e.g. after the server throttled a request.
+        """
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+            self._updated = self._blocked_until
+
+
+class RequestScheduler(object):
+    """
+    Orders the requests of all threads sharing a connector before they take a token of the bucket.
+
+    A request is only sent when all requests of a higher priority lane were sent. Within a lane requests are sent in
+    arrival order, so no thread can starve the others.
+    """
+
+    def __init__(self, rate=5.0, burst=None, bucket=None):
+        # type: (float, float, TokenBucket) -> None
+        """
+        :param rate: requests per second
+        :param burst: number of requests that may be sent at once, Default: rate
+        :param bucket: TokenBucket to use instead of one created from rate and burst
+        """
+        self.bucket = bucket if bucket is not None else TokenBucket(rate, burst)
+        self._lanes = {}  # type: Dict[int, deque]
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, priority=PRIORITY_NORMAL, timeout=None):
+        # type: (int, float) -> bool
+        """
+        Blocks until the caller may send its request.
+
+        :param priority: lane of the request, lower values are sent first
+        :param timeout: maximum seconds to wait, Default: no limit
+        :return: False if the timeout expired
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            ticket = next(self._tickets)
+            lane = self._lanes.setdefault(priority, deque())
+            lane.append(ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._head() == ticket:
+                        wait = self.bucket.try_acquire()
+                        if not wait:
+                            lane.popleft()
+                            self._condition.notify_all()
+                            return True
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            lane.remove(ticket)
+                            self._condition.notify_all()
+                            return False
+                        wait = min(wait, remaining) if wait else remaining
+                    self._condition.wait(wait)
+            except BaseException:
+                if ticket in lane:
+                    lane.remove(ticket)
+                    self._condition.notify_all()
+                raise
+
+    def pause(self, seconds):
+        # type: (float) -> None
+        """
+        Holds back all requests for ``seconds``.
+        """
+        self.bucket.pause(seconds)
+        with self._condition:
+            self._condition.notify_all()
+
+    def waiting(self):
+        # type: () -> Dict[int, int]
+        """
+        :return: number of waiting requests per priority
+        """
+        with self._condition:
+            return {priority: len(lane) for priority, lane in self._lanes.items() if lane}
+
+    def _head(self):
+        for priority in sorted(self._lanes):
+            if self._lanes[priority]:
+                return self._lanes[priority][0]
+        return None
@@ -0,0 +1,128 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import sqlite3
+import threading
+
+from acquantumconnector.model.response import AcQuantumResult, AcQuantumResultResponse
+
+_SIMULATE = 'simulateResult'
+_REAL = 'realResult'
+
+
+class AcQuantumResultStore(object):
+    """
+    Persistent store of finished results in a SQLite database.
+
+    Finished results never change, so they are kept keyed by their result id. An experiment is served from the store
+    once all of its results were finished at the last fetch. Submitting the experiment again marks it incomplete, so
+    the next :meth:`AcQuantumConnector.get_result` fetches the new results.
+
+    The store is not checked against the backend. Runs submitted by another client, another process or the web
+    interface are not seen until the experiment is marked incomplete with :meth:`mark_incomplete`.
+    """
+
+    def __init__(self, path=':memory:'):
+        # type: (str) -> None
+        """
+        :param path: file of the database, Default = ':memory:'
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute('CREATE TABLE IF NOT EXISTS results ('
+                             'result_id INTEGER PRIMARY KEY, experiment_id INTEGER NOT NULL, '
+                             'kind TEXT NOT NULL, body TEXT NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_experiment ON results (experiment_id)')
+            self._db.execute('CREATE TABLE IF NOT EXISTS experiments ('
+                             'experiment_id INTEGER PRIMARY KEY, complete INTEGER NOT NULL)')
+
+    def get(self, result_id):
+        # type: (int) -> AcQuantumResult
+        """
+        :return: the stored result or None
+        """
+        with self._lock:
+            row = self._db.execute('SELECT body FROM results WHERE result_id = ?', (int(result_id),)).fetchone()
+        return AcQuantumResult.from_dict(json.loads(row[0])) if row else None
+
+    def get_response(self, experiment_id):
+        # type: (int) -> AcQuantumResultResponse
+        """
+        :return: all results of the experiment, or None if the experiment is not complete in the store
+        """
+        with self._lock:
+            row = self._db.execute('SELECT complete FROM experiments WHERE experiment_id = ?',
+                                   (int(experiment_id),)).fetchone()
+            if not row or not row[0]:
+                return None
+            rows = self._db.execute('SELECT kind, body FROM results WHERE experiment_id = ? ORDER BY result_id',
+                                    (int(experiment_id),)).fetchall()
+        response = {_SIMULATE: [], _REAL: []}
+        for kind, body in rows:
+            response[kind].append(AcQuantumResult.from_dict(json.loads(body)))
+        return AcQuantumResultResponse(response[_SIMULATE], response[_REAL])
+
+    def put_response(self, experiment_id, body):
+        # type: (int, dict) -> None
+        """
+        Stores the finished results of a ``/experiment/resultlist`` response.
+
+        :param experiment_id: ID of the experiment
+        :param body: the data of the response with the ``simulateResult`` and ``realResult`` lists
+        """
+        results = [(kind, res) for kind in (_SIMULATE, _REAL) for res in body[kind]]
+        finished = [(kind, res) for kind, res in results if res['finishTime']]
+        complete = bool(results) and len(finished) == len(results)
+        with self._lock, self._db:
+            self._db.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                                 [(int(res['id']), int(experiment_id), kind, json.dumps(res))
+                                  for kind, res in finished])
+            self._db.execute('INSERT OR REPLACE INTO experiments VALUES (?, ?)', (int(experiment_id), int(complete)))
+
+    def mark_incomplete(self, experiment_id):
+        # type: (int) -> None
+        """
+        Makes the next get_result of the experiment fetch its results again, e.g. after it was run elsewhere.
+        """
+        with self._lock, self._db:
+            self._db.execute('UPDATE experiments SET complete = 0 WHERE experiment_id = ?', (int(experiment_id),))
+
+    def delete_result(self, result_id):
+        # type: (int) -> None
+        with self._lock, self._db:
+            row = self._db.execute('SELECT experiment_id FROM results WHERE result_id = ?',
+                                   (int(result_id),)).fetchone()
+            self._db.execute('DELETE FROM results WHERE result_id = ?', (int(result_id),))
+            if row:
+                self._db.execute('UPDATE experiments SET complete = 0 WHERE experiment_id = ?', row)
+
+    def delete_experiment(self, experiment_id):
+        # type: (int) -> None
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM results WHERE experiment_id = ?', (int(experiment_id),))
+            self._db.execute('DELETE FROM experiments WHERE experiment_id = ?', (int(experiment_id),))
+
+    def close(self):
+        # type: () -> None
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,200 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.response import AcQuantumResultResponse
+
+
+class BackoffPolicy(object):
+
+    def __init__(self, initial, maximum, factor=2.0):
+        # type: (float, float, float) -> None
+        """
+        :param initial: seconds until the first poll of a newly watched experiment
+        :param maximum: upper limit of the poll interval in seconds
+        :param factor: the interval is multiplied by this factor after every unfinished poll
+        """
+        if initial <= 0 or maximum < initial:
+            raise ValueError('0 < initial <= maximum required')
+        if factor < 1:
+            raise ValueError('factor must be at least 1')
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+
+    def next_interval(self, interval):
+        # type: (float) -> float
+        return min(interval * self.factor, self.maximum)
+
+
+class _Watch(object):
+
+    def __init__(self, experiment_id, backend_type, interval):
+        # type: (int, AcQuantumBackendType, float) -> None
+        self.experiment_id = experiment_id
+        self.backend_type = backend_type
+        self.interval = interval
+        self.next_poll = time.monotonic() + interval
+        self.future = Future()
+
+
+class ResultWatcher(object):
+    """
+    Waits for many experiments at once with a single polling thread.
+
+    Every watched experiment is polled through :meth:`AcQuantumConnector.get_result` with its own exponentially
+    growing interval, the :class:`BackoffPolicy` is chosen by the backend type. Watching an experiment that is
+    already watched returns the existing future, so concurrent waiters share the same polls. The future resolves
+    with the :class:`AcQuantumResultResponse` as soon as all results of the backend type carry a ``finish_time``.
+    Use ``asyncio.wrap_future`` to await it from a coroutine.
+    """
+
+    DEFAULT_POLICIES = {
+        AcQuantumBackendType.SIMULATE: BackoffPolicy(0.5, 10.0),
+        AcQuantumBackendType.REAL: BackoffPolicy(5.0, 120.0),
+        AcQuantumBackendType.LOCAL: BackoffPolicy(0.01, 1.0)
+    }
+
+    def __init__(self, connector, policies=None):
+        # type: ('AcQuantumConnector', Dict[AcQuantumBackendType, BackoffPolicy]) -> None
+        self._connector = connector
+        self._policies = dict(self.DEFAULT_POLICIES)
+        if policies:
+            self._policies.update(policies)
+        self._watches = {}  # type: Dict[int, _Watch]
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def watch(self, experiment_id, backend_type, callback=None):
+        # type: (int, AcQuantumBackendType, Callable[[Future], None]) -> Future
+        """
+        :param experiment_id: ID of the submitted experiment
+        :param backend_type: Type of the backend the experiment runs on
+        :param callback: called with the resolved future
+        :return: Future of the AcQuantumResultResponse
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('ResultWatcher is closed')
+            watch = self._watches.get(experiment_id)
+            if watch is None:
+                watch = _Watch(experiment_id, backend_type, self._policy(backend_type).initial)
+                self._watches[experiment_id] = watch
+                self._ensure_thread()
+                self._condition.notify()
+        if callback:
+            watch.future.add_done_callback(callback)
+        return watch.future
+
+    def wait(self, experiment_id, backend_type, timeout=None):
+        # type: (int, AcQuantumBackendType, float) -> AcQuantumResultResponse
+        return self.watch(experiment_id, backend_type).result(timeout)
+
+    def pending(self):
+        # type: () -> List[int]
+        with self._condition:
+            return list(self._watches.keys())
+
+    def close(self):
+        # type: () -> None
+        with self._condition:
+            self._closed = True
+            watches = list(self._watches.values())
+            self._watches.clear()
+            self._condition.notify()
+        for watch in watches:
+            watch.future.cancel()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _policy(self, backend_type):
+        # type: (AcQuantumBackendType) -> BackoffPolicy
+        """
+        :return: the policy of the backend type, the one of SIMULATE if there is none
+        """
+        policy = self._policies.get(backend_type)
+        return policy if policy is not None else self._policies[AcQuantumBackendType.SIMULATE]
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='ResultWatcher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                due = self._wait_for_due()
+                if due is None:
+                    return
+            for watch in due:
+                self._poll(watch)
+
+    def _wait_for_due(self):
+        # type: () -> List[_Watch]
+        while not self._closed:
+            if not self._watches:
+                self._condition.wait()
+                continue
+            now = time.monotonic()
+            next_poll = min(watch.next_poll for watch in self._watches.values())
+            if next_poll > now:
+                self._condition.wait(next_poll - now)
+                continue
+            return [watch for watch in self._watches.values() if watch.next_poll <= now]
+        return None
+
+    def _poll(self, watch):
+        # type: (_Watch) -> None
+        if watch.future.cancelled():
+            self._resolve(watch)
+            return
+        try:
+            response = self._connector.get_result(watch.experiment_id)
+        except Exception as e:
+            # e.g. a ConnectionError after the retries of the connector, it must not stop the polling thread
+            self._resolve(watch, exception=e)
+            return
+        if self._is_finished(response, watch.backend_type):
+            self._resolve(watch, response=response)
+            return
+        with self._condition:
+            watch.interval = self._policy(watch.backend_type).next_interval(watch.interval)
+            watch.next_poll = time.monotonic() + watch.interval
+
+    def _resolve(self, watch, response=None, exception=None):
+        # type: (_Watch, AcQuantumResultResponse, Exception) -> None
+        with self._condition:
+            self._watches.pop(watch.experiment_id, None)
+        if watch.future.set_running_or_notify_cancel():
+            if exception:
+                watch.future.set_exception(exception)
+            else:
+                watch.future.set_result(response)
+
+    @staticmethod
+    def _is_finished(response, backend_type):
+        # type: (AcQuantumResultResponse, AcQuantumBackendType) -> bool
+        return response.is_finished(backend_type)
@@ -0,0 +1,50 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import random
+from typing import Iterable
+
+TRANSIENT_STATUS_CODES = (500, 502, 503, 504)
+
+
+class RetryPolicy(object):
+    """
+    Retries of idempotent requests after transient server errors and connection errors.
+
+    The n-th retry waits a random time between 0 and ``min(max_backoff, backoff * 2 ** n)`` seconds, so that clients
+    failing at the same time do not retry at the same time.
+    """
+
+    def __init__(self, max_retries=3, backoff=0.5, max_backoff=10.0, status_codes=TRANSIENT_STATUS_CODES):
+        # type: (int, float, float, Iterable[int]) -> None
+        """
+        :param max_retries: retries after the first attempt, 0 disables retrying
+        :param backoff: upper bound of the first wait in seconds
+        :param max_backoff: upper bound of all waits in seconds
+        :param status_codes: HTTP status codes that are retried
+        """
+        if max_retries < 0:
+            raise ValueError('max_retries must not be negative')
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.status_codes = frozenset(status_codes)
+
+    def delay(self, attempt):
+        # type: (int) -> float
+        """
+        :param attempt: number of the failed attempt, starting at 0
+        :return: the seconds to wait before the next attempt
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
@@ -0,0 +1,182 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import abc
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+from requests.cookies import RequestsCookieJar, create_cookie
+
+DEFAULT_SESSION_TTL = 1800.0
+
+
+def session_record(csrf, cookies, ttl=DEFAULT_SESSION_TTL):
+    # type: (str, RequestsCookieJar, float) -> dict
+    """
+    :param csrf: the CSRF token of the session
+    :param cookies: the cookies of the session
+    :param ttl: seconds the session is assumed to be valid, shortened to the earliest cookie expiry
+    :return: the JSON serialisable record of the session, without credentials
+    """
+    now = time.time()
+    expires = now + ttl
+    serialized = []
+    for cookie in cookies:
+        serialized.append({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path,
+                           'expires': cookie.expires, 'secure': cookie.secure})
+        if cookie.expires:
+            expires = min(expires, cookie.expires)
+    return {'csrf': csrf, 'cookies': serialized, 'created': now, 'expires': expires}
+
+
+def restore_cookies(record, cookies):
+    # type: (dict, RequestsCookieJar) -> None
+    """
+    Adds the cookies of a session record to a cookie jar.
+    """
+    for cookie in record['cookies']:
+        cookies.set_cookie(create_cookie(cookie['name'], cookie['value'], domain=cookie['domain'],
+                                         path=cookie['path'], expires=cookie['expires'], secure=cookie['secure']))
+
+
+class SessionStore(abc.ABC):
+    """
+    Keeps the CSRF token and cookies of authenticated sessions, so that a new process can skip the login.
+
+    Records are stored per key, e.g. base URI and user name, and are only returned before their expiry.
+    """
+
+    def __init__(self, ttl=DEFAULT_SESSION_TTL):
+        # type: (float) -> None
+        """
+        :param ttl: seconds a stored session is assumed to be valid
+        """
+        self.ttl = ttl
+
+    def get(self, key):
+        # type: (str) -> Optional[dict]
+        """
+        :return: the record stored for the key, None if there is none or it expired
+        """
+        record = self._records().get(key)
+        if record is None or record['expires'] <= time.time():
+            return None
+        return record
+
+    @abc.abstractmethod
+    def put(self, key, csrf, cookies):
+        # type: (str, str, RequestsCookieJar) -> None
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key):
+        # type: (str) -> None
+        pass
+
+    @abc.abstractmethod
+    def _records(self):
+        # type: () -> Dict[str, dict]
+        pass
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Session store of one process, e.g. shared by the connectors of a pool.
+    """
+
+    def __init__(self, ttl=DEFAULT_SESSION_TTL):
+        # type: (float) -> None
+        super().__init__(ttl)
+        self._data = {}  # type: Dict[str, dict]
+        self._lock = threading.Lock()
+
+    def put(self, key, csrf, cookies):
+        # type: (str, str, RequestsCookieJar) -> None
+        record = session_record(csrf, cookies, self.ttl)
+        with self._lock:
+            self._data[key] = record
+
+    def delete(self, key):
+        # type: (str) -> None
+        with self._lock:
+            self._data.pop(key, None)
+
+    def _records(self):
+        # type: () -> Dict[str, dict]
+        with self._lock:
+            return dict(self._data)
+
+
+class FileSessionStore(SessionStore):
+    """
+    Session store in a JSON file that can be shared by several processes.
+
+    The file is readable by its owner only and is replaced atomically on every change, so readers always see a
+    complete file. Concurrent writers of different keys may overwrite each other's change, which only costs a login.
+    """
+
+    def __init__(self, path='session.json', ttl=DEFAULT_SESSION_TTL):
+        # type: (str, float) -> None
+        """
+        :param path: the JSON file
+        :param ttl: seconds a stored session is assumed to be valid
+        """
+        super().__init__(ttl)
+        self.path = os.path.abspath(path)
+        self._lock = threading.Lock()
+
+    def put(self, key, csrf, cookies):
+        # type: (str, str, RequestsCookieJar) -> None
+        record = session_record(csrf, cookies, self.ttl)
+        with self._lock:
+            records = self._live_records()
+            records[key] = record
+            self._write(records)
+
+    def delete(self, key):
+        # type: (str) -> None
+        with self._lock:
+            records = self._live_records()
+            if records.pop(key, None) is not None:
+                self._write(records)
+
+    def _records(self):
+        # type: () -> Dict[str, dict]
+        try:
+            with open(self.path, 'r') as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return records if isinstance(records, dict) else {}
+
+    def _live_records(self):
+        # type: () -> Dict[str, dict]
+        now = time.time()
+        return {key: record for key, record in self._records().items() if record.get('expires', 0) > now}
+
+    def _write(self, records):
+        # type: (Dict[str, dict]) -> None
+        directory = os.path.dirname(self.path)
+        fd, tmp = tempfile.mkstemp(prefix='.session', dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(records, f)
+            os.replace(tmp, self.path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
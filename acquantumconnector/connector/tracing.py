@@ -0,0 +1,324 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import abc
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from acquantumconnector.connector.metrics import RequestEvent
+
+STATUS_UNSET = 'UNSET'
+STATUS_OK = 'OK'
+STATUS_ERROR = 'ERROR'
+
+
+def _now():
+    # type: () -> int
+    """
+    :return: nanoseconds since the epoch, time.time_ns needs Python 3.7
+    """
+    return int(time.time() * 1e9)
+
+
+class Span(object):
+    """
+    A timed operation of a trace, in the data model of OpenTelemetry: ids are hex strings, times nanoseconds since
+    the epoch.
+    """
+
+    def __init__(self, name, trace_id, span_id, parent_id=None, attributes=None, start_time=None):
+        # type: (str, str, str, str, Dict[str, Any], int) -> None
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = dict(attributes) if attributes else {}
+        self.start_time = start_time if start_time is not None else _now()
+        self.end_time = None  # type: Optional[int]
+        self.status = STATUS_UNSET
+        self.status_message = None  # type: Optional[str]
+
+    @property
+    def ended(self):
+        # type: () -> bool
+        return self.end_time is not None
+
+    @property
+    def duration(self):
+        # type: () -> Optional[float]
+        """
+        :return: seconds between start and end, None while the span is running
+        """
+        return (self.end_time - self.start_time) / 1e9 if self.ended else None
+
+    def set_attribute(self, key, value):
+        # type: (str, Any) -> None
+        self.attributes[key] = value
+
+    def set_error(self, error):
+        # type: (BaseException) -> None
+        self.status = STATUS_ERROR
+        self.status_message = '{}: {}'.format(type(error).__name__, error)
+
+    def to_dict(self):
+        # type: () -> dict
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'status': self.status,
+            'status_message': self.status_message,
+            'attributes': self.attributes
+        }
+
+    def __repr__(self):
+        return 'Span: {{ name: {}, trace_id: {}, span_id: {}, parent_id: {}, duration: {} }}'.format(
+            self.name, self.trace_id, self.span_id, self.parent_id, self.duration)
+
+
+class SpanExporter(abc.ABC):
+    """
+    Receives every span when it ends.
+    """
+
+    @abc.abstractmethod
+    def export(self, span):
+        # type: (Span) -> None
+        pass
+
+    def close(self):
+        # type: () -> None
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+
+    def __init__(self):
+        self._spans = []  # type: List[Span]
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        # type: (Span) -> None
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self):
+        # type: () -> List[Span]
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            self._spans = []
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Appends every span as one JSON line to a file.
+    """
+
+    def __init__(self, path):
+        # type: (str) -> None
+        self.path = os.path.abspath(path)
+        self._file = open(self.path, 'a')
+        self._lock = threading.Lock()
+
+    def export(self, span):
+        # type: (Span) -> None
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        # type: () -> None
+        with self._lock:
+            self._file.close()
+
+
+class Tracer(object):
+    """
+    Traces the lifecycle of experiments.
+
+    Every experiment gets a root span from its creation until its first result arrived. The operations of the
+    connector on the experiment are child spans of it, and the HTTP requests of an operation are child spans of the
+    operation. Between run_experiment and the first result an ``execution`` span covers queueing and execution on the
+    backend. The tracer is a request hook of the connector it is passed to.
+    """
+
+    def __init__(self, exporter=None, max_experiments=10000):
+        # type: (SpanExporter, int) -> None
+        """
+        :param exporter: Default = InMemorySpanExporter()
+        :param max_experiments: number of experiments whose root spans are kept, so that later operations on them
+                join their trace. Beyond it ended experiments are dropped first, then running ones are ended
+        """
+        self.exporter = exporter if exporter is not None else InMemorySpanExporter()
+        self.max_experiments = max_experiments
+        self._experiments = OrderedDict()  # type: OrderedDict[int, Span]
+        self._executions = {}  # type: Dict[int, Span]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def start_span(self, name, parent=None, **attributes):
+        # type: (str, Span, **Any) -> Span
+        """
+        :param parent: Default: the current span of the thread, a new trace is started if there is none
+        """
+        parent = parent if parent is not None else self.current_span()
+        trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        return Span(name, trace_id, os.urandom(8).hex(), parent.span_id if parent is not None else None, attributes)
+
+    def end_span(self, span, error=None):
+        # type: (Span, BaseException) -> None
+        if span.ended:
+            return
+        if error is not None:
+            span.set_error(error)
+        elif span.status == STATUS_UNSET:
+            span.status = STATUS_OK
+        span.end_time = _now()
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name, parent=None, **attributes):
+        # type: (str, Span, **Any) -> Iterator[Span]
+        """
+        Runs the block in a span, which is the current span of the thread meanwhile.
+        """
+        span = self.start_span(name, parent, **attributes)
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        finally:
+            stack.pop()
+            self.end_span(span)
+
+    def current_span(self):
+        # type: () -> Optional[Span]
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def start_experiment(self, experiment_id=None, **attributes):
+        # type: (int, **Any) -> Span
+        """
+        Starts the root span of an experiment, use bind if the id is not known yet.
+        """
+        span = Span('experiment', os.urandom(16).hex(), os.urandom(8).hex(), attributes=attributes)
+        if experiment_id is not None:
+            self.bind(experiment_id, span)
+        return span
+
+    def bind(self, experiment_id, span):
+        # type: (int, Span) -> None
+        span.set_attribute('experiment.id', experiment_id)
+        evicted = []  # type: List[Span]
+        with self._lock:
+            self._experiments[experiment_id] = span
+            excess = len(self._experiments) - self.max_experiments
+            if excess > 0:
+                ended = [key for key, root in self._experiments.items() if root.ended][:excess]
+                for key in ended:
+                    del self._experiments[key]
+                # experiments that never got a result are ended, oldest first
+                while len(self._experiments) > self.max_experiments:
+                    key = next(iter(self._experiments))
+                    execution = self._executions.pop(key, None)
+                    if execution is not None:
+                        evicted.append(execution)
+                    evicted.append(self._experiments.pop(key))
+        for unfinished in evicted:
+            unfinished.set_attribute('evicted', True)
+            self.end_span(unfinished)
+
+    def experiment(self, experiment_id):
+        # type: (int) -> Span
+        """
+        :return: the root span of the experiment, a new one if it was not seen before
+        """
+        with self._lock:
+            span = self._experiments.get(experiment_id)
+        return span if span is not None else self.start_experiment(experiment_id)
+
+    def start_execution(self, experiment_id, **attributes):
+        # type: (int, **Any) -> None
+        span = self.start_span('execution', self.experiment(experiment_id), **attributes)
+        with self._lock:
+            previous = self._executions.pop(experiment_id, None)
+            self._executions[experiment_id] = span
+        if previous is not None:
+            self.end_span(previous)
+
+    def end_experiment(self, experiment_id, error=None, forget=False):
+        # type: (int, BaseException, bool) -> None
+        """
+        Ends the execution and root span of the experiment.
+
+        :param forget: if True later operations on the experiment start a new trace
+        """
+        with self._lock:
+            execution = self._executions.pop(experiment_id, None)
+            span = self._experiments.pop(experiment_id, None) if forget else self._experiments.get(experiment_id)
+        if execution is not None:
+            self.end_span(execution, error)
+        if span is not None:
+            self.end_span(span, error)
+
+    def close(self):
+        # type: () -> None
+        """
+        Ends all running experiment spans and closes the exporter.
+        """
+        with self._lock:
+            experiment_ids = list(self._experiments)
+        for experiment_id in experiment_ids:
+            self.end_experiment(experiment_id)
+        self.exporter.close()
+
+    def __call__(self, event):
+        # type: (RequestEvent) -> None
+        span = self.start_span('HTTP {} {}'.format(event.method, event.endpoint), **{
+            'http.method': event.method,
+            'http.route': event.endpoint,
+            'http.status_code': event.status_code,
+            'http.request.bytes': event.bytes_sent,
+            'http.response.bytes': event.bytes_received,
+            'network.seconds': event.network_seconds,
+            'wait.seconds': event.wait_seconds,
+            'parse.seconds': event.parse_seconds,
+            'retries': event.retries,
+            'relogin': event.relogin
+        })
+        span.start_time -= int(event.total_seconds * 1e9)
+        self.end_span(span, event.error)
+
+    def _stack(self):
+        # type: () -> List[Span]
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
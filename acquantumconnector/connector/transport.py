@@ -0,0 +1,204 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import abc
+import json
+from contextlib import contextmanager
+import threading
+import weakref
+import zlib
+from http.cookies import SimpleCookie
+from typing import Any, Iterator, List, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.cookies import RequestsCookieJar
+from requests.structures import CaseInsensitiveDict
+
+
+class Transport(abc.ABC):
+    """
+    Sends the HTTP requests of a connector.
+
+    ``request`` takes the keyword arguments of :meth:`requests.Session.request` that the connector uses (params,
+    headers, data, json and stream) and returns a :class:`requests.Response`.
+    """
+
+    @property
+    @abc.abstractmethod
+    def cookies(self):
+        # type: () -> RequestsCookieJar
+        pass
+
+    @abc.abstractmethod
+    def request(self, method, uri, **kwargs):
+        # type: (str, str, **Any) -> requests.Response
+        pass
+
+    def mount(self, prefix, adapter):
+        # type: (str, BaseAdapter) -> None
+        """
+        Uses the adapter for all URIs starting with prefix, ignored by transports without connection pool.
+        """
+
+    @contextmanager
+    def thread_session(self):
+        # type: () -> Iterator[None]
+        """
+        Lets the calling thread send the requests of the block through an own HTTP session, e.g. a worker thread of
+        a connector that is not thread safe. Ignored by transports without HTTP sessions.
+        """
+        yield
+
+    def close(self):
+        # type: () -> None
+        pass
+
+
+class RequestsTransport(Transport):
+    """
+    Transport over HTTP with requests.
+
+    In thread safe mode, and otherwise within thread_session, every thread gets its own :class:`requests.Session`.
+    All of them share the cookie jar and the connection adapters, and with them the keep-alive connection pool. The
+    session of a thread is released when the thread ends.
+    """
+
+    def __init__(self, thread_safe=False):
+        # type: (bool) -> None
+        self._http = requests.session()
+        self._thread_safe = thread_safe
+        self._local = threading.local()
+        self._sessions = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        # type: () -> requests.Session
+        """
+        :return: the HTTP session of the calling thread
+        """
+        if not self._thread_safe and not getattr(self._local, 'isolated', 0):
+            return self._http
+        http = getattr(self._local, 'http', None)
+        if http is None:
+            http = requests.session()
+            http.cookies = self._http.cookies
+            http.adapters = self._http.adapters
+            with self._lock:
+                self._sessions[threading.current_thread()] = http
+            self._local.http = http
+        return http
+
+    @contextmanager
+    def thread_session(self):
+        # type: () -> Iterator[None]
+        local = self._local
+        local.isolated = getattr(local, 'isolated', 0) + 1
+        try:
+            yield
+        finally:
+            local.isolated -= 1
+
+    @property
+    def cookies(self):
+        # type: () -> RequestsCookieJar
+        return self._http.cookies
+
+    def request(self, method, uri, **kwargs):
+        # type: (str, str, **Any) -> requests.Response
+        return getattr(self.session, method.lower())(uri, **kwargs)
+
+    def mount(self, prefix, adapter):
+        # type: (str, BaseAdapter) -> None
+        self._http.mount(prefix, adapter)
+
+    def close(self):
+        # type: () -> None
+        """
+        Closes the HTTP sessions of all threads.
+        """
+        with self._lock:
+            sessions = [self._http] + list(self._sessions.values())
+            self._sessions = weakref.WeakKeyDictionary()
+            self._local = threading.local()
+        for http in sessions:
+            http.close()
+
+
+class InProcessTransport(Transport):
+    """
+    Hands the requests to an in-process handler instead of sending them over the network, e.g. to a fake of the
+    API in tests and benchmarks.
+
+    The handler is called as ``handler.handle(method, path, params, headers, body)`` with the query parameters as
+    dictionary of strings and the decoded request body, and returns status code, response headers and content.
+    """
+
+    def __init__(self, handler):
+        # type: (Any) -> None
+        self.handler = handler
+        self._cookies = RequestsCookieJar()
+
+    @property
+    def cookies(self):
+        # type: () -> RequestsCookieJar
+        return self._cookies
+
+    def request(self, method, uri, params=None, headers=None, data=None, json=None, stream=False):
+        # type: (str, str, dict, dict, Any, Any, bool) -> requests.Response
+        url = urlsplit(uri)
+        headers = CaseInsensitiveDict(headers or {})
+        body = self._body(data, json)
+        if headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        query = {key: '' if value is None else str(value) for key, value in (params or {}).items()}
+        status_code, response_headers, content = self.handler.handle(method.upper(), url.path, query, headers, body)
+
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers = CaseInsensitiveDict(response_headers)
+        response.url = '{}?{}'.format(uri, urlencode(query)) if query else uri
+        response.encoding = 'utf-8'
+        response._content = content
+        response._content_consumed = True
+        for name, value in self._set_cookies(response.headers.get('Set-Cookie')):
+            self._cookies.set(name, value, domain=url.hostname, path='/')
+        response.cookies.update(self._cookies)
+        return response
+
+    @staticmethod
+    def _body(data, payload):
+        # type: (Any, Any) -> bytes
+        if payload is not None:
+            return json.dumps(payload).encode('utf-8')
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            return urlencode(data).encode('utf-8')
+        if isinstance(data, str):
+            return data.encode('utf-8')
+        if isinstance(data, (bytes, bytearray)):
+            return bytes(data)
+        return b''.join(data)
+
+    @staticmethod
+    def _set_cookies(header):
+        # type: (str) -> List[Tuple[str, str]]
+        if not header:
+            return []
+        cookie = SimpleCookie()
+        cookie.load(header)
+        return [(name, morsel.value) for name, morsel in cookie.items()]
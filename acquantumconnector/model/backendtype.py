@@ -18,3 +18,4 @@ from enum import Enum
 class AcQuantumBackendType(Enum):
     REAL = 'REAL',
     SIMULATE = 'SIMULATE'
+    LOCAL = 'LOCAL'
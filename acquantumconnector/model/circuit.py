@@ -0,0 +1,261 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+from array import array
+from typing import Dict, Iterable, Iterator, List, Sequence, Union
+
+from acquantumconnector.model.gates import Gate, HGate, XGate, YGate, ZGate, SGate, SDag, TGate, TDag, Measure, \
+    RxGate, RyGate, RzGate, CPhase, CCPhase
+
+# gate type codes, the index into the tables below
+H, X, Y, Z, S, SDG, T, TDG, M, RX, RY, RZ, CP, CCP = range(14)
+
+TEXTS = ('H', 'X', 'Y', 'Z', 'S', 'S†', 'T', 'T†', 'M', 'RX', 'RY', 'RZ', 'CP', 'CCP')
+ROTATIONS = (RX, RY, RZ)
+CODES = {text: code for code, text in enumerate(TEXTS)}
+
+_GATE_CLASSES = (HGate, XGate, YGate, ZGate, SGate, SDag, TGate, TDag, Measure, RxGate, RyGate, RzGate, CPhase,
+                 CCPhase)
+
+
+def _template(code):
+    # type: (int) -> str
+    text = json.dumps(TEXTS[code])[1:-1]
+    if code in ROTATIONS:
+        return '{"x":%d,"y":%d,"gateDetail":{},"text":"' + text + '_%d"}'
+    if code == CP:
+        return '{"x1":%d,"y1":%d,"x":%d,"y":%d,"gateDetail":{},"text":"' + text + '"}'
+    if code == CCP:
+        return '{"x1":%d,"x2":%d,"y1":%d,"y2":%d,"x":%d,"y":%d,"gateDetail":{},"text":"' + text + '"}'
+    return '{"x":%d,"y":%d,"gateDetail":{},"text":"' + text + '"}'
+
+
+_TEMPLATES = tuple(_template(code) for code in range(len(TEXTS)))
+
+
+def parse_text(text):
+    # type: (str) -> (int, int)
+    """
+    :param text: the text of a gate, e.g. ``'H'`` or ``'RX_90'``
+    :return: gate type code and angle (0 for gates without angle)
+    """
+    code = CODES.get(text)
+    if code is not None:
+        return code, 0
+    name, _, angle = text.partition('_')
+    code = CODES.get(name)
+    if code not in ROTATIONS:
+        raise ValueError('Unknown gate \'{}\''.format(text))
+    return code, int(float(angle))
+
+
+class Circuit(object):
+    """
+    Compact container of gates.
+
+    The gates are stored column-wise in typed arrays (type code, coordinates and angle) instead of one
+    :class:`Gate` object per gate, and are encoded straight to the JSON of the ``/experiment/codesave`` payload.
+    Controlled gates occupy one column, so ``x1`` and ``x2`` are always equal to ``x``. Unused rows are stored as 0.
+    """
+
+    __slots__ = ('codes', 'xs', 'ys', 'y1s', 'y2s', 'angles', 'details')
+
+    def __init__(self, gates=None):
+        # type: (Iterable[Gate]) -> None
+        self.codes = array('B')
+        self.xs = array('I')
+        self.ys = array('I')
+        self.y1s = array('I')
+        self.y2s = array('I')
+        self.angles = array('H')
+        self.details = {}  # type: Dict[int, dict]
+        if gates is not None:
+            self.extend(gates)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        # type: () -> Iterator[Gate]
+        for index in range(len(self.codes)):
+            yield self.gate(index)
+
+    @property
+    def bit_width(self):
+        # type: () -> int
+        if not self.codes:
+            return 0
+        return max(max(self.ys), max(self.y1s), max(self.y2s))
+
+    def add(self, text, x, y, angle=0):
+        # type: (str, int, Union[int, Sequence[int]], int) -> None
+        """
+        Appends one gate.
+
+        :param text: text of the gate type, e.g. ``'H'``, ``'RX'`` or ``'CP'``
+        :param x: column
+        :param y: row, or the rows of controlled gates (2 for ``'CP'``, 3 for ``'CCP'``)
+        :param angle: angle in degrees of the rotation gates
+        """
+        code = CODES[text]
+        rows = (y,) if isinstance(y, int) else tuple(y)
+        if len(rows) != {CP: 2, CCP: 3}.get(code, 1):
+            raise ValueError('Wrong number of Y - coordinates for gate \'{}\''.format(text))
+        if len(set(rows)) != len(rows):
+            raise ValueError('Y - coordinates can not be equal')
+        if x <= 0:
+            raise ValueError('x - coordinate must be greater 0')
+        if min(rows) <= 0:
+            raise ValueError('y - coordinate must be greater 0')
+        if not 0 <= angle <= 360:
+            raise ValueError('Angle is not between 0 - 360')
+        rows = rows + (0,) * (3 - len(rows))
+        self.codes.append(code)
+        self.xs.append(x)
+        self.ys.append(rows[0])
+        self.y1s.append(rows[1])
+        self.y2s.append(rows[2])
+        self.angles.append(angle if code in ROTATIONS else 0)
+
+    def add_many(self, text, xs, ys, angles=None):
+        # type: (str, Sequence[int], Sequence[int], Sequence[int]) -> None
+        """
+        Appends many single row gates of the same type.
+
+        :param text: text of the gate type, e.g. ``'H'`` or ``'RZ'``
+        :param xs: columns
+        :param ys: rows
+        :param angles: angles in degrees, required for the rotation gates
+        """
+        code = CODES[text]
+        if code in (CP, CCP):
+            raise ValueError('add_many only supports single row gates')
+        if len(xs) != len(ys) or (angles is not None and len(angles) != len(xs)):
+            raise ValueError('Coordinates and angles must have the same length')
+        if code in ROTATIONS and angles is None:
+            raise ValueError('Angles are required for gate \'{}\''.format(text))
+        if not xs:
+            return
+        if min(xs) <= 0:
+            raise ValueError('x - coordinate must be greater 0')
+        if min(ys) <= 0:
+            raise ValueError('y - coordinate must be greater 0')
+        if code in ROTATIONS and not (0 <= min(angles) and max(angles) <= 360):
+            raise ValueError('Angle is not between 0 - 360')
+        count = len(xs)
+        self.codes.extend(array('B', [code]) * count)
+        self.xs.extend(array('I', xs))
+        self.ys.extend(array('I', ys))
+        zeros = array('I', [0]) * count
+        self.y1s.extend(zeros)
+        self.y2s.extend(zeros)
+        self.angles.extend(array('H', angles) if code in ROTATIONS else array('H', [0]) * count)
+
+    def append(self, gate):
+        # type: (Gate) -> None
+        code, angle = parse_text(gate.text)
+        if code == CP:
+            self.add(TEXTS[code], gate.x, (gate.y, gate.y1))
+        elif code == CCP:
+            self.add(TEXTS[code], gate.x, (gate.y, gate.y1, gate.y2))
+        else:
+            self.add(TEXTS[code], gate.x, gate.y, angle)
+        if gate.gateDetail:
+            self.details[len(self.codes) - 1] = gate.gateDetail
+
+    def extend(self, gates):
+        # type: (Iterable[Gate]) -> None
+        for gate in gates:
+            self.append(gate)
+
+    def extend_dicts(self, gates):
+        # type: (Iterable[dict]) -> None
+        """
+        Appends gates given as dictionaries, e.g. the data of an :class:`AcQuantumExperiment`.
+        """
+        for gate in gates:
+            code, angle = parse_text(gate['text'])
+            if code == CP:
+                self.add(TEXTS[code], gate['x'], (gate['y'], gate['y1']))
+            elif code == CCP:
+                self.add(TEXTS[code], gate['x'], (gate['y'], gate['y1'], gate['y2']))
+            else:
+                self.add(TEXTS[code], gate['x'], gate['y'], angle)
+            if gate.get('gateDetail'):
+                self.details[len(self.codes) - 1] = gate['gateDetail']
+
+    def gate(self, index):
+        # type: (int) -> Gate
+        code = self.codes[index]
+        x, y = self.xs[index], self.ys[index]
+        if code in ROTATIONS:
+            gate = _GATE_CLASSES[code](x, y, self.angles[index])
+        elif code == CP:
+            gate = CPhase(x, (y, self.y1s[index]))
+        elif code == CCP:
+            gate = CCPhase(x, (y, self.y1s[index], self.y2s[index]))
+        else:
+            gate = _GATE_CLASSES[code](x, y)
+        if index in self.details:
+            gate.set_gate_details(self.details[index])
+        return gate
+
+    def copy(self):
+        # type: () -> Circuit
+        circuit = Circuit()
+        for name in ('codes', 'xs', 'ys', 'y1s', 'y2s', 'angles'):
+            getattr(circuit, name).extend(getattr(self, name))
+        circuit.details.update(self.details)
+        return circuit
+
+    def to_gates(self):
+        # type: () -> List[Gate]
+        return list(self)
+
+    def encode(self):
+        # type: () -> str
+        """
+        :return: the JSON array of the gates as expected in the data of the ``/experiment/codesave`` payload
+        """
+        return '[' + ','.join(self.iter_encoded()) + ']'
+
+    def iter_encoded(self):
+        # type: () -> Iterator[str]
+        """
+        :return: iterator over the JSON objects of the single gates
+        """
+        templates = _TEMPLATES
+        details = self.details
+        columns = zip(self.codes, self.xs, self.ys, self.y1s, self.y2s, self.angles)
+        for index, (code, x, y, y1, y2, angle) in enumerate(columns):
+            if code in ROTATIONS:
+                encoded = templates[code] % (x, y, angle)
+            elif code == CP:
+                encoded = templates[code] % (x, y1, x, y)
+            elif code == CCP:
+                encoded = templates[code] % (x, x, y1, y2, x, y)
+            else:
+                encoded = templates[code] % (x, y)
+            if details and index in details:
+                encoded = encoded.replace('"gateDetail":{}', '"gateDetail":' + json.dumps(details[index]), 1)
+            yield encoded
+
+    def to_payload(self, experiment_id, code=None):
+        # type: (int, str) -> str
+        """
+        :return: the JSON body of the ``/experiment/codesave`` request
+        """
+        return '{"experimentId":' + json.dumps(str(experiment_id)) + ',"data":' + self.encode() + \
+               ',"code":' + json.dumps(code if code else '') + '}'
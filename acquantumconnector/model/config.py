@@ -13,6 +13,7 @@
 #   limitations under the License.
 
 import json
+from typing import Any
 
 
 class AcQuantumRawConfig:
@@ -30,20 +31,60 @@ class AcQuantumRawConfig:
         # type: ([dict]) -> AcQuantumRawConfig
         return AcQuantumRawConfig(*values)
 
+    @property
+    def computer_id(self):
+        # type: () -> str
+        return self.system_config.computer_id
+
+
+class _LazyConfigValue(object):
+    """
+    Keeps the ``configValue`` string of a configuration entry as received and decodes it on first access.
+    """
+
+    def __init__(self, computer_id, config_key, config_value=None, raw_value=None):
+        # type: (str, str, Any, str) -> None
+        """
+        :param computer_id: ID of the computer
+        :param config_key: key of the entry
+        :param config_value: the decoded value
+        :param raw_value: the value as JSON string, decoded on first access if config_value is None
+        """
+        self.computer_id = computer_id
+        self.config_key = config_key
+        self.raw_value = raw_value
+        self._config_value = config_value
 
-class BackendSystemConfig:
+    @property
+    def config_value(self):
+        if self._config_value is None and self.raw_value is not None:
+            self._config_value = self._decode(self.raw_value)
+        return self._config_value
 
-    def __init__(self, computer_id, config_key, config_value):
-        # type: (str, str, SystemConfigValue) -> None
-        self.config_value = config_value  # type: SystemConfigValue
-        self.config_key = config_key
-        self.computer_id = computer_id
+    @config_value.setter
+    def config_value(self, config_value):
+        self._config_value = config_value
+
+    @staticmethod
+    def _decode(raw_value):
+        # type: (str) -> Any
+        return json.loads(raw_value)
+
+
+class BackendSystemConfig(_LazyConfigValue):
+    """
+    The ``config_value`` is a :class:`SystemConfigValue`.
+    """
 
     @classmethod
     def from_dict(cls, values):
         # type: (dict) -> BackendSystemConfig
-        config_value = SystemConfigValue.from_dict(json.loads(values['configValue']))
-        return BackendSystemConfig(values['computerId'], values['configKey'], config_value)
+        return BackendSystemConfig(values['computerId'], values['configKey'], raw_value=values['configValue'])
+
+    @staticmethod
+    def _decode(raw_value):
+        # type: (str) -> SystemConfigValue
+        return SystemConfigValue.from_dict(json.loads(raw_value))
 
 
 class SystemConfigValue:
@@ -63,18 +104,15 @@ class SystemConfigValue:
                                  values['twoQGatesLabel'], values['measureSizeUpperLimit'])
 
 
-class OneQGateFidelities:
-
-    def __init__(self, computer_id, config_key, config_value):
-        self.config_value = config_value  # [dict]
-        self.config_key = config_key
-        self.computer_id = computer_id
+class OneQGateFidelities(_LazyConfigValue):
+    """
+    The ``config_value`` is a list of dictionaries with the fidelities per qubit.
+    """
 
     @classmethod
     def from_dict(cls, values):
         # type: (dict) -> OneQGateFidelities
-        config_value = json.loads(values['configValue'])
-        return OneQGateFidelities(values['computerId'], values['configKey'], config_value)
+        return OneQGateFidelities(values['computerId'], values['configKey'], raw_value=values['configValue'])
 
 
 class QubitParameter:
@@ -90,19 +128,20 @@ class QubitParameter:
         return QubitParameter(values['computerId'], values['configKey'], values['configValue'])
 
 
-class SystemStatus:
-
-    def __init__(self, computer_id, config_key, config_value):
-        # type: (str, str, SystemStatusConfigValue) -> None
-        self.config_value = config_value  # type: SystemStatusConfigValue
-        self.config_key = config_key
-        self.computer_id = computer_id
+class SystemStatus(_LazyConfigValue):
+    """
+    The ``config_value`` is a :class:`SystemStatusConfigValue`.
+    """
 
     @classmethod
     def from_dict(cls, values):
         # type: (dict) -> SystemStatus
-        config_value = SystemStatusConfigValue.from_dict(json.loads(values['configValue']))
-        return SystemStatus(values['computerId'], values['configKey'], config_value)
+        return SystemStatus(values['computerId'], values['configKey'], raw_value=values['configValue'])
+
+    @staticmethod
+    def _decode(raw_value):
+        # type: (str) -> SystemStatusConfigValue
+        return SystemStatusConfigValue.from_dict(json.loads(raw_value))
 
 
 class SystemStatusConfigValue:
@@ -119,15 +158,12 @@ class SystemStatusConfigValue:
         return SystemStatusConfigValue(values['status'], values['fridgeTemperature'], values['lastCalibrationTime'])
 
 
-class TwoQGateFidelity:
-
-    def __init__(self, computer_id, config_key, config_value):
-        self.config_value = config_value  # type: [dict]
-        self.config_key = config_key
-        self.computer_id = computer_id
+class TwoQGateFidelity(_LazyConfigValue):
+    """
+    The ``config_value`` is a list of dictionaries with the CZ fidelity per pair of qubits.
+    """
 
     @classmethod
     def from_dict(cls, values):
         # type: (dict) -> TwoQGateFidelity
-        config_value = json.loads(values['configValue'])
-        return TwoQGateFidelity(values['computerId'], values['configKey'], config_value)
+        return TwoQGateFidelity(values['computerId'], values['configKey'], raw_value=values['configValue'])
@@ -0,0 +1,176 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Vectorised view of measurement results, requires NumPy (``pip install acquantum-connector[numpy]``).
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+MAX_QUBITS = 63
+MAX_DENSE_QUBITS = 24
+
+
+class AcQuantumHistogram(object):
+    """
+    Measurement outcomes as integer indices with their probabilities.
+
+    Bit ``k`` of an outcome index is the measured value of ``qubits[k]``, the qubits are sorted ascending. Results
+    are stored sparse, :meth:`dense` expands them to an array of length ``2 ** len(qubits)``.
+    """
+
+    def __init__(self, qubits, indices, values, shots=None):
+        # type: (Sequence[int], np.ndarray, np.ndarray, int) -> None
+        """
+        :param qubits: the measured qubits in ascending order
+        :param indices: outcome indices
+        :param values: probability of each outcome
+        :param shots: number of shots the probabilities were estimated from
+        """
+        if len(qubits) > MAX_QUBITS:
+            raise ValueError('At most {} measured qubits are supported'.format(MAX_QUBITS))
+        if list(qubits) != sorted(set(qubits)):
+            raise ValueError('Qubits must be unique and in ascending order')
+        self.qubits = list(qubits)
+        self.indices = np.asarray(indices, dtype=np.uint64)
+        self.values = np.asarray(values, dtype=np.float64)
+        self.shots = shots
+
+    @classmethod
+    def from_result(cls, result):
+        # type: ('AcQuantumResult') -> AcQuantumHistogram
+        """
+        The ``i``-th character of a bitstring of the result data is the value of ``result.measure_qubits[i]``.
+        """
+        data = getattr(result, 'data', None) or {}
+        return cls.from_dict(data, result.measure_qubits, result.shots)
+
+    @classmethod
+    def from_dict(cls, data, measure_qubits, shots=None):
+        # type: (dict, Sequence[int], int) -> AcQuantumHistogram
+        """
+        :param data: probability per bitstring
+        :param measure_qubits: qubit of each bitstring position
+        :param shots: number of shots
+        """
+        order = np.argsort(measure_qubits, kind='stable')
+        qubits = [measure_qubits[i] for i in order]
+        width = len(measure_qubits)
+        if not data:
+            return cls(qubits, np.zeros(0, dtype=np.uint64), np.zeros(0), shots)
+        keys = list(data.keys())
+        if any(len(key) != width for key in keys):
+            raise ValueError('Bitstrings must have one character per measured qubit')
+        bits = np.frombuffer(''.join(keys).encode('ascii'), dtype=np.uint8).reshape(len(keys), width) - ord('0')
+        if bits.max(initial=0) > 1:
+            raise ValueError('Bitstrings must consist of 0 and 1')
+        # bitstring position i holds qubit measure_qubits[i], which is bit rank[i] of the index
+        rank = np.empty(width, dtype=np.uint64)
+        rank[order] = np.arange(width, dtype=np.uint64)
+        weights = np.left_shift(np.uint64(1), rank)
+        indices = (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+        values = np.fromiter((float(v) for v in data.values()), dtype=np.float64, count=len(keys))
+        return cls(qubits, indices, values, shots)
+
+    @property
+    def num_qubits(self):
+        # type: () -> int
+        return len(self.qubits)
+
+    def dense(self):
+        # type: () -> np.ndarray
+        """
+        :return: probability per outcome index, of length ``2 ** num_qubits``
+        """
+        if self.num_qubits > MAX_DENSE_QUBITS:
+            raise ValueError('Dense histograms are limited to {} qubits, use sparse()'.format(MAX_DENSE_QUBITS))
+        dense = np.zeros(1 << self.num_qubits, dtype=np.float64)
+        np.add.at(dense, self.indices.astype(np.int64), self.values)
+        return dense
+
+    def sparse(self):
+        # type: () -> (np.ndarray, np.ndarray)
+        """
+        :return: sorted unique outcome indices and their probabilities
+        """
+        indices, inverse = np.unique(self.indices, return_inverse=True)
+        return indices, np.bincount(inverse.ravel(), weights=self.values, minlength=len(indices))
+
+    def counts(self):
+        # type: () -> (np.ndarray, np.ndarray)
+        """
+        :return: sorted unique outcome indices and their number of occurrences in ``shots``
+        """
+        if not self.shots:
+            raise ValueError('The number of shots is unknown')
+        indices, values = self.sparse()
+        return indices, np.rint(values * self.shots).astype(np.int64)
+
+    def marginal(self, qubits):
+        # type: (Sequence[int]) -> AcQuantumHistogram
+        """
+        :param qubits: the qubits to keep
+        :return: the histogram summed over all other qubits
+        """
+        qubits = sorted(set(qubits))
+        positions = self._positions(qubits)
+        indices = np.zeros(len(self.indices), dtype=np.uint64)
+        for bit, position in enumerate(positions):
+            indices |= ((self.indices >> np.uint64(position)) & np.uint64(1)) << np.uint64(bit)
+        marginal = AcQuantumHistogram(qubits, indices, self.values, self.shots)
+        return AcQuantumHistogram(qubits, *marginal.sparse(), shots=self.shots)
+
+    def expectation_z(self, qubits):
+        # type: (Sequence[int]) -> float
+        """
+        :param qubits: the qubits of the Z-string, e.g. ``[0, 2]`` for Z_0 Z_2
+        :return: the expectation value of the product of Pauli-Z on the qubits
+        """
+        parity = np.zeros(len(self.indices), dtype=np.uint64)
+        for position in self._positions(qubits):
+            parity ^= (self.indices >> np.uint64(position)) & np.uint64(1)
+        signs = 1.0 - 2.0 * parity.astype(np.float64)
+        total = self.values.sum()
+        return float(np.dot(signs, self.values) / total) if total else 0.0
+
+    @staticmethod
+    def stack(histograms):
+        # type: (List[AcQuantumHistogram]) -> np.ndarray
+        """
+        :return: the dense histograms as rows of one array, all histograms must measure the same qubits
+        """
+        if not histograms:
+            return np.zeros((0, 0))
+        qubits = histograms[0].qubits
+        if any(histogram.qubits != qubits for histogram in histograms):
+            raise ValueError('All histograms must measure the same qubits')
+        return np.vstack([histogram.dense() for histogram in histograms])
+
+    def _positions(self, qubits):
+        # type: (Sequence[int]) -> List[int]
+        positions = {qubit: position for position, qubit in enumerate(self.qubits)}
+        try:
+            return [positions[qubit] for qubit in qubits]
+        except KeyError as e:
+            raise ValueError('Qubit {} was not measured'.format(e.args[0]))
+
+    def __str__(self):
+        return 'AcHistogram: {{ qubits: {}, outcomes: {}, shots: {} }}'.format(self.qubits, len(self.indices),
+                                                                              self.shots)
+
+    def __repr__(self):
+        return 'AcHistogram: {{ qubits: {}, outcomes: {}, shots: {} }}'.format(self.qubits, len(self.indices),
+                                                                              self.shots)
@@ -12,16 +12,37 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from typing import Any, List
+from typing import Any, Callable, Dict, List
+
+from acquantumconnector.model.backendtype import AcQuantumBackendType
 
 
 class AcQuantumResponse(object):
-    def __init__(self, success=True, data=None, exception=None):
-        # type: (bool, Any, Any) -> None
+    def __init__(self, success=True, data=None, exception=None, decode_data=None):
+        # type: (bool, Any, Any, Callable[[], Any]) -> None
+        """
+        :param decode_data: Default = None. Decodes the data when it is accessed first, instead of passing it
+        """
         self.success = success
-        self.data = data
+        self._data = data
+        self._decode_data = decode_data
         self.exception = exception
 
+    @property
+    def data(self):
+        # type: () -> Any
+        decode = self._decode_data
+        if decode is not None:
+            self._data = decode()
+            self._decode_data = None
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        # type: (Any) -> None
+        self._data = data
+        self._decode_data = None
+
     def __str__(self):
         return 'AcResponse: {{ success: {}, exception: {} }}'.format(self.success, self.exception)
 
@@ -91,6 +112,23 @@ class AcQuantumResultResponse:
         self.simulated_result = simulated_result
         self.real_result = real_result
 
+    def is_finished(self, backend_type=None):
+        # type: (AcQuantumBackendType) -> bool
+        """
+        :param backend_type: Default = None. Type of the backend whose results are checked, all results if None.
+                LOCAL runs are reported as simulated results
+        :return: True if there are results and all of them carry a finish_time
+        """
+        if backend_type is None:
+            results = (self.simulated_result or []) + (self.real_result or [])
+        elif backend_type == AcQuantumBackendType.REAL:
+            results = self.real_result
+        elif backend_type in (AcQuantumBackendType.SIMULATE, AcQuantumBackendType.LOCAL):
+            results = self.simulated_result
+        else:
+            raise ValueError('Unknown backend type {}'.format(backend_type))
+        return bool(results) and all(result.finish_time for result in results)
+
     def get_results(self):
         # type: () -> List[AcQuantumResult]
         if self.simulated_result:
@@ -125,6 +163,35 @@ class AcQuantumResult:
         if data:
             self.data = {k: float(v) for k, v in data.items()}
 
+    @classmethod
+    def from_dict(cls, values):
+        # type: (dict) -> AcQuantumResult
+        return AcQuantumResult(values['id'], values['seed'], values['shots'], values['startTime'],
+                               values['measureQubits'], values['finishTime'], values['process'], values['data'])
+
+    def to_dict(self):
+        # type: () -> dict
+        return {
+            'id': self.result_id,
+            'seed': self.seed,
+            'shots': self.shots,
+            'startTime': self.start_time,
+            'measureQubits': self.measure_qubits,
+            'finishTime': self.finish_time,
+            'process': self.process,
+            'data': getattr(self, 'data', None)
+        }
+
+    def histogram(self):
+        # type: () -> 'AcQuantumHistogram'
+        """
+        Vectorised view of the data, requires NumPy.
+
+        :return: the histogram of the measured outcomes
+        """
+        from acquantumconnector.model.histogram import AcQuantumHistogram
+        return AcQuantumHistogram.from_result(self)
+
     def __str__(self):
         return 'AcResult: {{ result_id: {}, seed: {}, shots: {}, start_time: {}, measure_qubits: {},  ' \
                'finish_time: {}, process: {}, data: {} }} '.format(self.result_id, self.seed, self.shots,
@@ -136,3 +203,63 @@ class AcQuantumResult:
                'finish_time: {}, process: {}, data: {} }} '.format(self.result_id, self.seed, self.shots,
                                                                    self.start_time, self.measure_qubits,
                                                                    self.finish_time, self.process, self.data)
+
+
+class AcQuantumBatchResponse:
+
+    def __init__(self, experiment_ids, errors=None):
+        # type: (List[int], Dict[int, Exception]) -> None
+        """
+        :param experiment_ids: experiment id per submitted circuit in input order, None if it could not be created
+        :param errors: exception per index of the circuits that failed in any stage
+        """
+        self.experiment_ids = experiment_ids
+        self.errors = errors if errors else {}
+
+    def succeeded(self):
+        # type: () -> List[int]
+        return [experiment_id for index, experiment_id in enumerate(self.experiment_ids) if index not in self.errors]
+
+    def failed(self):
+        # type: () -> List[int]
+        return sorted(self.errors.keys())
+
+    def __str__(self):
+        return 'AcBatchResponse: {{ experiment_ids: {}, errors: {} }}'.format(self.experiment_ids, self.errors)
+
+    def __repr__(self):
+        return 'AcBatchResponse: {{ experiment_ids: {}, errors: {} }}'.format(self.experiment_ids, self.errors)
+
+
+class AcQuantumDownloadReport:
+
+    def __init__(self, files, skipped=None, errors=None, bytes_written=0, elapsed=0.0):
+        # type: (Dict[int, str], List[int], Dict[int, Exception], int, float) -> None
+        """
+        :param files: path per experiment id of the downloaded or already complete files
+        :param skipped: experiment ids whose files were already complete
+        :param errors: exception per experiment id that could not be downloaded
+        :param bytes_written: number of bytes written to disk
+        :param elapsed: wall time of all downloads in seconds
+        """
+        self.files = files
+        self.skipped = skipped if skipped else []
+        self.errors = errors if errors else {}
+        self.bytes_written = bytes_written
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self):
+        # type: () -> float
+        """
+        :return: bytes written per second
+        """
+        return self.bytes_written / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return 'AcDownloadReport: {{ files: {}, skipped: {}, errors: {}, bytes_written: {}, throughput: {:.0f} B/s ' \
+               '}}'.format(len(self.files), len(self.skipped), len(self.errors), self.bytes_written, self.throughput)
+
+    def __repr__(self):
+        return 'AcDownloadReport: {{ files: {}, skipped: {}, errors: {}, bytes_written: {}, throughput: {:.0f} B/s ' \
+               '}}'.format(len(self.files), len(self.skipped), len(self.errors), self.bytes_written, self.throughput)
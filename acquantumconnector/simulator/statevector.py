@@ -0,0 +1,196 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Statevector simulator of the gates of :mod:`acquantumconnector.model.gates`, requires NumPy
+(``pip install acquantum-connector[numpy]``).
+"""
+
+import cmath
+import math
+from typing import Dict, List, Sequence, Union
+
+import numpy as np
+
+from acquantumconnector.model.circuit import Circuit, H, X, Y, Z, S, SDG, T, TDG, M, RX, RY, RZ, CP, CCP
+from acquantumconnector.model.gates import Gate
+
+MAX_QUBITS = 25
+
+# number of amplitudes per half of a block updated by a non-diagonal gate, bounds the temporary memory
+_BLOCK = 1 << 16
+
+_PHASES = {Z: -1, S: 1j, SDG: -1j, T: cmath.exp(1j * math.pi / 4), TDG: cmath.exp(-1j * math.pi / 4)}
+
+
+class StatevectorSimulator(object):
+    """
+    Pure state of ``num_qubits`` qubits, updated in place gate by gate.
+
+    Qubit ``q`` is row ``y = q + 1`` of a circuit and bit ``q`` of an amplitude index. A single qubit gate works on
+    the view of the state reshaped to ``(-1, 2, 2 ** q)``, so no gate matrix of the full register is ever built.
+    ``CP`` is the controlled Z gate and ``CCP`` the doubly controlled Z gate, both only flip the sign of the
+    amplitudes whose qubits are all 1. Angles are in degrees, ``RZ`` is applied as ``diag(1, e^(i angle))`` which
+    equals the rotation up to a global phase.
+    """
+
+    def __init__(self, num_qubits, dtype=np.complex128):
+        # type: (int, np.dtype) -> None
+        """
+        :param num_qubits: number of qubits, a state of 25 qubits takes 512 MiB with complex128
+        :param dtype: complex128 or complex64
+        """
+        if not 0 < num_qubits <= MAX_QUBITS:
+            raise ValueError('Number of qubits must be between 1 and {}'.format(MAX_QUBITS))
+        self.num_qubits = num_qubits
+        self.state = np.zeros(1 << num_qubits, dtype=dtype)
+        self.state[0] = 1
+
+    def reset(self):
+        # type: () -> None
+        self.state[:] = 0
+        self.state[0] = 1
+
+    def run(self, circuit):
+        # type: (Union[Circuit, List[Gate]]) -> List[int]
+        """
+        Applies the gates of the circuit in column order. Measurements are deferred to the end.
+
+        :return: the measured qubits in ascending order, all qubits if the circuit has no measurement
+        """
+        if not isinstance(circuit, Circuit):
+            circuit = Circuit(circuit)
+        if circuit.bit_width > self.num_qubits:
+            raise ValueError('The circuit uses {} qubits, the simulator has {}'.format(circuit.bit_width,
+                                                                                      self.num_qubits))
+        measured = set()
+        for index in np.argsort(np.frombuffer(circuit.xs, dtype=np.uint32), kind='stable'):
+            code, qubit = circuit.codes[index], circuit.ys[index] - 1
+            if code == M:
+                measured.add(qubit)
+            elif code == CP:
+                self.apply(code, (qubit, circuit.y1s[index] - 1))
+            elif code == CCP:
+                self.apply(code, (qubit, circuit.y1s[index] - 1, circuit.y2s[index] - 1))
+            else:
+                self.apply(code, (qubit,), circuit.angles[index])
+        return sorted(measured) if measured else list(range(self.num_qubits))
+
+    def apply(self, code, qubits, angle=0):
+        # type: (int, Sequence[int], int) -> None
+        """
+        :param code: gate type code of :mod:`acquantumconnector.model.circuit`
+        :param qubits: the qubits of the gate, all of them distinct
+        :param angle: angle in degrees of the rotation gates
+        """
+        if len(set(qubits)) != len(qubits):
+            raise ValueError('The qubits of a gate must be distinct, got {}'.format(list(qubits)))
+        if code in (CP, CCP):
+            self._phase(qubits, -1)
+        elif code in _PHASES:
+            self._phase(qubits, _PHASES[code])
+        elif code == RZ:
+            self._phase(qubits, cmath.exp(1j * math.radians(angle)))
+        elif code == X:
+            self._swap(qubits[0])
+        elif code == H:
+            self._hadamard(qubits[0])
+        elif code == Y:
+            self._matrix(qubits[0], ((0, -1j), (1j, 0)))
+        elif code in (RX, RY):
+            c, s = math.cos(math.radians(angle) / 2), math.sin(math.radians(angle) / 2)
+            self._matrix(qubits[0], ((c, -1j * s), (-1j * s, c)) if code == RX else ((c, -s), (s, c)))
+        elif code != M:
+            raise ValueError('Unknown gate code {}'.format(code))
+
+    def probabilities(self, qubits=None):
+        # type: (Sequence[int]) -> np.ndarray
+        """
+        :param qubits: the qubits to keep, Default: all
+        :return: the probabilities summed over the other qubits, bit ``k`` of the index is the ``k``-th smallest
+                 of ``qubits``
+        """
+        probabilities = np.abs(self.state)
+        np.square(probabilities, out=probabilities)
+        if qubits is None:
+            return probabilities
+        kept = set(qubits)
+        # axis i of the reshaped state is qubit num_qubits - 1 - i
+        axes = tuple(self.num_qubits - 1 - qubit for qubit in range(self.num_qubits) if qubit not in kept)
+        return probabilities.reshape((2,) * self.num_qubits).sum(axis=axes).ravel() if axes else probabilities
+
+    def sample(self, qubits, shots, seed=None):
+        # type: (Sequence[int], int, int) -> Dict[str, float]
+        """
+        :param qubits: the measured qubits
+        :param shots: number of samples
+        :param seed: seed of the random generator
+        :return: relative frequency per observed bitstring, character ``i`` is the value of the ``i``-th smallest of
+                 ``qubits``
+        """
+        if shots < 1:
+            raise ValueError('shots must be greater 0')
+        probabilities = self.probabilities(qubits)
+        probabilities /= probabilities.sum()
+        counts = np.random.default_rng(seed).multinomial(shots, probabilities)
+        pattern = '0{}b'.format(len(qubits))
+        return {format(int(outcome), pattern)[::-1]: float(counts[outcome] / shots)
+                for outcome in np.flatnonzero(counts)}
+
+    def _phase(self, qubits, phase):
+        # type: (Sequence[int], complex) -> None
+        # view with one axis of length 2 per qubit, multiply where all of them are 1
+        shape, index, previous = [], [], self.num_qubits
+        for qubit in sorted(qubits, reverse=True):
+            shape.extend((1 << (previous - qubit - 1), 2))
+            index.extend((slice(None), 1))
+            previous = qubit
+        shape.append(1 << previous)
+        index.append(slice(None))
+        self.state.reshape(shape)[tuple(index)] *= phase
+
+    def _blocks(self, qubit):
+        view = self.state.reshape(-1, 2, 1 << qubit)
+        outer, _, inner = view.shape
+        step_outer, step_inner = max(1, _BLOCK // inner), min(inner, _BLOCK)
+        for i in range(0, outer, step_outer):
+            for j in range(0, inner, step_inner):
+                yield view[i:i + step_outer, 0, j:j + step_inner], view[i:i + step_outer, 1, j:j + step_inner]
+
+    def _swap(self, qubit):
+        # type: (int) -> None
+        for zero, one in self._blocks(qubit):
+            previous = zero.copy()
+            zero[...] = one
+            one[...] = previous
+
+    def _hadamard(self, qubit):
+        # type: (int) -> None
+        scale = 1 / math.sqrt(2)
+        for zero, one in self._blocks(qubit):
+            previous = zero.copy()
+            zero += one
+            zero *= scale
+            one -= previous
+            one *= -scale
+
+    def _matrix(self, qubit, matrix):
+        # type: (int, ((complex, complex), (complex, complex))) -> None
+        (u00, u01), (u10, u11) = matrix
+        for zero, one in self._blocks(qubit):
+            previous = zero.copy()
+            zero *= u00
+            zero += u01 * one
+            one *= u11
+            one += u10 * previous
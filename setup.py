@@ -19,11 +19,17 @@ info = {
     'url': 'https://github.com/carstenblank/acquantum-connector',
     'packages': [
         'acquantumconnector',
+        'acquantumconnector.compiler',
         'acquantumconnector.connector',
         'acquantumconnector.credentials',
         'acquantumconnector.model',
+        'acquantumconnector.simulator',
     ],
     'install_requires': requirements,
+    'extras_require': {
+        'numpy': ['numpy>=1.17'],
+        'orjson': ['orjson'],
+    },
     'license': 'Apache 2.0',
 }
 
@@ -0,0 +1,122 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Compares peak memory and encode time of the ``/experiment/codesave`` payload encodings.
+
+Every measurement runs in a fresh interpreter, so the peak RSS of one does not hide the next one::
+
+    python -m test.benchmark_codesave --sizes 10000 100000
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from acquantumconnector.connector.encoding import iter_codesave_payload, gzip_chunks
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.gates import HGate, RxGate, CPhase
+
+MODES = ('current', 'stream', 'circuit', 'circuit-stream', 'circuit-stream-gzip')
+
+
+def build_gates(size):
+    gates = []
+    for i in range(size):
+        x, y = i // 10 + 1, i % 10 + 1
+        if i % 3 == 0:
+            gates.append(HGate(x, y))
+        elif i % 3 == 1:
+            gates.append(RxGate(x, y, i % 360))
+        else:
+            gates.append(CPhase(x, (y, y % 10 + 1)))
+    return gates
+
+
+def build_circuit(size):
+    # the same gates as build_gates without the Gate objects, they would dominate the peak memory
+    circuit = Circuit()
+    for i in range(size):
+        x, y = i // 10 + 1, i % 10 + 1
+        if i % 3 == 0:
+            circuit.add('H', x, y)
+        elif i % 3 == 1:
+            circuit.add('RX', x, y, i % 360)
+        else:
+            circuit.add('CP', x, (y, y % 10 + 1))
+    return circuit
+
+
+def encode(mode, gates):
+    # type: (str, list) -> int
+    if mode == 'current':
+        payload = {'experimentId': '1', 'data': [gate.__dict__ for gate in gates], 'code': ''}
+        return len(json.dumps(payload).encode('utf-8'))
+    if mode == 'circuit':
+        return len(gates.to_payload(1).encode('utf-8'))
+    chunks = iter_codesave_payload(1, gates)
+    if mode.endswith('gzip'):
+        chunks = gzip_chunks(chunks)
+    return sum(len(chunk) for chunk in chunks)
+
+
+def measure(mode, size):
+    # type: (str, int) -> dict
+    gates = build_circuit(size) if mode.startswith('circuit') else build_gates(size)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    body_size = encode(mode, gates)
+    seconds = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'mode': mode,
+        'gates': size,
+        'encode_seconds': seconds,
+        'peak_rss_increase_kb': rss_after - rss_before,
+        'body_bytes': body_size
+    }
+
+
+def run(sizes, modes):
+    results = []
+    for size in sizes:
+        for mode in modes:
+            output = subprocess.check_output([sys.executable, '-m', 'test.benchmark_codesave', '--measure', mode,
+                                              str(size)])
+            results.append(json.loads(output.decode('utf-8')))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--measure', nargs=2, metavar=('MODE', 'SIZE'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure[0], int(args.measure[1]))))
+        return
+
+    print('{:>8} {:>20} {:>12} {:>16} {:>12}'.format('gates', 'mode', 'encode [s]', 'peak RSS +[kB]', 'body [B]'))
+    for result in run(args.sizes, args.modes):
+        print('{gates:>8} {mode:>20} {encode_seconds:>12.4f} {peak_rss_increase_kb:>16} {body_bytes:>12}'
+              .format(**result))
+
+
+if __name__ == '__main__':
+    main()
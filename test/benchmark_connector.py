@@ -0,0 +1,233 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+"""
+Times the hot paths of the connector: gate construction, codesave payload encoding, response parsing, result and
+backend configuration models, and complete submit/poll round-trips against the stand-in API.
+
+The results are written as JSON and can be compared with an earlier run, the exit code is 1 if a benchmark got
+slower than the threshold allows::
+
+    python -m test.benchmark_connector --output baseline.json
+    python -m test.benchmark_connector --output current.json --compare baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+import requests
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.encoding import iter_codesave_payload
+from acquantumconnector.connector.jsonbackend import StdlibJsonBackend
+from acquantumconnector.connector.transport import InProcessTransport
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.config import AcQuantumRawConfig
+from acquantumconnector.model.gates import HGate, RxGate, CPhase, Measure
+from acquantumconnector.model.response import AcQuantumResult
+from test.benchmark_codesave import build_circuit
+from test.standin_server import StandInApi, StandInServer
+
+GATE_SIZES = (1000, 10000, 100000, 1000000)
+HISTOGRAM_WIDTHS = (8, 12, 16)
+ROUND_TRIPS = 50
+
+
+def build_gates(size):
+    # type: (int) -> list
+    gates = []
+    for i in range(size):
+        x, y = i // 10 + 1, i % 10 + 1
+        if i % 4 == 0:
+            gates.append(HGate(x, y))
+        elif i % 4 == 1:
+            gates.append(RxGate(x, y, i % 360))
+        elif i % 4 == 2:
+            gates.append(CPhase(x, [y, y % 10 + 1]))
+        else:
+            gates.append(Measure(x, y))
+    return gates
+
+
+def result_response(width, results=1):
+    # type: (int, int) -> requests.Response
+    """
+    :return: a resultlist response with a histogram over all 2 ** width outcomes per result
+    """
+    probability = str(1.0 / (1 << width))
+    histogram = {format(outcome, '0{}b'.format(width)): probability for outcome in range(1 << width)}
+    result = {'startTime': '2019-01-29 17:30:56', 'finishTime': '2019-01-29 17:30:57', 'process': None,
+              'data': histogram, 'id': 1, 'seed': 0, 'shots': 1000, 'measureQubits': list(range(width))}
+    body = {'success': True, 'exception': None, 'message': None,
+            'data': {'simulateResult': [result] * results, 'realResult': []}}
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response._content = json.dumps(body).encode('utf-8')
+    response._content_consumed = True
+    return response
+
+
+def measure(function, repeat, number=1):
+    # type: (Callable[[], object], int, int) -> dict
+    """
+    :return: minimum, median and mean seconds of one call over ``repeat`` rounds of ``number`` calls
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        timings.append((time.perf_counter() - start) / number)
+    return {'min': min(timings), 'median': statistics.median(timings), 'mean': statistics.mean(timings),
+            'repeat': repeat, 'number': number}
+
+
+def bench_gates(sizes, repeat):
+    # type: (List[int], int) -> Dict[str, dict]
+    return {'gates/construct/{}'.format(size): measure(lambda: build_gates(size), repeat) for size in sizes}
+
+
+def bench_encoding(sizes, repeat):
+    # type: (List[int], int) -> Dict[str, dict]
+    results = {}
+    for size in sizes:
+        gates = build_gates(size)
+        circuit = build_circuit(size)
+        results['encode/json/{}'.format(size)] = measure(
+            lambda: json.dumps({'experimentId': '1', 'data': [gate.__dict__ for gate in gates], 'code': ''}), repeat)
+        results['encode/stream/{}'.format(size)] = measure(
+            lambda: sum(len(chunk) for chunk in iter_codesave_payload(1, gates)), repeat)
+        results['encode/circuit/{}'.format(size)] = measure(lambda: circuit.to_payload(1), repeat)
+    return results
+
+
+def bench_responses(widths, repeat):
+    # type: (List[int], int) -> Dict[str, dict]
+    results = {}
+    for width in widths:
+        response = result_response(width)
+        body = json.loads(response.content.decode('utf-8'))['data']['simulateResult'][0]
+        results['response/parse/{}'.format(width)] = measure(
+            lambda: AcQuantumConnector.handle_ac_response(response), repeat)
+        results['response/parse-json/{}'.format(width)] = measure(
+            lambda: AcQuantumConnector.handle_ac_response(response, StdlibJsonBackend()), repeat)
+        results['response/parse-lazy/{}'.format(width)] = measure(
+            lambda: AcQuantumConnector.handle_ac_response(response, lazy=True), repeat)
+        results['result/from_dict/{}'.format(width)] = measure(lambda: AcQuantumResult.from_dict(body), repeat)
+
+    with open(os.path.join(os.path.dirname(__file__), 'resources', 'computer-config.json')) as f:
+        config = json.load(f)['data']
+    results['config/from_json'] = measure(lambda: AcQuantumRawConfig.from_json(config), repeat, number=100)
+    return results
+
+
+def _round_trip(api):
+    # type: (AcQuantumConnector) -> None
+    experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Benchmark')
+    api.update_experiment(experiment_id, [HGate(1, 1), Measure(2, 1)])
+    api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 100)
+    api.get_result(experiment_id)
+
+
+def bench_round_trips(count, repeat):
+    # type: (int, int) -> Dict[str, dict]
+    """
+    Creates, saves, runs and polls ``count`` experiments per round, in process and over local HTTP.
+    """
+    credentials = AcQuantumCredentials('user', 'password')
+    api = AcQuantumConnector(base_uri='http://stand-in', transport=InProcessTransport(StandInApi()))
+    api.create_session(credentials)
+    results = {'roundtrip/in-process': measure(lambda: _round_trip(api), repeat, number=count)}
+    with StandInServer() as server:
+        api = AcQuantumConnector(base_uri=server.base_uri)
+        api.create_session(credentials)
+        results['roundtrip/http'] = measure(lambda: _round_trip(api), repeat, number=count)
+        api.close()
+    return results
+
+
+def run_suite(gate_sizes=GATE_SIZES, widths=HISTOGRAM_WIDTHS, round_trips=ROUND_TRIPS, repeat=5):
+    # type: (List[int], List[int], int, int) -> dict
+    benchmarks = {}
+    benchmarks.update(bench_gates(gate_sizes, repeat))
+    benchmarks.update(bench_encoding(gate_sizes, repeat))
+    benchmarks.update(bench_responses(widths, repeat))
+    benchmarks.update(bench_round_trips(round_trips, repeat))
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'timestamp': time.time(),
+        'benchmarks': benchmarks
+    }
+
+
+def compare(baseline, current, threshold=0.2):
+    # type: (dict, dict, float) -> List[dict]
+    """
+    Compares the median timings of the benchmarks present in both runs.
+
+    :param threshold: relative slowdown above which a benchmark counts as regression
+    :return: one entry per benchmark with name, baseline and current median, ratio and regression flag
+    """
+    rows = []
+    for name in sorted(set(baseline['benchmarks']) & set(current['benchmarks'])):
+        before = baseline['benchmarks'][name]['median']
+        after = current['benchmarks'][name]['median']
+        ratio = after / before if before else float('inf')
+        rows.append({'name': name, 'baseline': before, 'current': after, 'ratio': ratio,
+                     'regression': ratio > 1 + threshold})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(GATE_SIZES))
+    parser.add_argument('--widths', type=int, nargs='+', default=list(HISTOGRAM_WIDTHS))
+    parser.add_argument('--round-trips', type=int, default=ROUND_TRIPS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON file the results are written to')
+    parser.add_argument('--compare', metavar='BASELINE', help='JSON file of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.widths, args.round_trips, args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if not args.compare:
+        print('{:>32} {:>14} {:>14}'.format('benchmark', 'min [s]', 'median [s]'))
+        for name, timing in sorted(results['benchmarks'].items()):
+            print('{:>32} {:>14.6f} {:>14.6f}'.format(name, timing['min'], timing['median']))
+        return
+
+    with open(args.compare) as f:
+        rows = compare(json.load(f), results, args.threshold)
+    print('{:>32} {:>14} {:>14} {:>8}'.format('benchmark', 'baseline [s]', 'current [s]', 'ratio'))
+    for row in rows:
+        print('{name:>32} {baseline:>14.6f} {current:>14.6f} {ratio:>8.2f}{}'
+              .format('  REGRESSION' if row['regression'] else '', **row))
+    sys.exit(1 if any(row['regression'] for row in rows) else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -38,7 +38,7 @@ class AcQuantumConnectorIntegrationTest(TestCase):
     @classmethod
     def tearDownClass(cls):
         for filename in listdir('.'):
-            if filename.endswith('.xls') or filename == 'session':
+            if filename.endswith('.xls') or filename == 'session.json':
                 remove(filename)
 
     def setUp(self):
@@ -69,9 +69,9 @@ class AcQuantumConnectorIntegrationTest(TestCase):
         csrf = self.api._session.csrf
         cookies = self.api._session.cookies
         self.api = AcQuantumConnector()
-        self.api.load_session()
+        self.assertTrue(self.api.load_session(AcQuantumCredentials(os.environ['ACQ_USER'], os.environ['ACQ_PWD'])))
         self.assertEqual(self.api._session.csrf, csrf)
-        self.assertEqual(self.api._session.cookies, cookies)
+        self.assertEqual(dict(self.api._session.cookies), dict(cookies))
 
     def test_create_experiment(self):
         try:
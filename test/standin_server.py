@@ -0,0 +1,334 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import hashlib
+import itertools
+from collections import Counter
+import json
+import os
+import random
+import threading
+import time
+import uuid
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from typing import Callable, Union
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+
+class StandInApi(object):
+    """
+    In-memory imitation of the quantumcomputer.ac.cn endpoints used by the connector.
+
+    Besides the fixed number of ``throttle`` (429) and ``unavailable`` (503) answers and of ``disconnect`` transport
+    errors of the next requests, every request can be delayed and fail at random, to measure the client under
+    realistic conditions. Transport errors are raised as requests.ConnectionError and only reach the client through
+    an InProcessTransport.
+    """
+
+    def __init__(self, first_id=1, latency=0.0, failure_rate=0.0, seed=None):
+        # type: (int, Union[float, Callable[[], float]], float, int) -> None
+        """
+        :param first_id: the first experiment id handed out, distinct ranges keep several stand-ins apart
+        :param latency: seconds every request is delayed, or a function returning them, e.g. a random distribution
+        :param failure_rate: probability of a request failing with 503
+        :param seed: seed of the random failures
+        """
+        self.csrf = str(uuid.uuid4())
+        self.session_id = uuid.uuid4().hex
+        self.experiments = {}
+        self.results = {}
+        self.request_counts = Counter()
+        self.throttle = 0
+        self.unavailable = 0
+        self.disconnect = 0
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        with open(os.path.join(os.path.dirname(__file__), 'resources', 'computer-config.json')) as f:
+            self.backend_config = json.load(f)
+        self._ids = itertools.count(first_id)
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, params, headers, body):
+        # type: (str, str, dict, dict, bytes) -> (int, dict, bytes)
+        with self._lock:
+            self.request_counts[path] += 1
+            throttled, self.throttle = self.throttle > 0, max(self.throttle - 1, 0)
+            unavailable, self.unavailable = self.unavailable > 0, max(self.unavailable - 1, 0)
+            disconnected, self.disconnect = self.disconnect > 0, max(self.disconnect - 1, 0)
+            unavailable = unavailable or self._random.random() < self.failure_rate
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency > 0:
+            time.sleep(latency)
+        if disconnected:
+            raise requests.ConnectionError('Connection reset by stand-in')
+        if unavailable:
+            return self._json(503, {'success': False, 'exception': 'Service Unavailable'})
+        if throttled:
+            status_code, response_headers, content = self._json(429, {'success': False, 'exception': 'Too Many'})
+            response_headers['Retry-After'] = '0'
+            return status_code, response_headers, content
+        if path == '/login':
+            if method == 'GET':
+                return self._login_page()
+            return self._json(200, {'success': True, 'message': None})
+        if headers.get('X-CSRF-TOKEN') != self.csrf:
+            return self._json(403, {'success': False, 'exception': 'Forbidden'})
+
+        route = self._routes().get((method, path))
+        if route is None:
+            return self._json(404, {'success': False, 'exception': 'Not Found'})
+        try:
+            payload = json.loads(body.decode('utf-8')) if body else None
+            with self._lock:
+                response = route(params, payload)
+        except (KeyError, ValueError) as e:
+            return self._failed('{}'.format(e))
+        if response[1].get('ETag') and response[1]['ETag'] == headers.get('If-None-Match'):
+            return 304, {'ETag': response[1]['ETag']}, b''
+        if method == 'GET' and headers.get('Range'):
+            return self._range(headers['Range'], *response)
+        return response
+
+    def expire_session(self):
+        """
+        Issues a new CSRF token, so that requests with the current one are rejected.
+        """
+        self.csrf = str(uuid.uuid4())
+
+    def _routes(self):
+        return {
+            ('POST', '/experiment/infosave'): self._infosave,
+            ('POST', '/experiment/codesave'): self._codesave,
+            ('GET', '/experiment/detail'): self._detail,
+            ('GET', '/experiment/list'): self._list,
+            ('POST', '/experiment/submit'): self._submit,
+            ('GET', '/experiment/resultlist'): self._resultlist,
+            ('GET', '/experiment/resultDownload'): self._result_download,
+            ('POST', '/experiment/delete'): self._delete,
+            ('POST', '/experiment/result/delete'): self._result_delete,
+            ('GET', '/computerConfig/query'): self._config,
+        }
+
+    def _login_page(self):
+        body = "<html><script>var csrf = '{}';</script></html>".format(self.csrf).encode('utf-8')
+        headers = {
+            'Content-Type': 'text/html',
+            'Set-Cookie': 'SESSION={}; Path=/'.format(self.session_id)
+        }
+        return 200, headers, body
+
+    def _infosave(self, params, payload):
+        experiment_id = next(self._ids)
+        self.experiments[experiment_id] = {
+            'experimentName': payload['name'],
+            'experimentType': payload['type'],
+            'bitWidth': payload['bitWidth'],
+            'version': 0,
+            'execution': 0,
+            'code': '',
+            'data': []
+        }
+        return self._success(experiment_id)
+
+    def _codesave(self, params, payload):
+        experiment = self.experiments[int(payload['experimentId'])]
+        experiment['data'] = payload['data']
+        experiment['code'] = payload['code']
+        experiment['version'] += 1
+        return self._success()
+
+    def _detail(self, params, payload):
+        experiment_id = int(params['experimentId'])
+        if experiment_id not in self.experiments:
+            return self._failed('experiment not found')
+        return self._success(dict(self.experiments[experiment_id]))
+
+    def _list(self, params, payload):
+        experiments = [{
+            'name': exp['experimentName'],
+            'version': exp['version'],
+            'experimentId': experiment_id,
+            'type': exp['experimentType'],
+            'execution': exp['execution']
+        } for experiment_id, exp in sorted(self.experiments.items(), reverse=True)]
+        return self._success(experiments)
+
+    def _submit(self, params, payload):
+        experiment_id = int(params['experimentId'])
+        experiment = self.experiments[experiment_id]
+        experiment['execution'] += 1
+        result = {
+            'id': next(self._ids),
+            'seed': 0,
+            'shots': int(params['shots']),
+            'startTime': '2019-01-29 17:30:56',
+            'finishTime': '2019-01-29 17:30:57',
+            'process': None,
+            'measureQubits': [0],
+            'data': {'0': '0.5', '1': '0.5'}
+        }
+        results = self.results.setdefault(experiment_id, {'simulateResult': [], 'realResult': []})
+        key = 'realResult' if params['type'] == 'REAL' else 'simulateResult'
+        results[key].append(result)
+        return self._success()
+
+    def _resultlist(self, params, payload):
+        experiment_id = int(params['experimentId'])
+        if experiment_id not in self.experiments:
+            return self._failed('experiment not found')
+        return self._success(self.results.get(experiment_id, {'simulateResult': [], 'realResult': []}))
+
+    def _result_download(self, params, payload):
+        experiment_id = int(params['id'])
+        if experiment_id not in self.experiments:
+            return self._json(404, {'success': False, 'exception': 'experiment not found'})
+        content = json.dumps(self.results.get(experiment_id, {})).encode('utf-8')
+        return 200, {'Content-Type': 'application/vnd.ms-excel'}, content
+
+    def _delete(self, params, payload):
+        experiment_id = int(params['experimentId'])
+        if self.experiments.pop(experiment_id, None) is None:
+            return self._failed('experiment not found')
+        self.results.pop(experiment_id, None)
+        return self._success()
+
+    def _result_delete(self, params, payload):
+        result_id = int(params['id'])
+        for results in self.results.values():
+            for key in ('simulateResult', 'realResult'):
+                kept = [res for res in results[key] if res['id'] != result_id]
+                if len(kept) != len(results[key]):
+                    results[key] = kept
+                    return self._success()
+        return self._failed('result not found')
+
+    def _config(self, params, payload):
+        status_code, headers, content = self._json(200, self.backend_config)
+        headers['ETag'] = '"{}"'.format(hashlib.md5(content).hexdigest())
+        return status_code, headers, content
+
+    @staticmethod
+    def _range(value, status_code, headers, content):
+        if status_code != 200 or not value.startswith('bytes=') or not value[6:].endswith('-'):
+            return status_code, headers, content
+        start = int(value[6:-1])
+        if start >= len(content):
+            return 416, {'Content-Range': 'bytes */{}'.format(len(content))}, b''
+        headers = dict(headers, **{'Content-Range': 'bytes {}-{}/{}'.format(start, len(content) - 1, len(content))})
+        return 206, headers, content[start:]
+
+    @classmethod
+    def _success(cls, data=None):
+        return cls._json(200, {'success': True, 'exception': None, 'message': None, 'data': data})
+
+    @classmethod
+    def _failed(cls, message):
+        return cls._json(200, {'success': False, 'exception': message, 'message': message, 'data': None})
+
+    @staticmethod
+    def _json(status_code, body):
+        return status_code, {'Content-Type': 'application/json'}, json.dumps(body).encode('utf-8')
+
+
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StandInServer(object):
+    """
+    Serves a :class:`StandInApi` on a local port in a background thread.
+    """
+
+    def __init__(self, api=None, host='127.0.0.1', port=0):
+        # type: (StandInApi, str, int) -> None
+        self.api = api if api else StandInApi()
+        self._httpd = _ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def base_uri(self):
+        # type: () -> str
+        host, port = self._httpd.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        # type: () -> StandInServer
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        # type: () -> None
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _handler_class(self):
+        api = self.api
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                self._dispatch('GET')
+
+            def do_POST(self):
+                self._dispatch('POST')
+
+            def _dispatch(self, method):
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+                body = self._read_body()
+                status_code, headers, content = api.handle(method, url.path, params, dict(self.headers), body)
+                self.send_response(status_code)
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            def _read_body(self):
+                if self.headers.get('Transfer-Encoding', '').lower() == 'chunked':
+                    chunks = []
+                    while True:
+                        size = int(self.rfile.readline().split(b';')[0], 16)
+                        chunk = self.rfile.read(size + 2)[:size]
+                        if not size:
+                            break
+                        chunks.append(chunk)
+                    body = b''.join(chunks)
+                else:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    body = self.rfile.read(length) if length else b''
+                if self.headers.get('Content-Encoding', '').lower() == 'gzip':
+                    body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+                return body
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -15,13 +15,22 @@
 import json
 import os
 import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase, mock
 
 from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.cache import ResponseCache, BackendConfigCache
+from acquantumconnector.connector.ratelimit import RequestScheduler
+from acquantumconnector.connector.resultstore import AcQuantumResultStore
+from acquantumconnector.connector.retry import RetryPolicy
 from acquantumconnector.credentials.credentials import AcQuantumCredentials
 from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.circuit import Circuit
 from acquantumconnector.model.errors import AcQuantumRequestError
-from acquantumconnector.model.gates import XGate
+from acquantumconnector.model.gates import XGate, Measure
+from test.standin_server import StandInServer
 
 
 class MockApi:
@@ -145,6 +154,10 @@ class MockedResponse:
     def json(self):
         return self.json_data
 
+    @property
+    def content(self):
+        return json.dumps(self.json_data).encode('utf-8')
+
 
 class AcQuantumConnectorUnitTest(TestCase):
 
@@ -222,3 +235,278 @@ class AcQuantumConnectorUnitTest(TestCase):
     def test_delete_result_should_fail(self):
         with self.assertRaises(AcQuantumRequestError):
             self.api.delete_result(124)
+
+
+class AcQuantumConnectorStandInTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.api = AcQuantumConnector(base_uri=self.server.base_uri)
+        self.api.create_session(AcQuantumCredentials('user', 'password'))
+
+    def test_update_experiment_with_circuit(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Circuit')
+        self.api.update_experiment(experiment_id, Circuit([XGate(1, 1)]))
+        self.api.update_experiment(experiment_id, Circuit([Measure(2, 1)]), override=False)
+        experiment = self.api.get_experiment(experiment_id)
+        self.assertEqual([Measure(2, 1).__dict__, XGate(1, 1).__dict__], experiment.data)
+
+    def test_update_experiment_streamed(self):
+        gates = [XGate(i + 1, 1) for i in range(2000)]
+        for compress in (False, True):
+            experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Streamed')
+            self.api.update_experiment(experiment_id, gates, stream=True, compress=compress, chunk_size=1024)
+            self.api.update_experiment(experiment_id, Circuit([Measure(2001, 1)]), override=False, stream=True,
+                                       compress=compress)
+            experiment = self.api.get_experiment(experiment_id)
+            self.assertEqual([Measure(2001, 1).__dict__] + [gate.__dict__ for gate in gates], experiment.data)
+
+    def test_update_experiment_optimized(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Optimized')
+        self.api.update_experiment(experiment_id, [XGate(1, 1), XGate(2, 1), Measure(3, 2)], optimize=True)
+        self.assertEqual([Measure(1, 2).__dict__], self.api.get_experiment(experiment_id).data)
+
+    def test_config_cache(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, config_cache=BackendConfigCache(ttl=0))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        requests = self.server.api.request_counts['/computerConfig/query']
+        config = api.get_backend_config()
+        self.assertIs(config, api.get_backend_config())
+        self.assertIs(config, api.get_backend_config('USTC-1'))
+        self.assertEqual(requests + 3, self.server.api.request_counts['/computerConfig/query'])
+
+        status = self.server.api.backend_config['data'][3]
+        original = status['configValue']
+        self.addCleanup(status.__setitem__, 'configValue', original)
+        status['configValue'] = original.replace('OFFLINE', 'ONLINE')
+        self.assertEqual('ONLINE', api.get_backend_config().system_status.config_value.status)
+
+        api = AcQuantumConnector(base_uri=self.server.base_uri, config_cache=BackendConfigCache(ttl=60))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        api.get_backend_config()
+        api.get_backend_config()
+        self.assertEqual(requests + 5, self.server.api.request_counts['/computerConfig/query'])
+
+    def test_config_of_unknown_computer(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, config_cache=BackendConfigCache(ttl=60))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        api.get_backend_config()
+        requests = self.server.api.request_counts['/computerConfig/query']
+        with self.assertRaisesRegex(AcQuantumRequestError, 'No configuration of computer USTC-2'):
+            api.get_backend_config('USTC-2')
+        self.assertEqual(requests + 2, self.server.api.request_counts['/computerConfig/query'])
+
+        api = AcQuantumConnector(base_uri=self.server.base_uri)
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        self.assertEqual('USTC-1', api.get_backend_config('USTC-1').computer_id)
+        with self.assertRaisesRegex(AcQuantumRequestError, 'No configuration of computer USTC-2'):
+            api.get_backend_config('USTC-2')
+
+    def test_scheduler(self):
+        scheduler = RequestScheduler(rate=1000)
+        api = AcQuantumConnector(base_uri=self.server.base_uri, scheduler=scheduler)
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Scheduled')
+
+        self.server.api.throttle = 2
+        self.addCleanup(setattr, self.server.api, 'throttle', 0)
+        with mock.patch.object(scheduler, 'pause', wraps=scheduler.pause) as pause:
+            self.assertEqual(experiment_id, api.get_experiment(experiment_id).detail.experiment_id)
+        self.assertEqual([mock.call(0.0), mock.call(0.0)], pause.call_args_list)
+
+    def test_relogin_on_expired_session(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Expired')
+        logins = self.server.api.request_counts['/login']
+        self.server.api.expire_session()
+        self.api.update_experiment(experiment_id, [XGate(1, 1)])
+        self.assertEqual(logins + 2, self.server.api.request_counts['/login'])
+        self.assertEqual(self.server.api.csrf, self.api._session.csrf)
+
+    def test_concurrent_relogin_is_coalesced(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Coalesced')
+        logins = self.server.api.request_counts['/login']
+        self.server.api.expire_session()
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            experiments = list(executor.map(lambda _: self.api.get_experiment(experiment_id), range(8)))
+        self.assertEqual(8, len(experiments))
+        self.assertEqual(logins + 2, self.server.api.request_counts['/login'])
+
+    def test_retry_transient_errors(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, retry_policy=RetryPolicy(backoff=0.01))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Retried')
+        self.addCleanup(setattr, self.server.api, 'unavailable', 0)
+
+        self.server.api.unavailable = 2
+        self.assertEqual('Retried', api.get_experiment(experiment_id).detail.name)
+
+        self.server.api.unavailable = 1
+        with self.assertRaises(AcQuantumRequestError):
+            api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 1, 100)
+
+        api = AcQuantumConnector(base_uri=self.server.base_uri, retry_policy=RetryPolicy(max_retries=0))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        self.server.api.unavailable = 1
+        with self.assertRaises(AcQuantumRequestError):
+            api.get_experiment(experiment_id)
+
+    def test_default_retry_policy(self):
+        first, second = AcQuantumConnector()._retry_policy, AcQuantumConnector()._retry_policy
+        self.assertEqual(3, first.max_retries)
+        self.assertIsNot(first, second)
+
+    def test_thread_safe(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, thread_safe=True)
+        self.addCleanup(api.close)
+        api.create_session(AcQuantumCredentials('user', 'password'))
+
+        def submit(index):
+            if index % 4 == 0:
+                api.reconnect_session()
+            experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Threaded {}'.format(index))
+            api.update_experiment(experiment_id, [XGate(1, 1)])
+            return id(api.transport.session), api.get_experiment(experiment_id).detail.name
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(submit, range(16)))
+        self.assertEqual(['Threaded {}'.format(index) for index in range(16)], [name for _, name in responses])
+        self.assertLess(1, len(set(http for http, _ in responses)))
+        self.assertNotEqual(id(api.transport.session), responses[0][0])
+        self.assertIs(api.transport.cookies, api.transport.session.cookies)
+
+    def test_update_experiment_cached_state(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, cache_experiment_state=True)
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Cached')
+        counts = self.server.api.request_counts
+        sent = sum(counts.values())
+
+        # merges with a cached state send the codesave only
+        api.update_experiment(experiment_id, [XGate(1, 1)])
+        api.update_experiment(experiment_id, Circuit([XGate(2, 1)]), override=False)
+        api.update_experiment(experiment_id, [Measure(3, 1)], override=False, stream=True)
+        self.assertEqual(sent + 3, sum(counts.values()))
+        self.assertEqual([Measure(3, 1).__dict__, XGate(2, 1).__dict__, XGate(1, 1).__dict__],
+                         self.api.get_experiment(experiment_id).data)
+
+        # a foreign update shows in the experiment list, the next merge refreshes the experiment
+        self.api.update_experiment(experiment_id, [XGate(1, 2)])
+        api.get_experiments()
+        sent, details = sum(counts.values()), counts['/experiment/detail']
+        api.update_experiment(experiment_id, [Measure(2, 2)], override=False)
+        self.assertEqual((sent + 2, details + 1), (sum(counts.values()), counts['/experiment/detail']))
+        self.assertEqual([Measure(2, 2).__dict__, XGate(1, 2).__dict__], self.api.get_experiment(experiment_id).data)
+
+        # only versions returned by the backend are cached, however it counts them
+        self.server.api.experiments[experiment_id]['version'] += 10
+        api.get_experiment(experiment_id)
+        api.get_experiments()
+        sent = sum(counts.values())
+        api.update_experiment(experiment_id, [XGate(1, 3)], override=False)
+        self.assertEqual(sent + 1, sum(counts.values()))
+        self.assertEqual([XGate(1, 3).__dict__, Measure(2, 2).__dict__, XGate(1, 2).__dict__],
+                         self.api.get_experiment(experiment_id).data)
+
+        # a failed save drops the cached state
+        self.addCleanup(setattr, self.server.api, 'unavailable', 0)
+        self.server.api.unavailable = 1
+        with self.assertRaises(AcQuantumRequestError):
+            api.update_experiment(experiment_id, [XGate(1, 3)])
+        self.assertIsNone(api._experiment_states.get(experiment_id))
+
+    def test_response_cache(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, response_cache=ResponseCache())
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'ResponseCache')
+        counts = self.server.api.request_counts
+        details, lists = counts['/experiment/detail'], counts['/experiment/list']
+
+        for _ in range(5):
+            self.assertEqual('ResponseCache', api.get_experiment(experiment_id).detail.name)
+            self.assertIn(experiment_id, [exp.experiment_id for exp in api.get_experiments()])
+        self.assertEqual(details + 1, counts['/experiment/detail'])
+        self.assertEqual(lists + 1, counts['/experiment/list'])
+
+        api.update_experiment(experiment_id, [XGate(1, 1)])
+        self.assertEqual('X', api.get_experiment(experiment_id).data[0]['text'])
+        api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 10)
+        self.assertEqual(1, api.get_experiment(experiment_id).detail.execution)
+        api.delete_experiment(experiment_id)
+        self.assertNotIn(experiment_id, [exp.experiment_id for exp in api.get_experiments()])
+        self.assertEqual({'detail': {'hits': 4, 'misses': 3, 'size': 0}, 'list': {'hits': 4, 'misses': 2, 'size': 1}},
+                         api.cache_stats())
+
+    def test_result_store(self):
+        api = AcQuantumConnector(base_uri=self.server.base_uri, result_store=AcQuantumResultStore())
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'ResultStore')
+        api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 10)
+        counts = self.server.api.request_counts
+        result_lists = counts['/experiment/resultlist']
+
+        for _ in range(3):
+            self.assertEqual(1, len(api.get_result(experiment_id).simulated_result))
+        self.assertEqual(result_lists + 1, counts['/experiment/resultlist'])
+
+        api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 10)
+        self.assertEqual(2, len(api.get_result(experiment_id).simulated_result))
+        self.assertEqual(2, len(api.get_result(experiment_id).simulated_result))
+        self.assertEqual(result_lists + 2, counts['/experiment/resultlist'])
+
+    def test_submit_batch(self):
+        circuits = [[XGate(1, 1), Measure(2, i + 1)] for i in range(20)]
+        response = self.api.submit_batch(circuits, AcQuantumBackendType.SIMULATE, shots=100, max_workers=4)
+        self.assertEqual({}, response.errors)
+        self.assertEqual(20, len(set(response.experiment_ids)))
+        for index, experiment_id in enumerate(response.experiment_ids):
+            experiment = self.api.get_experiment(experiment_id)
+            self.assertEqual('Batch_{}'.format(index), experiment.detail.name)
+            self.assertEqual(index + 1, experiment.detail.bit_width)
+            self.assertEqual(100, self.api.get_result(experiment_id).simulated_result[0].shots)
+
+    def test_submit_batch_reports_failures(self):
+        circuits = [[XGate(1, 1)], [XGate(1, 1)], [XGate(1, 1)]]
+        original = self.api.update_experiment
+
+        def update_experiment(experiment_id, gates, code=None, override=True):
+            if gates is circuits[1]:
+                raise AcQuantumRequestError('codesave failed')
+            return original(experiment_id, gates, code=code, override=override)
+
+        with mock.patch.object(self.api, 'update_experiment', side_effect=update_experiment):
+            response = self.api.submit_batch(circuits, AcQuantumBackendType.SIMULATE, shots=10)
+
+        self.assertEqual([1], response.failed())
+        self.assertIsInstance(response.errors[1], AcQuantumRequestError)
+        self.assertEqual([response.experiment_ids[0], response.experiment_ids[2]], response.succeeded())
+        self.assertIsNotNone(response.experiment_ids[1])
+
+    def test_download_results(self):
+        experiment_ids = self.api.submit_batch([[XGate(1, 1)]] * 3, AcQuantumBackendType.SIMULATE, 10).experiment_ids
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        expected = {}
+        for experiment_id in experiment_ids:
+            file_name = os.path.join(directory, 'result_{}.xls'.format(experiment_id))
+            self.api.download_result(experiment_id, file_name)
+            with open(file_name, 'rb') as f:
+                expected[experiment_id] = f.read()
+        # complete, truncated and missing file
+        with open(os.path.join(directory, 'result_{}.xls'.format(experiment_ids[1])), 'wb') as f:
+            f.write(expected[experiment_ids[1]][:10])
+        os.remove(os.path.join(directory, 'result_{}.xls'.format(experiment_ids[2])))
+
+        report = self.api.download_results(experiment_ids + [999], directory, max_workers=2, chunk_size=16)
+        self.assertEqual([experiment_ids[0]], report.skipped)
+        self.assertEqual([999], list(report.errors))
+        self.assertEqual(len(expected[experiment_ids[1]]) - 10 + len(expected[experiment_ids[2]]), report.bytes_written)
+        for experiment_id in experiment_ids:
+            with open(report.files[experiment_id], 'rb') as f:
+                self.assertEqual(expected[experiment_id], f.read())
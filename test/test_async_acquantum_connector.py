@@ -0,0 +1,101 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import asyncio
+from unittest import TestCase
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector, AcQuantumSession
+from acquantumconnector.connector.asyncacquantumconnector import AsyncAcQuantumConnector
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError, AcQuantumRequestForbiddenError
+from acquantumconnector.model.gates import XGate, Measure
+from test.standin_server import StandInServer
+
+
+class AsyncAcQuantumConnectorTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.api = AsyncAcQuantumConnector(AcQuantumConnector(base_uri=self.server.base_uri), max_connections=4)
+        self.loop.run_until_complete(self.api.create_session(AcQuantumCredentials('user', 'password')))
+
+    def tearDown(self):
+        self.api.close()
+        self.loop.close()
+
+    def test_create_session(self):
+        self.assertEqual(self.server.api.csrf, self.api.connector._session.csrf)
+
+    def test_experiment_lifecycle(self):
+        async def lifecycle(name):
+            experiment_id = await self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, name)
+            await self.api.update_experiment(experiment_id, [XGate(1, 1), Measure(2, 1)])
+            await self.api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 100)
+            return experiment_id, await self.api.get_result(experiment_id)
+
+        async def run_all():
+            return await asyncio.gather(*[lifecycle('Async{}'.format(i)) for i in range(10)])
+
+        responses = self.loop.run_until_complete(run_all())
+        self.assertEqual(10, len(set(experiment_id for experiment_id, _ in responses)))
+        for _, result in responses:
+            self.assertEqual(100, result.simulated_result[0].shots)
+            self.assertIsNotNone(result.simulated_result[0].finish_time)
+
+    def test_get_experiment(self):
+        async def create_and_get():
+            experiment_id = await self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'AsyncDetail')
+            await self.api.update_experiment(experiment_id, [XGate(1, 1)])
+            return await self.api.get_experiment(experiment_id)
+
+        experiment = self.loop.run_until_complete(create_and_get())
+        self.assertEqual('AsyncDetail', experiment.detail.name)
+        self.assertEqual('X', experiment.data[0]['text'])
+
+    def test_worker_sessions(self):
+        transport = self.api.connector.transport
+        worker_session = self.loop.run_until_complete(self.api._run(lambda: transport.session))
+        self.assertIsNot(transport.session, worker_session)
+        self.assertIs(transport.cookies, worker_session.cookies)
+
+        api = AsyncAcQuantumConnector()
+        api.close()
+        self.assertTrue(api.connector.transport._thread_safe)
+
+    def test_get_experiment_should_fail(self):
+        with self.assertRaises(AcQuantumRequestError):
+            self.loop.run_until_complete(self.api.get_experiment(-1))
+
+    def test_get_backend_config(self):
+        self.assertIsNotNone(self.loop.run_until_complete(self.api.get_backend_config('USTC-1')))
+        with self.assertRaisesRegex(AcQuantumRequestError, 'No configuration of computer USTC-2'):
+            self.loop.run_until_complete(self.api.get_backend_config('USTC-2'))
+
+    def test_forbidden_without_session(self):
+        api = AsyncAcQuantumConnector(AcQuantumConnector(base_uri=self.server.base_uri))
+        api.connector._session = AcQuantumSession('wrong', None, None)
+        try:
+            with self.assertRaises(AcQuantumRequestForbiddenError):
+                self.loop.run_until_complete(api.get_experiments())
+        finally:
+            api.close()
@@ -0,0 +1,35 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+from unittest import TestCase
+
+from test.benchmark_connector import run_suite, compare
+
+
+class TestBenchmarkConnector(TestCase):
+
+    def test_run_suite(self):
+        results = run_suite(gate_sizes=[10], widths=[2], round_trips=1, repeat=1)
+        self.assertIn('encode/stream/10', results['benchmarks'])
+        self.assertIn('roundtrip/http', results['benchmarks'])
+        self.assertEqual(results, json.loads(json.dumps(results)))
+
+    def test_compare(self):
+        baseline = {'benchmarks': {'a': {'median': 1.0}, 'b': {'median': 2.0}, 'c': {'median': 1.0}}}
+        current = {'benchmarks': {'a': {'median': 1.1}, 'b': {'median': 3.0}, 'd': {'median': 1.0}}}
+        rows = compare(baseline, current, threshold=0.2)
+        self.assertEqual(['a', 'b'], [row['name'] for row in rows])
+        self.assertEqual([False, True], [row['regression'] for row in rows])
+        self.assertAlmostEqual(1.5, rows[1]['ratio'])
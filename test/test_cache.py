@@ -0,0 +1,146 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import os
+from unittest import TestCase, mock
+
+from acquantumconnector.connector.cache import LRUCache, ResponseCache, ExperimentState, ExperimentStateCache, \
+    BackendConfigCache
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.gates import XGate, Measure
+
+
+class TestLRUCache(TestCase):
+
+    def test_get_put(self):
+        cache = LRUCache(max_size=2)
+        cache.put(1, 'a')
+        self.assertEqual('a', cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 1}, cache.stats())
+
+    def test_eviction(self):
+        cache = LRUCache(max_size=2)
+        cache.put(1, 'a')
+        cache.put(2, 'b')
+        cache.get(1)
+        cache.put(3, 'c')
+        self.assertEqual('a', cache.get(1))
+        self.assertIsNone(cache.get(2))
+        self.assertEqual('c', cache.get(3))
+        self.assertEqual(2, len(cache))
+
+    @mock.patch('acquantumconnector.connector.cache.time.monotonic')
+    def test_ttl(self, monotonic):
+        cache = LRUCache(ttl=10)
+        monotonic.return_value = 100
+        cache.put(1, 'a')
+        monotonic.return_value = 110
+        self.assertEqual('a', cache.get(1))
+        monotonic.return_value = 110.5
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(0, len(cache))
+
+    def test_invalidate(self):
+        cache = LRUCache()
+        cache.put(1, 'a')
+        cache.put(2, 'b')
+        cache.invalidate(1)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual('b', cache.get(2))
+        cache.invalidate()
+        self.assertEqual(0, len(cache))
+
+    def test_response_cache_invalidate(self):
+        cache = ResponseCache()
+        cache.experiments.put('list', [])
+        cache.details.put(1, 'a')
+        cache.details.put(2, 'b')
+        cache.invalidate(1)
+        self.assertIsNone(cache.experiments.get('list'))
+        self.assertIsNone(cache.details.get(1))
+        self.assertEqual('b', cache.details.get(2))
+
+
+class TestExperimentStateCache(TestCase):
+
+    def test_prepend(self):
+        state = ExperimentState(1, [[XGate(1, 1).__dict__]]).prepend(Circuit([Measure(2, 1)]))
+        self.assertIsNone(state.version)
+        self.assertEqual([Measure(2, 1).__dict__, XGate(1, 1).__dict__], state.gates())
+
+    def test_validate(self):
+        cache = ExperimentStateCache()
+        cache.put(1, ExperimentState(3, []))
+        cache.put(2, ExperimentState(None, []))
+        self.assertTrue(cache.validate(1, 3))
+        self.assertFalse(cache.validate(2, 3))
+        self.assertFalse(cache.validate(1, 4))
+        self.assertIsNone(cache.get(1))
+        self.assertTrue(cache.validate(5, 1))
+
+    @mock.patch('acquantumconnector.connector.cache.time.monotonic')
+    def test_ttl(self, monotonic):
+        cache = ExperimentStateCache(ttl=10)
+        monotonic.return_value = 100
+        cache.put(1, ExperimentState(3, []))
+        monotonic.return_value = 110
+        self.assertEqual(3, cache.get(1).version)
+        monotonic.return_value = 111
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(0, len(cache))
+
+
+class TestBackendConfigCache(TestCase):
+
+    def setUp(self):
+        with open(os.path.join(os.path.dirname(__file__), 'resources', 'computer-config.json')) as f:
+            self.values = json.load(f)['data']
+
+    def status(self, status, calibration_time):
+        values = [dict(value) for value in self.values]
+        values[3]['configValue'] = json.dumps({'status': status, 'fridgeTemperature': 0.1,
+                                               'lastCalibrationTime': calibration_time})
+        return values
+
+    def test_keep_parsed_config(self):
+        cache = BackendConfigCache()
+        self.assertIsNone(cache.get())
+        cache.update(self.status('OFFLINE', '2019-01-01'), etag='"a"')
+        config = cache.get()
+        self.assertIs(config, cache.get('USTC-1'))
+        self.assertEqual('"a"', cache.etag)
+
+        cache.update(self.status('OFFLINE', '2019-01-01'))
+        self.assertIs(config, cache.get())
+        cache.update(self.status('ONLINE', '2019-01-01'))
+        self.assertIsNot(config, cache.get())
+        config = cache.get()
+        cache.update(self.status('ONLINE', '2019-01-02'))
+        self.assertEqual('2019-01-02', cache.get().system_status.config_value.last_calibration_time)
+
+    @mock.patch('acquantumconnector.connector.cache.time.monotonic')
+    def test_ttl(self, monotonic):
+        cache = BackendConfigCache(ttl=10)
+        monotonic.return_value = 100
+        self.assertFalse(cache.fresh())
+        cache.update(self.values)
+        monotonic.return_value = 110.5
+        self.assertFalse(cache.fresh())
+        cache.touch()
+        self.assertTrue(cache.fresh())
+        cache.invalidate()
+        self.assertFalse(cache.fresh())
+        self.assertIsNone(cache.get())
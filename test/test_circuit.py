@@ -0,0 +1,112 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+from unittest import TestCase
+
+from acquantumconnector.model.circuit import Circuit, parse_text, RX, H, CP
+from acquantumconnector.model.gates import RzGate, RxGate, CPhase, CCPhase, XGate, YGate, HGate, SDag, TDag, \
+    Measure
+
+
+class TestCircuit(TestCase):
+
+    def setUp(self):
+        self.gates = [XGate(1, 1), YGate(2, 2), CCPhase(3, [1, 2, 3]), Measure(4, 4), CPhase(6, (1, 4)),
+                      RxGate(6, 6, 340), RzGate(6, 7, 234), SDag(7, 1), TDag(7, 2), HGate(8, 3)]
+
+    def test_encode(self):
+        circuit = Circuit(self.gates)
+        self.assertEqual(len(self.gates), len(circuit))
+        self.assertEqual([gate.__dict__ for gate in self.gates], json.loads(circuit.encode()))
+        self.assertEqual(json.dumps([gate.__dict__ for gate in self.gates], separators=(',', ':'), sort_keys=True),
+                         json.dumps(json.loads(circuit.encode()), separators=(',', ':'), sort_keys=True))
+
+    def test_to_payload(self):
+        circuit = Circuit(self.gates)
+        payload = json.loads(circuit.to_payload(123, 'code'))
+        self.assertEqual('123', payload['experimentId'])
+        self.assertEqual('code', payload['code'])
+        self.assertEqual([gate.__dict__ for gate in self.gates], payload['data'])
+        self.assertEqual('', json.loads(circuit.to_payload(123))['code'])
+
+    def test_to_gates(self):
+        gates = Circuit(self.gates).to_gates()
+        self.assertEqual([gate.__dict__ for gate in self.gates], [gate.__dict__ for gate in gates])
+        self.assertEqual([type(gate) for gate in self.gates], [type(gate) for gate in gates])
+
+    def test_gate_details(self):
+        gate = XGate(1, 1)
+        gate.set_gate_details({'label': 'flip'})
+        circuit = Circuit([gate, XGate(2, 1)])
+        self.assertEqual([gate.__dict__, XGate(2, 1).__dict__], json.loads(circuit.encode()))
+        self.assertEqual({'label': 'flip'}, circuit.gate(0).gateDetail)
+
+    def test_add(self):
+        circuit = Circuit()
+        circuit.add('RX', 1, 2, 90)
+        circuit.add('CP', 2, (1, 2))
+        circuit.add('CCP', 3, [1, 2, 3])
+        self.assertEqual([RxGate(1, 2, 90).__dict__, CPhase(2, (1, 2)).__dict__, CCPhase(3, [1, 2, 3]).__dict__],
+                         json.loads(circuit.encode()))
+        self.assertEqual(3, circuit.bit_width)
+
+        with self.assertRaises(ValueError):
+            circuit.add('RX', 1, 1, 361)
+        with self.assertRaises(ValueError):
+            circuit.add('H', 0, 1)
+        with self.assertRaises(ValueError):
+            circuit.add('H', 1, 0)
+        with self.assertRaises(ValueError):
+            circuit.add('CP', 1, (1, 1))
+        with self.assertRaises(ValueError):
+            circuit.add('CCP', 1, (1, 2))
+        with self.assertRaises(KeyError):
+            circuit.add('U3', 1, 1)
+        self.assertEqual(3, len(circuit))
+
+    def test_add_many(self):
+        circuit = Circuit()
+        circuit.add_many('H', [1, 1, 1], [1, 2, 3])
+        circuit.add_many('RZ', [2, 2], [1, 2], [45, 90])
+        expected = [HGate(1, 1), HGate(1, 2), HGate(1, 3), RzGate(2, 1, 45), RzGate(2, 2, 90)]
+        self.assertEqual([gate.__dict__ for gate in expected], json.loads(circuit.encode()))
+
+        with self.assertRaises(ValueError):
+            circuit.add_many('RZ', [1], [1])
+        with self.assertRaises(ValueError):
+            circuit.add_many('H', [1, 2], [1])
+        with self.assertRaises(ValueError):
+            circuit.add_many('H', [0], [1])
+        with self.assertRaises(ValueError):
+            circuit.add_many('CP', [1], [1])
+
+    def test_extend_dicts(self):
+        circuit = Circuit()
+        circuit.extend_dicts([gate.__dict__ for gate in self.gates])
+        self.assertEqual([gate.__dict__ for gate in self.gates], json.loads(circuit.encode()))
+
+    def test_copy(self):
+        circuit = Circuit(self.gates)
+        copy = circuit.copy()
+        copy.add('H', 9, 1)
+        self.assertEqual(len(self.gates), len(circuit))
+        self.assertEqual(len(self.gates) + 1, len(copy))
+
+    def test_parse_text(self):
+        self.assertEqual((RX, 90), parse_text('RX_90'))
+        self.assertEqual((H, 0), parse_text('H'))
+        self.assertEqual((CP, 0), parse_text('CP'))
+        with self.assertRaises(ValueError):
+            parse_text('U3_90')
@@ -0,0 +1,42 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import os
+from unittest import TestCase, mock
+
+from acquantumconnector.model.config import AcQuantumRawConfig, SystemConfigValue
+
+
+class TestAcQuantumRawConfig(TestCase):
+
+    def setUp(self):
+        with open(os.path.join(os.path.dirname(__file__), 'resources', 'computer-config.json')) as f:
+            self.values = json.load(f)['data']
+
+    def test_lazy_decoding(self):
+        with mock.patch('acquantumconnector.model.config.json.loads', side_effect=json.loads) as loads:
+            config = AcQuantumRawConfig.from_json(self.values)
+            self.assertEqual(0, loads.call_count)
+            self.assertEqual('OFFLINE', config.system_status.config_value.status)
+            self.assertEqual(1, loads.call_count)
+            config.system_status.config_value
+            self.assertEqual(1, loads.call_count)
+
+        self.assertEqual('USTC-1', config.computer_id)
+        self.assertIsInstance(config.system_config.config_value, SystemConfigValue)
+        self.assertEqual(['CZ'], config.system_config.config_value.two_q_gates)
+        self.assertEqual(11, config.one_q_gate_fidelities.config_value[0]['qubit'])
+        self.assertEqual({'q1': 1, 'q2': 2, 'cz': 0.978}, config.two_q_gate_fidelity.config_value[0])
+        self.assertEqual(self.values[1]['configValue'], config.one_q_gate_fidelities.raw_value)
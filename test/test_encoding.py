@@ -0,0 +1,55 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import zlib
+from unittest import TestCase
+
+from acquantumconnector.connector.encoding import iter_codesave_payload, gzip_chunks
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.gates import XGate, CCPhase, Measure, RxGate, SDag
+
+
+class TestEncoding(TestCase):
+
+    def setUp(self):
+        self.gates = [XGate(i + 1, (i % 5) + 1) for i in range(1000)] + \
+                     [CCPhase(1001, [1, 2, 3]), RxGate(1002, 1, 90), SDag(1003, 2), Measure(1004, 1)]
+        self.expected = {
+            'experimentId': '123',
+            'data': [gate.__dict__ for gate in self.gates],
+            'code': ''
+        }
+
+    def test_iter_codesave_payload(self):
+        chunks = list(iter_codesave_payload(123, self.gates, chunk_size=1024))
+        self.assertTrue(len(chunks) > 1)
+        self.assertTrue(all(len(chunk) < 2048 for chunk in chunks))
+        self.assertEqual(self.expected, json.loads(b''.join(chunks).decode('utf-8')))
+
+    def test_iter_codesave_payload_circuit(self):
+        chunks = iter_codesave_payload(123, Circuit(self.gates), code='code', chunk_size=1024)
+        self.expected['code'] = 'code'
+        self.assertEqual(self.expected, json.loads(b''.join(chunks).decode('utf-8')))
+
+    def test_iter_codesave_payload_existing_segments(self):
+        existing = [[XGate(1, 1).__dict__], Circuit([Measure(2, 1)])]
+        chunks = iter_codesave_payload(123, [SDag(1, 2)], existing_segments=existing)
+        self.assertEqual([SDag(1, 2).__dict__, XGate(1, 1).__dict__, Measure(2, 1).__dict__],
+                         json.loads(b''.join(chunks).decode('utf-8'))['data'])
+
+    def test_gzip_chunks(self):
+        chunks = list(gzip_chunks(iter_codesave_payload(123, self.gates, chunk_size=1024)))
+        body = zlib.decompress(b''.join(chunks), 16 + zlib.MAX_WBITS)
+        self.assertEqual(self.expected, json.loads(body.decode('utf-8')))
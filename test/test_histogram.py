@@ -0,0 +1,80 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import importlib.util
+from unittest import TestCase, skipIf
+
+from acquantumconnector.model.response import AcQuantumResult
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+if HAS_NUMPY:
+    import numpy as np
+    from acquantumconnector.model.histogram import AcQuantumHistogram
+
+
+@skipIf(not HAS_NUMPY, 'numpy is not installed')
+class TestAcQuantumHistogram(TestCase):
+
+    def setUp(self):
+        # position 0 is qubit 2, position 1 is qubit 0
+        self.result = AcQuantumResult(1, 0, 1000, '', [2, 0], data={'00': '0.1', '01': '0.2', '10': '0.3', '11': '0.4'})
+
+    def test_from_result(self):
+        histogram = self.result.histogram()
+        self.assertEqual([0, 2], histogram.qubits)
+        # index bit 0 is qubit 0 (bitstring position 1), bit 1 is qubit 2 (bitstring position 0)
+        self.assertEqual(1, AcQuantumHistogram.from_dict({'01': 1.0}, [2, 0]).indices[0])
+        self.assertEqual(2, AcQuantumHistogram.from_dict({'01': 1.0}, [0, 2]).indices[0])
+        np.testing.assert_allclose([0.1, 0.2, 0.3, 0.4], histogram.dense())
+
+    def test_counts(self):
+        indices, counts = self.result.histogram().counts()
+        self.assertEqual([0, 1, 2, 3], indices.tolist())
+        self.assertEqual([100, 200, 300, 400], counts.tolist())
+
+    def test_marginal(self):
+        histogram = self.result.histogram()
+        np.testing.assert_allclose([0.4, 0.6], histogram.marginal([0]).dense())
+        np.testing.assert_allclose([0.3, 0.7], histogram.marginal([2]).dense())
+        with self.assertRaises(ValueError):
+            histogram.marginal([1])
+
+    def test_expectation_z(self):
+        histogram = self.result.histogram()
+        self.assertAlmostEqual(0.4 - 0.6, histogram.expectation_z([0]))
+        self.assertAlmostEqual(0.3 - 0.7, histogram.expectation_z([2]))
+        self.assertAlmostEqual(0.1 + 0.4 - 0.2 - 0.3, histogram.expectation_z([0, 2]))
+
+    def test_wide_register(self):
+        qubits = list(range(40))
+        data = {'1' * 40: 0.5, '0' * 39 + '1': 0.5}
+        histogram = AcQuantumHistogram.from_dict(data, qubits, 2)
+        indices, values = histogram.sparse()
+        self.assertEqual([1 << 39, (1 << 40) - 1], indices.tolist())
+        self.assertAlmostEqual(-1.0, histogram.expectation_z([39]))
+        with self.assertRaises(ValueError):
+            histogram.dense()
+
+    def test_stack(self):
+        histograms = [self.result.histogram(), self.result.histogram().marginal([0, 2])]
+        self.assertEqual((2, 4), AcQuantumHistogram.stack(histograms).shape)
+        with self.assertRaises(ValueError):
+            AcQuantumHistogram.stack([histograms[0], histograms[0].marginal([0])])
+
+    def test_invalid_bitstring(self):
+        with self.assertRaises(ValueError):
+            AcQuantumHistogram.from_dict({'02': 1.0}, [0, 1])
+        with self.assertRaises(ValueError):
+            AcQuantumHistogram.from_dict({'0': 1.0}, [0, 1])
@@ -0,0 +1,119 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+from unittest import TestCase, mock
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.jsonbackend import JsonBackend, StdlibJsonBackend, default_backend, get_backend, \
+    split_envelope
+from acquantumconnector.connector.transport import InProcessTransport
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import HGate, Measure
+from test.benchmark_connector import result_response
+from test.standin_server import StandInApi
+
+DOCUMENTS = [
+    b'{}',
+    b' { "success" : true } ',
+    b'{"success": true, "data": 5, "exception": null}',
+    b'{"success": true, "exception": null, "message": null, "data": {"simulateResult": [], "realResult": []}}',
+    b'{"success": true, "data": {"a": "}\\"]"}, "exception": "x\\\\", "message": "a,\\"b\\":1"}',
+    b'{"data": [1, 2], "success": false, "exception": {"a": 1}, "message": null}',
+    b'{"data": "x\\"", "success": -1.5e3}',
+    b'{"a": [{"b": "]"}], "data": null}'
+]
+
+
+class TestJsonBackend(TestCase):
+
+    def test_backends(self):
+        self.assertEqual('json', get_backend('json').name)
+        self.assertIn(default_backend().name, ('orjson', 'ujson', 'json'))
+        self.assertEqual({'a': [1.5, None]}, default_backend().loads(b'{"a": [1.5, null]}'))
+        with self.assertRaises(ValueError):
+            get_backend('simplejson')
+        with self.assertRaises(ValueError):
+            default_backend().loads(b'{"a": ')
+
+    def test_incomplete_backend(self):
+        class NamedBackend(JsonBackend):
+            name = 'named'
+
+        with self.assertRaises(TypeError):
+            NamedBackend()
+
+    def test_split_envelope(self):
+        for document in DOCUMENTS:
+            members, rest = split_envelope(document)
+            if rest is not None:
+                remaining = json.loads(rest)
+                self.assertEqual(set(), set(members) & set(remaining))
+                members.update(remaining)
+            self.assertEqual(json.loads(document), members, document)
+
+    def test_deferred_data(self):
+        members, rest = split_envelope(DOCUMENTS[3])
+        self.assertEqual({'success': True, 'exception': None, 'message': None}, members)
+        self.assertEqual(b'{"data": {"simulateResult": [], "realResult": []}}', rest)
+
+        members, rest = split_envelope(DOCUMENTS[5])
+        self.assertEqual({'message': None}, members)
+        members, rest = split_envelope(DOCUMENTS[5], required=('success', 'exception'))
+        self.assertEqual(json.loads(DOCUMENTS[5]), members)
+        self.assertIsNone(rest)
+
+    def test_malformed(self):
+        for document in [b'', b'[]', b'{"a": 1', b'{"a" 1}', b'{"a": 1}x', b'{"a": "b}', b'{"data": 1, }']:
+            with self.assertRaises(ValueError, msg=document):
+                members, rest = split_envelope(document)
+                if rest is not None:
+                    json.loads(rest)
+
+
+class TestLazyResponses(TestCase):
+
+    def test_handle_ac_response(self):
+        response = result_response(4)
+        eager = AcQuantumConnector.handle_ac_response(response, StdlibJsonBackend())
+        with mock.patch('acquantumconnector.connector.jsonbackend.StdlibJsonBackend.loads',
+                        side_effect=json.loads) as loads:
+            lazy = AcQuantumConnector.handle_ac_response(response, StdlibJsonBackend(), lazy=True)
+            decoded = loads.call_count
+            self.assertEqual(eager.data, lazy.data)
+            self.assertEqual(decoded + 1, loads.call_count)
+            lazy.data
+            self.assertEqual(decoded + 1, loads.call_count)
+        self.assertTrue(lazy.success)
+
+    def test_malformed_data(self):
+        response = result_response(1)
+        response._content = b'{"success": true, "exception": null, "data": {"simulateResult": [}}'
+        lazy = AcQuantumConnector.handle_ac_response(response, lazy=True)
+        with self.assertRaises(AcQuantumRequestError):
+            lazy.data
+
+    def test_connector(self):
+        api = AcQuantumConnector(base_uri='http://stand-in', transport=InProcessTransport(StandInApi()),
+                                 json_backend='json', lazy_decode=True)
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_id = api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Lazy')
+        api.update_experiment(experiment_id, [HGate(1, 1), Measure(2, 1)])
+        self.assertEqual(2, len(api.get_experiment(experiment_id).data))
+        api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 100)
+        self.assertEqual(1, len(api.get_result(experiment_id).simulated_result))
+        with self.assertRaises(AcQuantumRequestError):
+            api.get_experiment(-1)
@@ -0,0 +1,116 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from unittest import TestCase
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.metrics import MetricsCollector, RequestEvent
+from acquantumconnector.connector.retry import RetryPolicy
+from acquantumconnector.connector.transport import InProcessTransport
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import XGate
+from test.standin_server import StandInApi
+
+
+def _event(endpoint, status_code=200, network=0.02, parse=0.001, **values):
+    event = RequestEvent('GET', endpoint)
+    event.status_code = status_code
+    event.network_seconds = network
+    event.parse_seconds = parse
+    for key, value in values.items():
+        setattr(event, key, value)
+    return event
+
+
+class TestMetricsCollector(TestCase):
+
+    def test_openmetrics(self):
+        metrics = MetricsCollector(buckets=(0.01, 0.1))
+        metrics(_event('/experiment/detail', bytes_received=100, retries=2))
+        metrics(_event('/experiment/detail', network=0.005, bytes_received=50))
+        metrics(_event('/experiment/list', status_code=None, error=ConnectionError(), relogin=True))
+        text = metrics.to_openmetrics()
+
+        self.assertIn('# TYPE acquantum_requests counter\n', text)
+        self.assertIn('acquantum_requests_total{endpoint="/experiment/detail",method="GET",status="200"} 2\n', text)
+        self.assertIn('acquantum_requests_total{endpoint="/experiment/list",method="GET",status="none"} 1\n', text)
+        self.assertIn('acquantum_request_errors_total{endpoint="/experiment/list",error="ConnectionError"} 1\n',
+                      text)
+        self.assertIn('acquantum_request_bytes_received_total{endpoint="/experiment/detail"} 150\n', text)
+        self.assertIn('acquantum_retries_total 2\n', text)
+        self.assertIn('acquantum_relogins_total 1\n', text)
+        self.assertIn('acquantum_request_network_seconds_bucket{endpoint="/experiment/detail",le="0.01"} 1\n', text)
+        self.assertIn('acquantum_request_network_seconds_bucket{endpoint="/experiment/detail",le="0.1"} 2\n', text)
+        self.assertIn('acquantum_request_network_seconds_bucket{endpoint="/experiment/detail",le="+Inf"} 2\n', text)
+        self.assertIn('acquantum_request_network_seconds_count{endpoint="/experiment/detail"} 2\n', text)
+        self.assertTrue(text.endswith('# EOF\n'))
+
+        metrics.reset()
+        self.assertEqual(0, metrics.snapshot()['requests'])
+
+    def test_label_escaping(self):
+        self.assertEqual('{endpoint="a\\"b\\\\c"}', MetricsCollector._labels(endpoint='a"b\\c'))
+
+
+class TestRequestHooks(TestCase):
+
+    def setUp(self):
+        self.stand_in = StandInApi()
+        self.metrics = MetricsCollector()
+        self.events = []
+        self.api = AcQuantumConnector(base_uri='http://stand-in', transport=InProcessTransport(self.stand_in),
+                                      retry_policy=RetryPolicy(backoff=0.001),
+                                      request_hooks=[self.metrics, self.events.append])
+        self.api.create_session(AcQuantumCredentials('user', 'password'))
+
+    def test_events(self):
+        experiment_id = self.api.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Hooked')
+        self.api.update_experiment(experiment_id, [XGate(1, 1)], stream=True)
+        self.api.get_experiment(experiment_id)
+
+        self.assertEqual(['/login', '/login', '/experiment/infosave', '/experiment/codesave', '/experiment/detail'],
+                         [event.endpoint for event in self.events])
+        detail = self.events[-1]
+        self.assertEqual(('GET', 200, None), (detail.method, detail.status_code, detail.error))
+        self.assertGreater(detail.bytes_received, 0)
+        self.assertGreater(detail.parse_seconds, 0)
+        self.assertGreater(detail.network_seconds, 0)
+        self.assertGreater(self.events[3].bytes_sent, 0)
+        self.assertGreater(self.events[2].bytes_sent, 0)
+
+    def test_retries_and_relogins(self):
+        experiment_id = self.api.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Counted')
+        self.stand_in.unavailable = 2
+        self.api.get_experiment(experiment_id)
+        self.stand_in.expire_session()
+        self.api.get_experiment(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.get_experiment(-1)
+
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(2, snapshot['retries'])
+        self.assertEqual(1, snapshot['relogins'])
+        self.assertEqual(1, snapshot['errors'])
+        self.assertIsInstance(self.events[-1].error, AcQuantumRequestError)
+
+    def test_failing_hook(self):
+        def fail(event):
+            raise RuntimeError(event)
+
+        self.api.add_request_hook(fail)
+        with self.assertLogs('acquantumconnector.connector.acquantumconnector', 'ERROR'):
+            self.api.get_experiments()
+        self.assertEqual('/experiment/list', self.events[-1].endpoint)
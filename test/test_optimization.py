@@ -0,0 +1,61 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from unittest import TestCase
+
+from acquantumconnector.compiler.optimization import optimize_circuit
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.gates import HGate, XGate, SGate, SDag, TGate, TDag, RxGate, RzGate, CPhase, Measure
+
+
+def dicts(gates):
+    return [gate.__dict__ for gate in gates]
+
+
+class TestOptimizeCircuit(TestCase):
+
+    def test_cancel_inverse_pairs(self):
+        gates = [HGate(1, 1), SGate(2, 1), SDag(3, 1), TGate(4, 1), TDag(5, 1), XGate(6, 1), XGate(7, 1),
+                 HGate(8, 1), Measure(9, 1)]
+        self.assertEqual(dicts([Measure(1, 1)]), dicts(optimize_circuit(gates)))
+
+    def test_merge_rotations(self):
+        gates = [RxGate(1, 1, 90), RxGate(2, 1, 300), RzGate(3, 1, 180), RzGate(4, 1, 180), RxGate(5, 1, 10)]
+        self.assertEqual(dicts([RxGate(1, 1, 40)]), dicts(optimize_circuit(gates)))
+
+    def test_blocked_by_other_gates(self):
+        gates = [HGate(1, 1), CPhase(2, (1, 2)), HGate(3, 1), XGate(4, 2), Measure(5, 1), XGate(6, 1), XGate(7, 1)]
+        self.assertEqual(dicts([HGate(1, 1), CPhase(2, (1, 2)), HGate(3, 1), XGate(3, 2), Measure(4, 1)]),
+                         dicts(optimize_circuit(gates)))
+        gates = [CPhase(1, (1, 2)), CPhase(2, (2, 1)), CPhase(3, (2, 1)), HGate(4, 1)]
+        self.assertEqual(dicts([CPhase(1, (2, 1)), HGate(2, 1)]), dicts(optimize_circuit(gates)))
+
+    def test_compact(self):
+        gates = [XGate(3, 1), HGate(7, 2), CPhase(9, (1, 3)), XGate(10, 2), Measure(12, 4)]
+        self.assertEqual(dicts([XGate(1, 1), HGate(1, 2), CPhase(2, (1, 3)), XGate(3, 2), Measure(1, 4)]),
+                         dicts(optimize_circuit(gates)))
+        self.assertEqual(dicts(gates), dicts(optimize_circuit(gates, compact=False)))
+
+    def test_column_order_and_details(self):
+        detailed = XGate(2, 1)
+        detailed.set_gate_details({'note': 1})
+        gates = [XGate(3, 1), detailed, XGate(1, 1)]
+        self.assertEqual(dicts([XGate(1, 1), detailed, XGate(3, 1)]), dicts(optimize_circuit(gates, compact=False)))
+
+    def test_circuit(self):
+        circuit = Circuit([HGate(1, 1), HGate(2, 1), XGate(3, 2)])
+        optimized = optimize_circuit(circuit)
+        self.assertIsInstance(optimized, Circuit)
+        self.assertEqual(dicts([XGate(1, 2)]), dicts(optimized))
+        self.assertEqual(3, len(circuit))
@@ -0,0 +1,119 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from unittest import TestCase
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.pool import AcQuantumConnectorPool
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import XGate, Measure
+from test.standin_server import StandInApi, StandInServer
+
+
+class TestAcQuantumConnectorPool(TestCase):
+    """
+    Each account talks to its own stand-in server, so an experiment is only found with the account that created it.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.servers = [StandInServer().start(), StandInServer(StandInApi(first_id=100000)).start()]
+
+    @classmethod
+    def tearDownClass(cls):
+        for server in cls.servers:
+            server.stop()
+
+    def setUp(self):
+        servers = iter(self.servers)
+        self.pool = AcQuantumConnectorPool(
+            [AcQuantumCredentials('alice', 'a'), AcQuantumCredentials('bob', 'b')],
+            connector_factory=lambda: AcQuantumConnector(base_uri=next(servers).base_uri, thread_safe=True))
+        self.pool.create_sessions()
+        self.addCleanup(self.pool.close)
+
+    def test_submit_balances_accounts(self):
+        experiment_ids = [self.pool.submit([XGate(1, 1), Measure(2, 1)], AcQuantumBackendType.SIMULATE, 100)
+                          for _ in range(4)]
+        owners = [self.pool.owner(experiment_id) for experiment_id in experiment_ids]
+        self.assertEqual(['alice', 'bob', 'alice', 'bob'], owners)
+        metrics = self.pool.metrics()
+        self.assertEqual({'in_flight': 0, 'pending': 2, 'requests': 7, 'errors': 0, 'experiments': 2},
+                         metrics['alice'])
+
+        for experiment_id in experiment_ids:
+            self.assertEqual(100, self.pool.get_result(experiment_id).simulated_result[0].shots)
+        self.assertEqual(0, self.pool.metrics()['bob']['pending'])
+
+    def test_least_loaded(self):
+        first = self.pool.submit([XGate(1, 1)], AcQuantumBackendType.SIMULATE, 10)
+        second = self.pool.submit([XGate(1, 1)], AcQuantumBackendType.SIMULATE, 10)
+        self.pool.get_result(first)
+        third = self.pool.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Third')
+        self.assertEqual(self.pool.owner(first), self.pool.owner(third))
+        self.assertNotEqual(self.pool.owner(second), self.pool.owner(third))
+
+    def test_unfinished_results_stay_pending(self):
+        experiment_id = self.pool.submit([XGate(1, 1)], AcQuantumBackendType.SIMULATE, 10)
+        owner = self.pool.owner(experiment_id)
+        server = self.servers[0] if owner == 'alice' else self.servers[1]
+        result = server.api.results[experiment_id]['simulateResult'][0]
+        finish_time, result['finishTime'] = result['finishTime'], None
+
+        self.pool.get_result(experiment_id)
+        self.assertEqual(1, self.pool.metrics()[owner]['pending'])
+        result['finishTime'] = finish_time
+        self.pool.get_result(experiment_id)
+        self.assertEqual(0, self.pool.metrics()[owner]['pending'])
+
+    def test_pinned_lookups(self):
+        experiment_id = self.pool.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Pinned')
+        self.pool.update_experiment(experiment_id, [XGate(1, 1)])
+        self.assertEqual('Pinned', self.pool.get_experiment(experiment_id).detail.name)
+        self.pool.delete_experiment(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.pool.get_experiment(experiment_id)
+
+    def test_concurrent_delete(self):
+        experiment_id = self.pool.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Deleted')
+        connector = self.pool._owner(experiment_id).connector
+        delete = connector.delete_experiment
+
+        def delete_concurrently(deleted_id):
+            # another thread deletes the experiment while this call is in flight
+            connector.delete_experiment = delete
+            self.pool.delete_experiment(deleted_id)
+
+        connector.delete_experiment = delete_concurrently
+        self.pool.delete_experiment(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.pool.owner(experiment_id)
+
+    def test_errors_are_counted(self):
+        experiment_id = self.pool.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Failing')
+        owner = self.pool.owner(experiment_id)
+        self.servers[0 if owner == 'alice' else 1].api.experiments.pop(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.pool.get_experiment(experiment_id)
+        self.assertEqual(1, self.pool.metrics()[owner]['errors'])
+
+    def test_get_experiments_registers_owners(self):
+        experiment_id = self.pool.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Listed')
+        owner = self.pool.owner(experiment_id)
+        pool = AcQuantumConnectorPool(list(self.pool._accounts[i].credentials for i in range(2)),
+                                      connector_factory=iter(a.connector for a in self.pool._accounts).__next__)
+        self.assertIn(experiment_id, [experiment.experiment_id for experiment in pool.get_experiments()])
+        self.assertEqual(owner, pool.owner(experiment_id))
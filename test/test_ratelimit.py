@@ -0,0 +1,95 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+import time
+from unittest import TestCase, mock
+
+from acquantumconnector.connector.ratelimit import TokenBucket, RequestScheduler, PRIORITY_HIGH, PRIORITY_LOW, \
+    PRIORITY_NORMAL
+
+
+class TestTokenBucket(TestCase):
+
+    @mock.patch('acquantumconnector.connector.ratelimit.time.monotonic')
+    def test_try_acquire(self, monotonic):
+        monotonic.return_value = 100
+        bucket = TokenBucket(2, capacity=2)
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertAlmostEqual(0.5, bucket.try_acquire())
+        monotonic.return_value = 100.5
+        self.assertEqual(0, bucket.try_acquire())
+        monotonic.return_value = 110
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertAlmostEqual(0.5, bucket.try_acquire())
+
+    @mock.patch('acquantumconnector.connector.ratelimit.time.monotonic')
+    def test_pause(self, monotonic):
+        monotonic.return_value = 100
+        bucket = TokenBucket(1)
+        bucket.pause(3)
+        self.assertAlmostEqual(3, bucket.try_acquire())
+        monotonic.return_value = 103
+        self.assertAlmostEqual(1, bucket.try_acquire())
+        monotonic.return_value = 104
+        self.assertEqual(0, bucket.try_acquire())
+
+    def test_rate_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class TestRequestScheduler(TestCase):
+
+    def _run_blocked(self, scheduler, requests):
+        # type: (RequestScheduler, list) -> list
+        """
+        Queues the (name, priority) requests while the scheduler is paused and returns the order they were let through.
+        """
+        order = []
+        scheduler.pause(0.2)
+        threads = []
+        for name, priority in requests:
+            thread = threading.Thread(target=lambda n=name, p=priority: scheduler.acquire(p) and order.append(n))
+            thread.start()
+            threads.append(thread)
+            while sum(scheduler.waiting().values()) < len(threads):
+                time.sleep(0.001)
+        for thread in threads:
+            thread.join(5)
+        return order
+
+    def test_priority_and_fifo(self):
+        scheduler = RequestScheduler(rate=1000, burst=1)
+        order = self._run_blocked(scheduler, [('low', PRIORITY_LOW), ('normal-1', PRIORITY_NORMAL),
+                                              ('normal-2', PRIORITY_NORMAL), ('high', PRIORITY_HIGH)])
+        self.assertEqual(['high', 'normal-1', 'normal-2', 'low'], order)
+        self.assertEqual({}, scheduler.waiting())
+
+    def test_timeout(self):
+        scheduler = RequestScheduler(rate=1)
+        scheduler.pause(10)
+        start = time.monotonic()
+        self.assertFalse(scheduler.acquire(timeout=0.05))
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual({}, scheduler.waiting())
+
+    def test_rate(self):
+        scheduler = RequestScheduler(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            self.assertTrue(scheduler.acquire())
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
@@ -0,0 +1,82 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import os
+import tempfile
+from unittest import TestCase
+
+from acquantumconnector.connector.resultstore import AcQuantumResultStore
+
+
+def result(result_id, finish_time='2019-01-29 17:30:57'):
+    return {
+        'id': result_id,
+        'seed': 0,
+        'shots': 100,
+        'startTime': '2019-01-29 17:30:56',
+        'finishTime': finish_time,
+        'process': None,
+        'measureQubits': [0],
+        'data': {'0': '0.25', '1': '0.75'}
+    }
+
+
+class TestAcQuantumResultStore(TestCase):
+
+    def setUp(self):
+        self.store = AcQuantumResultStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_complete_experiment(self):
+        self.store.put_response(1, {'simulateResult': [result(10), result(11)], 'realResult': [result(12)]})
+        response = self.store.get_response(1)
+        self.assertEqual([10, 11], [res.result_id for res in response.simulated_result])
+        self.assertEqual([12], [res.result_id for res in response.real_result])
+        self.assertEqual({'0': 0.25, '1': 0.75}, response.simulated_result[0].data)
+        self.assertEqual(result(10)['startTime'], self.store.get(10).start_time)
+
+    def test_incomplete_experiment(self):
+        self.store.put_response(1, {'simulateResult': [result(10), result(11, None)], 'realResult': []})
+        self.assertIsNone(self.store.get_response(1))
+        self.assertIsNotNone(self.store.get(10))
+        self.assertIsNone(self.store.get(11))
+
+        self.store.put_response(2, {'simulateResult': [], 'realResult': []})
+        self.assertIsNone(self.store.get_response(2))
+
+    def test_mark_incomplete(self):
+        self.store.put_response(1, {'simulateResult': [result(10)], 'realResult': []})
+        self.store.mark_incomplete(1)
+        self.assertIsNone(self.store.get_response(1))
+        self.assertIsNotNone(self.store.get(10))
+
+    def test_delete(self):
+        self.store.put_response(1, {'simulateResult': [result(10), result(11)], 'realResult': []})
+        self.store.delete_result(10)
+        self.assertIsNone(self.store.get(10))
+        self.assertIsNone(self.store.get_response(1))
+        self.store.delete_experiment(1)
+        self.assertIsNone(self.store.get(11))
+
+    def test_persistent(self):
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'results.db')
+        with AcQuantumResultStore(path) as store:
+            store.put_response(1, {'simulateResult': [result(10)], 'realResult': []})
+        with AcQuantumResultStore(path) as store:
+            self.assertEqual(10, store.get_response(1).simulated_result[0].result_id)
+        os.remove(path)
+        os.rmdir(directory)
@@ -0,0 +1,129 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import threading
+from collections import Counter
+from unittest import TestCase
+
+import requests
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.resultwatcher import ResultWatcher, BackoffPolicy
+from acquantumconnector.connector.retry import RetryPolicy
+from acquantumconnector.connector.transport import InProcessTransport
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import XGate
+from acquantumconnector.model.response import AcQuantumResult, AcQuantumResultResponse
+from test.standin_server import StandInApi
+
+
+class MockConnector:
+
+    def __init__(self, polls_until_finished):
+        self.polls_until_finished = polls_until_finished
+        self.calls = Counter()
+        self.lock = threading.Lock()
+
+    def get_result(self, experiment_id):
+        with self.lock:
+            self.calls[experiment_id] += 1
+            calls = self.calls[experiment_id]
+        if experiment_id < 0:
+            raise AcQuantumRequestError('experiment not found')
+        finish_time = '2019-01-29 17:30:57' if calls >= self.polls_until_finished[experiment_id] else None
+        result = AcQuantumResult(experiment_id, 0, 100, '2019-01-29 17:30:56', [0], finish_time, None, {'1': '1.0'})
+        if experiment_id % 2:
+            return AcQuantumResultResponse([], [result])
+        return AcQuantumResultResponse([result], [])
+
+
+class ResultWatcherTest(TestCase):
+
+    def setUp(self):
+        self.connector = MockConnector({1: 3, 2: 1, 4: 5})
+        policies = {
+            AcQuantumBackendType.SIMULATE: BackoffPolicy(0.001, 0.004),
+            AcQuantumBackendType.REAL: BackoffPolicy(0.002, 0.008)
+        }
+        self.watcher = ResultWatcher(self.connector, policies)
+
+    def tearDown(self):
+        self.watcher.close()
+
+    def test_wait(self):
+        response = self.watcher.wait(2, AcQuantumBackendType.SIMULATE, timeout=5)
+        self.assertIsNotNone(response.simulated_result[0].finish_time)
+        self.assertEqual(1, self.connector.calls[2])
+
+    def test_multiplexed_watches(self):
+        futures = {
+            1: self.watcher.watch(1, AcQuantumBackendType.REAL),
+            2: self.watcher.watch(2, AcQuantumBackendType.SIMULATE),
+            4: self.watcher.watch(4, AcQuantumBackendType.SIMULATE)
+        }
+        self.assertEqual(1, futures[1].result(5).real_result[0].result_id)
+        self.assertEqual(2, futures[2].result(5).simulated_result[0].result_id)
+        self.assertEqual(4, futures[4].result(5).simulated_result[0].result_id)
+        self.assertEqual(Counter({1: 3, 2: 1, 4: 5}), self.connector.calls)
+        self.assertEqual([], self.watcher.pending())
+
+    def test_deduplicates_waiters(self):
+        resolved = []
+        first = self.watcher.watch(4, AcQuantumBackendType.SIMULATE, callback=resolved.append)
+        second = self.watcher.watch(4, AcQuantumBackendType.SIMULATE, callback=resolved.append)
+        self.assertIs(first, second)
+        first.result(5)
+        self.assertEqual(5, self.connector.calls[4])
+        self.assertEqual([first, first], resolved)
+
+    def test_error(self):
+        with self.assertRaises(AcQuantumRequestError):
+            self.watcher.wait(-1, AcQuantumBackendType.SIMULATE, timeout=5)
+
+    def test_backoff_policy(self):
+        policy = BackoffPolicy(1.0, 5.0)
+        self.assertEqual(2.0, policy.next_interval(1.0))
+        self.assertEqual(5.0, policy.next_interval(4.0))
+        with self.assertRaises(ValueError):
+            BackoffPolicy(2.0, 1.0)
+
+    def test_close_cancels_pending(self):
+        watcher = ResultWatcher(self.connector, {AcQuantumBackendType.SIMULATE: BackoffPolicy(60, 60)})
+        future = watcher.watch(2, AcQuantumBackendType.SIMULATE)
+        watcher.close()
+        self.assertTrue(future.cancelled())
+        self.assertEqual(0, self.connector.calls[2])
+
+    def test_transport_error(self):
+        stand_in = StandInApi()
+        api = AcQuantumConnector(base_uri='http://stand-in', transport=InProcessTransport(stand_in),
+                                 retry_policy=RetryPolicy(max_retries=0))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        experiment_ids = []
+        for _ in range(2):
+            experiment_id = api.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Watched')
+            api.update_experiment(experiment_id, [XGate(1, 1)])
+            api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 1, 100)
+            experiment_ids.append(experiment_id)
+
+        watcher = ResultWatcher(api, {AcQuantumBackendType.SIMULATE: BackoffPolicy(0.001, 0.004)})
+        self.addCleanup(watcher.close)
+        stand_in.disconnect = 1
+        with self.assertRaises(requests.ConnectionError):
+            watcher.wait(experiment_ids[0], AcQuantumBackendType.SIMULATE, timeout=5)
+        response = watcher.wait(experiment_ids[1], AcQuantumBackendType.SIMULATE, timeout=5)
+        self.assertEqual(1, len(response.simulated_result))
+        self.assertEqual([], watcher.pending())
@@ -0,0 +1,35 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from unittest import TestCase, mock
+
+from acquantumconnector.connector.retry import RetryPolicy
+
+
+class TestRetryPolicy(TestCase):
+
+    @mock.patch('acquantumconnector.connector.retry.random.uniform', side_effect=lambda low, high: high)
+    def test_delay(self, _):
+        policy = RetryPolicy(backoff=0.5, max_backoff=3)
+        self.assertEqual([0.5, 1, 2, 3, 3], [policy.delay(attempt) for attempt in range(5)])
+
+    def test_delay_is_jittered(self):
+        policy = RetryPolicy(backoff=1)
+        delays = [policy.delay(2) for _ in range(100)]
+        self.assertTrue(all(0 <= delay <= 4 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RetryPolicy(max_retries=-1)
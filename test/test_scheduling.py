@@ -0,0 +1,45 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from unittest import TestCase
+
+from acquantumconnector.compiler.scheduling import schedule, schedule_columns, ALAP
+from acquantumconnector.model.gates import HGate, XGate, SDag, RxGate, CPhase, CCPhase, Measure
+
+
+class TestScheduling(TestCase):
+
+    def test_asap(self):
+        circuit = schedule([('H', 0), ('H', 1), ('H', 2), ('CP', (0, 1)), ('SDG', 2), ('RX', 2, 90), ('X', 0),
+                            ('M', 0), ('M', 1), ('M', 2)])
+        expected = [HGate(1, 1), HGate(1, 2), HGate(1, 3), CPhase(2, (1, 2)), SDag(2, 3), RxGate(3, 3, 90),
+                    XGate(3, 1), Measure(4, 1), Measure(3, 2), Measure(4, 3)]
+        self.assertEqual([gate.__dict__ for gate in expected], [gate.__dict__ for gate in circuit])
+
+    def test_alap(self):
+        circuit = schedule([('H', 0), ('X', 1), ('CP', (1, 2)), ('M', 0), ('M', 1), ('M', 2)], ALAP)
+        expected = [HGate(2, 1), XGate(1, 2), CPhase(2, (2, 3)), Measure(3, 1), Measure(3, 2), Measure(3, 3)]
+        self.assertEqual([gate.__dict__ for gate in expected], [gate.__dict__ for gate in circuit])
+
+    def test_spans_block_rows_between(self):
+        circuit = schedule([('CCP', (0, 4, 2)), ('H', 3), ('H', 5)])
+        self.assertEqual([CCPhase(1, (1, 5, 3)).__dict__, HGate(2, 4).__dict__, HGate(1, 6).__dict__],
+                         [gate.__dict__ for gate in circuit])
+
+    def test_schedule_columns(self):
+        self.assertEqual([], schedule_columns([]))
+        self.assertEqual([1, 2, 1], schedule_columns([(1, 1), (1, 2), (3, 3)]))
+        self.assertEqual([1, 2, 2], schedule_columns([(1, 1), (1, 2), (3, 3)], ALAP))
+        with self.assertRaises(ValueError):
+            schedule_columns([(1, 1)], 'random')
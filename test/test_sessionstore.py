@@ -0,0 +1,136 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import os
+import shutil
+import stat
+import tempfile
+from unittest import TestCase, mock
+
+from requests.cookies import RequestsCookieJar
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.sessionstore import FileSessionStore, MemorySessionStore, SessionStore, \
+    restore_cookies
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from test.standin_server import StandInServer
+
+
+def _jar(**cookies):
+    jar = RequestsCookieJar()
+    for name, value in cookies.items():
+        jar.set(name, value, domain='127.0.0.1', path='/')
+    return jar
+
+
+class TestSessionStores(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_file_store(self):
+        path = os.path.join(self.directory, 'sessions.json')
+        store = FileSessionStore(path)
+        store.put('a', 'csrf-a', _jar(SESSION='1'))
+        store.put('b', 'csrf-b', _jar(SESSION='2'))
+
+        record = FileSessionStore(path).get('a')
+        self.assertEqual('csrf-a', record['csrf'])
+        jar = RequestsCookieJar()
+        restore_cookies(record, jar)
+        self.assertEqual({'SESSION': '1'}, dict(jar))
+        self.assertEqual(0o600, stat.S_IMODE(os.stat(path).st_mode))
+        with open(path) as f:
+            self.assertEqual({'a', 'b'}, set(json.load(f)))
+
+        store.delete('a')
+        self.assertIsNone(store.get('a'))
+        self.assertEqual('csrf-b', store.get('b')['csrf'])
+        self.assertEqual(['sessions.json'], os.listdir(self.directory))
+
+    def test_corrupt_file(self):
+        path = os.path.join(self.directory, 'sessions.json')
+        with open(path, 'w') as f:
+            f.write('{no json')
+        self.assertIsNone(FileSessionStore(path).get('a'))
+
+    @mock.patch('acquantumconnector.connector.sessionstore.time.time')
+    def test_expiry(self, now):
+        now.return_value = 1000
+        store = MemorySessionStore(ttl=60)
+        store.put('a', 'csrf', _jar(SESSION='1'))
+        jar = _jar()
+        jar.set('SHORT', 'x', domain='127.0.0.1', path='/', expires=1030)
+        store.put('b', 'csrf', jar)
+        now.return_value = 1030
+        self.assertIsNotNone(store.get('a'))
+        self.assertIsNone(store.get('b'))
+        now.return_value = 1060
+        self.assertIsNone(store.get('a'))
+
+    def test_incomplete_store(self):
+        class WriteOnlyStore(SessionStore):
+            def put(self, key, csrf, cookies):
+                pass
+
+        with self.assertRaises(TypeError):
+            WriteOnlyStore()
+
+
+class TestConnectorSessionStore(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_reuse_stored_session(self):
+        store = MemorySessionStore()
+        credentials = AcQuantumCredentials('user', 'password')
+        api = AcQuantumConnector(base_uri=self.server.base_uri, session_store=store)
+        api.create_session(credentials)
+        logins = self.server.api.request_counts['/login']
+
+        worker = AcQuantumConnector(base_uri=self.server.base_uri, session_store=store)
+        worker.create_session(credentials)
+        self.assertEqual(logins, self.server.api.request_counts['/login'])
+        worker.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Stored')
+
+        self.server.api.expire_session()
+        worker.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Renewed')
+        self.assertEqual(logins + 2, self.server.api.request_counts['/login'])
+        self.assertEqual(self.server.api.csrf, store.get('{}|user'.format(self.server.base_uri))['csrf'])
+
+    def test_save_and_load_session(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store = FileSessionStore(os.path.join(directory, 'session.json'))
+        credentials = AcQuantumCredentials('user', 'password')
+        api = AcQuantumConnector(base_uri=self.server.base_uri)
+        api.create_session(credentials)
+        api.save_session(store)
+
+        with open(store.path) as f:
+            self.assertNotIn('password', f.read())
+        loaded = AcQuantumConnector(base_uri=self.server.base_uri)
+        self.assertTrue(loaded.load_session(credentials, store))
+        self.assertEqual(api._session.csrf, loaded._session.csrf)
+        self.assertEqual(dict(api.transport.cookies), dict(loaded.transport.cookies))
+        self.assertFalse(AcQuantumConnector(base_uri='http://other').load_session(credentials, store))
@@ -0,0 +1,150 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import importlib.util
+from unittest import TestCase, skipIf
+
+from acquantumconnector.connector.localconnector import AcQuantumLocalConnector
+from acquantumconnector.connector.resultwatcher import ResultWatcher
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.circuit import Circuit, CCP
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import HGate, XGate, YGate, SGate, SDag, TGate, TDag, RxGate, RyGate, RzGate, \
+    CPhase, CCPhase, Measure
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+if HAS_NUMPY:
+    import numpy as np
+    from acquantumconnector.simulator.statevector import StatevectorSimulator
+
+
+@skipIf(not HAS_NUMPY, 'numpy is not installed')
+class TestStatevectorSimulator(TestCase):
+
+    def run_gates(self, num_qubits, gates):
+        simulator = StatevectorSimulator(num_qubits)
+        measured = simulator.run(gates)
+        return simulator, measured
+
+    def test_bell_state(self):
+        # H on both, CZ, H on the target is a CNOT
+        simulator, measured = self.run_gates(2, [HGate(1, 1), HGate(1, 2), CPhase(2, (1, 2)), HGate(3, 2),
+                                                 Measure(4, 1), Measure(4, 2)])
+        self.assertEqual([0, 1], measured)
+        np.testing.assert_allclose([0.5, 0, 0, 0.5], simulator.probabilities(measured), atol=1e-12)
+
+    def test_column_order(self):
+        simulator, measured = self.run_gates(1, [Measure(3, 1), HGate(2, 1), HGate(1, 1)])
+        np.testing.assert_allclose([1, 0], simulator.probabilities(measured), atol=1e-12)
+
+    def test_single_qubit_gates(self):
+        for gates, expected in [([XGate(1, 1)], [0, 1]),
+                                ([YGate(1, 1)], [0, 1]),
+                                ([RxGate(1, 1, 180)], [0, 1]),
+                                ([RyGate(1, 1, 90)], [0.5, 0.5]),
+                                ([HGate(1, 1), RzGate(2, 1, 180), HGate(3, 1)], [0, 1]),
+                                ([HGate(1, 1), SGate(2, 1), SGate(3, 1), HGate(4, 1)], [0, 1]),
+                                ([HGate(1, 1), TGate(2, 1), TDag(3, 1), HGate(4, 1)], [1, 0]),
+                                ([HGate(1, 1), SGate(2, 1), SDag(3, 1), HGate(4, 1)], [1, 0]),
+                                ([HGate(1, 1), TGate(2, 1), TGate(3, 1), SDag(4, 1), HGate(5, 1)], [1, 0])]:
+            simulator, measured = self.run_gates(1, gates)
+            np.testing.assert_allclose(expected, simulator.probabilities(measured), atol=1e-12, err_msg=str(gates))
+
+    def test_ccz(self):
+        gates = [XGate(1, 1), XGate(1, 3), HGate(1, 2), CCPhase(2, (1, 2, 3)), HGate(3, 2)]
+        simulator, measured = self.run_gates(3, gates)
+        self.assertEqual([0, 1, 2], measured)
+        np.testing.assert_allclose(1.0, simulator.probabilities()[0b111], atol=1e-12)
+
+    def test_duplicate_qubits(self):
+        with self.assertRaisesRegex(ValueError, 'must be distinct'):
+            StatevectorSimulator(3).apply(CCP, (0, 0, 2))
+
+    def test_marginal_and_sample(self):
+        circuit = Circuit()
+        circuit.add_many('H', [1] * 12, list(range(1, 13)))
+        circuit.add('X', 2, 12)
+        circuit.add('M', 3, 12)
+        circuit.add('M', 3, 1)
+        simulator, measured = self.run_gates(12, circuit)
+        self.assertEqual([0, 11], measured)
+        np.testing.assert_allclose([0.25] * 4, simulator.probabilities(measured), atol=1e-12)
+        data = simulator.sample(measured, 1000, seed=1)
+        self.assertEqual({'00', '01', '10', '11'}, set(data))
+        self.assertEqual({float}, {type(value) for value in data.values()})
+        self.assertAlmostEqual(1.0, sum(data.values()))
+        self.assertEqual(data, simulator.sample(measured, 1000, seed=1))
+
+    def test_large_register(self):
+        circuit = Circuit()
+        circuit.add_many('H', [1] * 20, list(range(1, 21)))
+        circuit.add('M', 2, 20)
+        simulator, measured = self.run_gates(20, circuit)
+        np.testing.assert_allclose([0.5, 0.5], simulator.probabilities(measured))
+        np.testing.assert_allclose(1.0, np.linalg.norm(simulator.state))
+
+
+@skipIf(not HAS_NUMPY, 'numpy is not installed')
+class TestAcQuantumLocalConnector(TestCase):
+
+    def setUp(self):
+        self.api = AcQuantumLocalConnector()
+        self.api.create_session(AcQuantumCredentials('user', 'password'))
+
+    def test_run_experiment(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.LOCAL, 'Local')
+        self.api.update_experiment(experiment_id, [XGate(1, 1)])
+        self.api.update_experiment(experiment_id, [Measure(2, 1)], override=False)
+        self.assertEqual(2, self.api.get_experiment(experiment_id).detail.version)
+        self.api.run_experiment(experiment_id, AcQuantumBackendType.LOCAL, 2, 100, seed='7')
+
+        results = self.api.get_result(experiment_id)
+        self.assertEqual([], results.real_result)
+        result = results.simulated_result[0]
+        self.assertEqual(([0], 100, 7), (result.measure_qubits, result.shots, result.seed))
+        self.assertEqual({'1': 1.0}, result.data)
+
+        self.api.delete_result(result.result_id)
+        self.assertEqual([], self.api.get_result(experiment_id).simulated_result)
+        self.api.delete_experiment(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.get_result(experiment_id)
+
+    def test_submit_batch(self):
+        circuits = [[HGate(1, 1), Measure(2, 1)], Circuit([XGate(1, 2), Measure(2, 2)])]
+        response = self.api.submit_batch(circuits, AcQuantumBackendType.LOCAL, shots=50)
+        self.assertEqual({}, response.errors)
+        self.assertEqual({'1': 1.0}, self.api.get_result(response.experiment_ids[1]).simulated_result[0].data)
+        self.assertEqual(2, len(self.api.get_experiments()))
+
+    def test_result_watcher(self):
+        experiment_id = self.api.create_experiment(1, AcQuantumBackendType.LOCAL, 'Watched')
+        self.api.update_experiment(experiment_id, [XGate(1, 1), Measure(2, 1)])
+        self.api.run_experiment(experiment_id, AcQuantumBackendType.LOCAL, 1, 100)
+        with ResultWatcher(self.api) as watcher:
+            response = watcher.wait(experiment_id, AcQuantumBackendType.LOCAL, timeout=5)
+        self.assertEqual({'1': 1.0}, response.simulated_result[0].data)
+
+    def test_unsupported(self):
+        experiment_id = self.api.create_experiment(1, AcQuantumBackendType.REAL, 'Real')
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.run_experiment(experiment_id, AcQuantumBackendType.REAL, 1, 100)
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.run_experiment(experiment_id, AcQuantumBackendType.LOCAL, 30, 100)
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.download_result(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.get_backend_config('USTC-1')
@@ -0,0 +1,161 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.tracing import FileSpanExporter, InMemorySpanExporter, SpanExporter, Tracer, \
+    STATUS_ERROR, STATUS_OK
+from acquantumconnector.connector.transport import InProcessTransport
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import HGate, Measure
+from test.standin_server import StandInApi
+
+
+class TestTracer(TestCase):
+
+    def test_nested_spans(self):
+        tracer = Tracer()
+        with tracer.span('outer', a=1) as outer:
+            with tracer.span('inner') as inner:
+                self.assertIs(inner, tracer.current_span())
+            self.assertIs(outer, tracer.current_span())
+        self.assertIsNone(tracer.current_span())
+
+        self.assertEqual([inner, outer], tracer.exporter.get_finished_spans())
+        self.assertEqual(outer.trace_id, inner.trace_id)
+        self.assertEqual(outer.span_id, inner.parent_id)
+        self.assertIsNone(outer.parent_id)
+        self.assertEqual({'a': 1}, outer.attributes)
+        self.assertEqual(STATUS_OK, inner.status)
+        self.assertGreaterEqual(outer.duration, inner.duration)
+
+    def test_error(self):
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            with tracer.span('failing'):
+                raise ValueError('broken')
+        span, = tracer.exporter.get_finished_spans()
+        self.assertEqual((STATUS_ERROR, 'ValueError: broken'), (span.status, span.status_message))
+
+    def test_file_exporter(self):
+        path = os.path.join(tempfile.mkdtemp(), 'spans.jsonl')
+        tracer = Tracer(FileSpanExporter(path))
+        tracer.start_execution(5, shots=10)
+        tracer.end_experiment(5)
+        tracer.close()
+
+        with open(path) as f:
+            spans = [json.loads(line) for line in f]
+        self.assertEqual(['execution', 'experiment'], [span['name'] for span in spans])
+        self.assertEqual(spans[1]['span_id'], spans[0]['parent_id'])
+        self.assertEqual({'shots': 10}, spans[0]['attributes'])
+        self.assertEqual({'experiment.id': 5}, spans[1]['attributes'])
+
+    def test_incomplete_exporter(self):
+        class ClosingExporter(SpanExporter):
+            def close(self):
+                pass
+
+        with self.assertRaises(TypeError):
+            ClosingExporter()
+
+    def test_max_experiments(self):
+        tracer = Tracer(max_experiments=2)
+        tracer.start_experiment(1)
+        tracer.start_execution(1)
+        tracer.start_experiment(2)
+        tracer.end_experiment(2)
+        tracer.start_experiment(3)
+        self.assertEqual([], [span.name for span in tracer.exporter.get_finished_spans()
+                              if span.attributes.get('evicted')])
+        tracer.start_experiment(4)
+        tracer.start_experiment(5)
+
+        self.assertEqual([4, 5], list(tracer._experiments))
+        evicted = [span for span in tracer.exporter.get_finished_spans() if span.attributes.get('evicted')]
+        self.assertEqual(['execution', 'experiment', 'experiment'], [span.name for span in evicted])
+        self.assertEqual([1, 3], [span.attributes['experiment.id'] for span in evicted[1:]])
+
+
+class TestConnectorTracing(TestCase):
+
+    def setUp(self):
+        self.exporter = InMemorySpanExporter()
+        self.stand_in = StandInApi()
+        self.api = AcQuantumConnector(base_uri='http://stand-in', transport=InProcessTransport(self.stand_in),
+                                      tracer=Tracer(self.exporter))
+        self.api.create_session(AcQuantumCredentials('user', 'password'))
+        self.exporter.clear()
+
+    def _spans(self, name):
+        return [span for span in self.exporter.get_finished_spans() if span.name == name]
+
+    def test_lifecycle(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'Traced')
+        self.api.update_experiment(experiment_id, [HGate(1, 1), Measure(2, 1)])
+        self.api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 100)
+        self.api.get_result(experiment_id)
+
+        root, = self._spans('experiment')
+        self.assertEqual({'experiment.id': experiment_id, 'experiment.name': 'Traced', 'experiment.bit_width': 2,
+                          'experiment.backend_type': 'SIMULATE', 'experiment.shots': 100}, root.attributes)
+        self.assertTrue(all(span.trace_id == root.trace_id for span in self.exporter.get_finished_spans()))
+
+        operations = [span for span in self.exporter.get_finished_spans() if span.parent_id == root.span_id]
+        self.assertEqual(['create_experiment', 'update_experiment', 'run_experiment', 'execution', 'get_result'],
+                         [span.name for span in sorted(operations, key=lambda span: span.start_time)])
+        update, = self._spans('update_experiment')
+        self.assertEqual(2, update.attributes['experiment.gate_count'])
+        execution, = self._spans('execution')
+        self.assertEqual(100, execution.attributes['experiment.shots'])
+
+        requests = {span.name: span for span in self.exporter.get_finished_spans() if span.name.startswith('HTTP')}
+        self.assertEqual(update.span_id, requests['HTTP POST /experiment/codesave'].parent_id)
+        self.assertEqual(200, requests['HTTP GET /experiment/resultlist'].attributes['http.status_code'])
+        self.assertLessEqual(update.start_time, requests['HTTP POST /experiment/codesave'].start_time)
+
+    def test_unfinished_result(self):
+        experiment_id = self.api.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Queued')
+        self.api.update_experiment(experiment_id, [HGate(1, 1), Measure(2, 1)])
+        self.api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 1, 100)
+        result = self.stand_in.results[experiment_id]['simulateResult'][0]
+        finish_time, result['finishTime'] = result['finishTime'], None
+
+        self.api.get_result(experiment_id)
+        self.assertEqual([], self._spans('experiment') + self._spans('execution'))
+        result['finishTime'] = finish_time
+        self.api.get_result(experiment_id)
+        self.assertEqual(1, len(self._spans('experiment')))
+        self.assertEqual(1, len(self._spans('execution')))
+
+    def test_failed_request(self):
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.get_experiment(-1)
+        request, operation = self.exporter.get_finished_spans()
+        self.assertEqual(('HTTP GET /experiment/detail', STATUS_ERROR), (request.name, request.status))
+        self.assertEqual(('get_experiment', STATUS_ERROR), (operation.name, operation.status))
+        self.assertEqual(operation.span_id, request.parent_id)
+
+    def test_delete_ends_trace(self):
+        experiment_id = self.api.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Deleted')
+        self.api.delete_experiment(experiment_id)
+        root, = self._spans('experiment')
+        self.assertEqual(STATUS_OK, root.status)
+        self.assertNotEqual(root.span_id, self.api._tracer.experiment(experiment_id).span_id)
@@ -0,0 +1,144 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import importlib.util
+import json
+import os
+from unittest import TestCase, mock, skipIf
+
+from acquantumconnector.compiler.transpiler import Transpiler
+from acquantumconnector.model.circuit import Circuit
+from acquantumconnector.model.config import AcQuantumRawConfig
+from acquantumconnector.model.gates import HGate, XGate, YGate, ZGate, SGate, SDag, TGate, TDag, RxGate, RyGate, \
+    RzGate, CPhase, CCPhase, Measure
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+if HAS_NUMPY:
+    import numpy as np
+    from acquantumconnector.simulator.statevector import StatevectorSimulator
+
+
+def load_config(one_q_gates=None, couplings=None, calibration_time=None):
+    with open(os.path.join(os.path.dirname(__file__), 'resources', 'computer-config.json')) as f:
+        values = json.load(f)['data']
+    if one_q_gates is not None:
+        system = json.loads(values[0]['configValue'])
+        system['oneQGates'] = one_q_gates
+        values[0]['configValue'] = json.dumps(system)
+    if couplings is not None:
+        values[4]['configValue'] = json.dumps([{'q1': q1, 'q2': q2, 'cz': cz} for q1, q2, cz in couplings])
+    if calibration_time is not None:
+        values[3]['configValue'] = json.dumps({'status': 'ONLINE', 'fridgeTemperature': 0.02,
+                                               'lastCalibrationTime': calibration_time})
+    return AcQuantumRawConfig.from_json(values)
+
+
+class TestTranspiler(TestCase):
+
+    def test_device_model(self):
+        device = Transpiler(config=load_config()).device()
+        self.assertEqual(list(range(1, 12)), device.qubits)
+        self.assertEqual(0.978, device.couplings[frozenset((1, 2))])
+        self.assertNotIn(frozenset((11, 12)), device.couplings)
+        self.assertTrue(device.supports(Circuit([SDag(1, 1)]).codes[0]))
+        self.assertEqual('2018-12-06 15:41:11', device.calibration_time)
+
+    def test_layout_prefers_best_coupling(self):
+        couplings = [(1, 2, 0.90), (2, 3, 0.99), (3, 4, 0.95)]
+        transpiled = Transpiler(config=load_config(couplings=couplings)).transpile(
+            [HGate(1, 5), CPhase(2, (5, 7)), Measure(3, 5), Measure(3, 7)])
+        self.assertEqual({2, 3}, set(transpiled.layout.values()))
+        self.assertEqual(['H', 'CP', 'M', 'M'], [gate.text for gate in transpiled.circuit])
+        self.assertEqual({frozenset((2, 3))}, {frozenset((gate.y, gate.y1)) for gate in transpiled.circuit
+                                              if gate.text == 'CP'})
+        self.assertLess(transpiled.fidelity, 0.99)
+
+    def test_unmappable(self):
+        transpiler = Transpiler(config=load_config(couplings=[(1, 2, 0.9), (2, 3, 0.9), (3, 4, 0.9)]))
+        with self.assertRaises(ValueError):
+            transpiler.transpile([CPhase(1, (1, 2)), CPhase(2, (1, 3)), CPhase(3, (1, 4))])
+        with self.assertRaises(ValueError):
+            transpiler.transpile([CPhase(1, (1, 2))], layout={1: 1, 2: 3})
+        with self.assertRaises(ValueError):
+            Transpiler(config=load_config(one_q_gates=['X'])).transpile([TGate(1, 1)])
+
+    def test_refresh_on_calibration(self):
+        connector = mock.Mock()
+        connector.get_backend_config.return_value = load_config(calibration_time='2019-01-01 00:00:00')
+        transpiler = Transpiler(connector, refresh_interval=0)
+        device = transpiler.device()
+        self.assertIs(device, transpiler.device())
+        connector.get_backend_config.return_value = load_config(calibration_time='2019-01-02 00:00:00')
+        self.assertIsNot(device, transpiler.device())
+        self.assertEqual(3, connector.get_backend_config.call_count)
+
+        transpiler = Transpiler(connector, refresh_interval=300)
+        transpiler.device()
+        transpiler.device()
+        self.assertEqual(4, connector.get_backend_config.call_count)
+
+
+@skipIf(not HAS_NUMPY, 'numpy is not installed')
+class TestTranspilerEquivalence(TestCase):
+
+    PREPARE = [HGate(1, 1), HGate(1, 2), HGate(1, 3), TGate(2, 1), RxGate(2, 2, 30), RyGate(2, 3, 70)]
+
+    def assert_equivalent(self, gates, transpiled, num_qubits=3):
+        expected = StatevectorSimulator(num_qubits)
+        expected.run(gates)
+        actual = StatevectorSimulator(num_qubits)
+        actual.run(transpiled.circuit)
+        self.assertAlmostEqual(1.0, abs(np.vdot(expected.state, actual.state)), places=10)
+
+    def test_ccp_decomposition(self):
+        transpiler = Transpiler(config=load_config(couplings=[(1, 2, 0.9), (2, 3, 0.9)]))
+        gates = self.PREPARE + [CCPhase(3, (1, 2, 3)), HGate(4, 2)]
+        transpiled = transpiler.transpile(gates, layout={1: 1, 2: 2, 3: 3})
+        self.assertNotIn('CCP', {gate.text for gate in transpiled.circuit})
+        self.assertEqual(8, len([gate for gate in transpiled.circuit if gate.text == 'CP']))
+        self.assert_equivalent(gates, transpiled)
+
+        # the centre of the chain does not have to be the middle row
+        transpiled = transpiler.transpile(gates, layout={1: 2, 2: 1, 3: 3})
+        self.assert_equivalent(gates, self.relabel(transpiled, {1: 2, 2: 1, 3: 3}))
+
+    def test_rewrite_to_rotations(self):
+        transpiler = Transpiler(config=load_config(one_q_gates=['Rx(p)', 'Ry(p)', 'Rz(p)']))
+        gates = self.PREPARE + [XGate(3, 1), YGate(3, 2), ZGate(3, 3), SGate(4, 1), SDag(4, 2), TDag(4, 3),
+                                HGate(5, 1), RzGate(5, 2, 100), CPhase(6, (1, 2)), CPhase(7, (2, 3))]
+        transpiled = transpiler.transpile(gates, layout={1: 1, 2: 2, 3: 3})
+        self.assertEqual({'RX', 'RY', 'RZ', 'CP'}, {gate.text.split('_')[0] for gate in transpiled.circuit})
+        self.assert_equivalent(gates, transpiled)
+
+    def test_rewrite_rotations(self):
+        transpiler = Transpiler(config=load_config(one_q_gates=['H', 'Rz(p)']))
+        gates = self.PREPARE[:3] + [RxGate(2, 1, 30), RzGate(2, 2, 70), XGate(2, 3)]
+        transpiled = transpiler.transpile(gates, layout={1: 1, 2: 2, 3: 3})
+        self.assertEqual({'H', 'RZ'}, {gate.text.split('_')[0] for gate in transpiled.circuit})
+        self.assert_equivalent(gates, transpiled)
+
+    @staticmethod
+    def relabel(transpiled, layout):
+        """
+        Maps the physical rows back to the logical rows.
+        """
+        inverse = {physical: logical for logical, physical in layout.items()}
+        circuit = Circuit()
+        for gate in transpiled.circuit:
+            rows = [inverse[row] for row in (gate.y, getattr(gate, 'y1', None), getattr(gate, 'y2', None)) if row]
+            circuit.add(gate.text.split('_')[0], gate.x, rows if len(rows) > 1 else rows[0],
+                        int(gate.text.split('_')[1]) if '_' in gate.text else 0)
+        transpiled.circuit = circuit
+        return transpiled
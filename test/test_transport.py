@@ -0,0 +1,144 @@
+#  Copyright (c) 2019.  Carsten Blank
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import gc
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+
+from acquantumconnector.connector.acquantumconnector import AcQuantumConnector
+from acquantumconnector.connector.cache import BackendConfigCache
+from acquantumconnector.connector.retry import RetryPolicy
+from acquantumconnector.connector.transport import InProcessTransport, RequestsTransport, Transport
+from acquantumconnector.credentials.credentials import AcQuantumCredentials
+from acquantumconnector.model.backendtype import AcQuantumBackendType
+from acquantumconnector.model.errors import AcQuantumRequestError
+from acquantumconnector.model.gates import XGate, Measure
+from test.standin_server import StandInApi, StandInServer
+
+
+class TestInProcessTransport(TestCase):
+
+    def setUp(self):
+        self.stand_in = StandInApi()
+        self.api = AcQuantumConnector(base_uri='http://stand-in', transport=InProcessTransport(self.stand_in))
+        self.api.create_session(AcQuantumCredentials('user', 'password'))
+
+    def test_session(self):
+        self.assertEqual(self.stand_in.csrf, self.api._session.csrf)
+        self.assertEqual({'SESSION': self.stand_in.session_id}, dict(self.api.transport.cookies))
+
+    def test_experiment_lifecycle(self):
+        experiment_id = self.api.create_experiment(2, AcQuantumBackendType.SIMULATE, 'InProcess')
+        self.api.update_experiment(experiment_id, [XGate(1, 1)], stream=True, compress=True)
+        self.api.update_experiment(experiment_id, [Measure(2, 1)], override=False)
+        self.assertEqual([Measure(2, 1).__dict__, XGate(1, 1).__dict__],
+                         self.api.get_experiment(experiment_id).data)
+        self.api.run_experiment(experiment_id, AcQuantumBackendType.SIMULATE, 2, 100)
+        self.assertEqual(100, self.api.get_result(experiment_id).simulated_result[0].shots)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        report = self.api.download_results([experiment_id], directory)
+        self.assertEqual({}, report.errors)
+        report = self.api.download_results([experiment_id], directory)
+        self.assertEqual([experiment_id], report.skipped)
+        self.assertTrue(os.path.getsize(report.files[experiment_id]) > 0)
+
+        self.api.delete_experiment(experiment_id)
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.get_experiment(experiment_id)
+
+    def test_not_modified(self):
+        api = AcQuantumConnector(base_uri='http://stand-in', transport=self.api.transport,
+                                 config_cache=BackendConfigCache(ttl=0))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        config = api.get_backend_config()
+        self.assertIs(config, api.get_backend_config())
+
+    def test_failure_injection(self):
+        self.stand_in.failure_rate = 1.0
+        with self.assertRaises(AcQuantumRequestError):
+            self.api.create_experiment(1, AcQuantumBackendType.SIMULATE, 'Failing')
+        self.stand_in.failure_rate = 0.0
+
+        self.stand_in.unavailable = 2
+        api = AcQuantumConnector(base_uri='http://stand-in', transport=self.api.transport,
+                                 retry_policy=RetryPolicy(backoff=0.001))
+        api.create_session(AcQuantumCredentials('user', 'password'))
+        self.assertEqual([], api.get_experiments())
+
+    def test_latency(self):
+        self.stand_in.latency = lambda: 0.02
+        start = time.monotonic()
+        self.api.get_experiments()
+        self.assertGreaterEqual(time.monotonic() - start, 0.02)
+
+    def test_incomplete_transport(self):
+        class CookieLessTransport(Transport):
+            def request(self, method, uri, **kwargs):
+                pass
+
+        with self.assertRaises(TypeError):
+            CookieLessTransport()
+
+
+class TestRequestsTransport(TestCase):
+
+    def test_thread_sessions(self):
+        transport = RequestsTransport(thread_safe=True)
+        main = transport.session
+        self.assertIs(main, transport.session)
+        with StandInServer() as server:
+            api = AcQuantumConnector(base_uri=server.base_uri, transport=transport)
+            api.create_session(AcQuantumCredentials('user', 'password'))
+            self.assertEqual({'SESSION': server.api.session_id}, dict(transport.cookies))
+        api.close()
+        self.assertIsNot(main, transport.session)
+
+    def test_worker_sessions(self):
+        transport = RequestsTransport()
+        main = transport.session
+
+        def worker(_):
+            with transport.thread_session():
+                return transport.session
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            sessions = list(executor.map(worker, range(6)))
+        self.assertNotIn(main, sessions)
+        self.assertTrue(all(http.adapters is main.adapters for http in sessions))
+        with transport.thread_session():
+            self.assertIsNot(main, transport.session)
+        self.assertIs(main, transport.session)
+
+        del sessions, executor
+        gc.collect()
+        self.assertEqual(1, len(transport._sessions))
+
+    def test_batch_on_default_connector(self):
+        with StandInServer() as server:
+            api = AcQuantumConnector(base_uri=server.base_uri)
+            api.create_session(AcQuantumCredentials('user', 'password'))
+            response = api.submit_batch([[XGate(1, 1), Measure(2, 1)]] * 8, AcQuantumBackendType.SIMULATE, 100,
+                                        max_workers=4)
+            self.assertEqual({}, response.errors)
+            report = api.download_results(response.experiment_ids, tempfile.mkdtemp(), max_workers=4)
+            self.assertEqual({}, report.errors)
+            api.close()
+        gc.collect()
+        self.assertEqual(0, len(api.transport._sessions))